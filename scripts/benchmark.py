@@ -0,0 +1,577 @@
+"""End-to-end acquisition benchmark.
+
+Runs IV, IV bias and CV measurements headless through `MeasurementJob`
+against simulated instruments (or a recorded I/O trace) and writes the
+results as JSON, for example:
+
+    python scripts/benchmark.py --output benchmark.json
+    python scripts/benchmark.py --compare benchmark.json --threshold 0.25
+
+Waiting times are skipped and simulated instruments answer without delay
+(see `--time-scale`), so the results show the host overhead of the
+acquisition loop. Continuous mode runs for the readings of `--hours` of
+simulated time at the nominal interval of `--interval` seconds.
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import platform
+import queue
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import replace
+from typing import Any
+
+from diode_measurement import __version__
+from diode_measurement.controller import Controller
+from diode_measurement.core.context import State, SweepMode
+from diode_measurement.core.measurement import FSMState, Measurement
+from diode_measurement.core.metrics import LatencyHistogram
+from diode_measurement.core.role import Role, RoleConfig
+from diode_measurement.core.station import Station
+from diode_measurement.core.trace import ReplayTrace
+from diode_measurement.jobs.measurement import MeasurementJob
+from diode_measurement.measurements import cv, iv, iv_bias
+from diode_measurement.settings import measurement_registry
+from diode_measurement.sim import DiodeModel, SimulatedBench
+
+SCHEMA_VERSION = 1
+
+# Module level functions called by measurements, patched for profiling
+HOT_FUNCTIONS: list[tuple[Any, str]] = [
+    (iv, "write_iv_reading"),
+    (iv, "write_it_reading"),
+    (iv_bias, "write_iv_bias_reading"),
+    (iv_bias, "write_it_bias_reading"),
+    (cv, "write_cv_reading"),
+]
+
+# Measurement methods, patched per instance for profiling
+HOT_METHODS: list[str] = [
+    "acquire_reading",
+    "acquire_reading_data",
+    "apply_waiting_time_continuous",
+    "check_current_compliance",
+]
+
+
+class Profiler:
+    """Collect call counts and durations of wrapped callables."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.histograms: dict[str, LatencyHistogram] = {}
+
+    def add(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            histogram = self.histograms.setdefault(name, LatencyHistogram())
+            histogram.add(elapsed)
+
+    def wrap(self, name: str, target: Callable) -> Callable:
+        @functools.wraps(target)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return target(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def patch_functions(self) -> Iterator[None]:
+        originals = [
+            (module, name, getattr(module, name)) for module, name in HOT_FUNCTIONS
+        ]
+        try:
+            for module, name, target in originals:
+                setattr(module, name, self.wrap(name, target))
+            yield
+        finally:
+            for module, name, target in originals:
+                setattr(module, name, target)
+
+    def patch_methods(self, measurement: Measurement) -> None:
+        for name in HOT_METHODS:
+            target = getattr(measurement, name, None)
+            if target is not None:
+                setattr(measurement, name, self.wrap(name, target))
+
+    def total(self, name: str) -> float:
+        histogram = self.histograms.get(name)
+        return histogram.total if histogram else 0.0
+
+    def count(self, name: str) -> int:
+        histogram = self.histograms.get(name)
+        return histogram.count if histogram else 0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "count": histogram.count,
+                    "total": histogram.total,
+                    "mean": histogram.total / histogram.count,
+                    "p50": histogram.percentile(50),
+                    "p95": histogram.percentile(95),
+                    "max": histogram.max,
+                }
+                for name, histogram in sorted(self.histograms.items())
+                if histogram.count
+            }
+
+
+class EventQueue(queue.Queue):
+    """Outbox queue counting events by type when taken."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: dict[str, int] = {}
+
+    def get_nowait(self) -> Any:
+        event = super().get_nowait()
+        name = type(event).__name__
+        self.events[name] = self.events.get(name, 0) + 1
+        return event
+
+
+class ReadingQueue:
+    """Reading queue of the controller, counts readings and calls the
+    optional callback.
+    """
+
+    def __init__(self, callback: Callable[[Any], None] | None = None) -> None:
+        self.callback = callback
+        self.count: int = 0
+
+    def put(self, reading: Any) -> None:
+        self.count += 1
+        if self.callback is not None:
+            self.callback(reading)
+
+
+class Signal:
+    def emit(self, *args: Any) -> None: ...
+
+
+class EventConsumer(threading.Thread):
+    """Drain the outbox queue using `Controller.on_event_poll` every
+    `poll_interval` seconds.
+
+    Stops the measurement after `max_continuous` continuous readings and
+    traces memory allocations of the continuous phase.
+    """
+
+    def __init__(
+        self,
+        event_queue: EventQueue,
+        abort_event: threading.Event,
+        profiler: Profiler,
+        max_continuous: int,
+        poll_interval: float = 0.100,
+        trace_memory: bool = True,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.abort_event = abort_event
+        self.profiler = profiler
+        self.max_continuous = max_continuous
+        self.poll_interval = poll_interval
+        self.trace_memory = trace_memory
+        self.finished = threading.Event()
+        self.max_backlog: int = 0
+        self.continuous_start: float | None = None
+        self.continuous_end: float | None = None
+        self.memory_start: int = 0
+        self.memory_end: int = 0
+        self.memory_peak: int = 0
+        self.exceptions: list[str] = []
+        # Attributes used by Controller.on_event_poll
+        self._event_queue = event_queue
+        self.change_voltage_ready = Signal()
+        self.iv_reading_queue = ReadingQueue()
+        self.it_reading_queue = ReadingQueue(self.on_continuous_reading)
+        self.cv_reading_queue = ReadingQueue()
+
+    @property
+    def events(self) -> dict[str, int]:
+        return self._event_queue.events
+
+    @property
+    def continuous_readings(self) -> int:
+        return self.it_reading_queue.count
+
+    def run(self) -> None:
+        while True:
+            done = self.finished.is_set()
+            self.max_backlog = max(self.max_backlog, self._event_queue.qsize())
+            start = time.perf_counter()
+            count = self.poll()
+            if count:
+                self.profiler.add("on_event_poll", time.perf_counter() - start)
+            if done and not count:
+                break
+            time.sleep(self.poll_interval)
+        self.stop_memory_trace()
+
+    def poll(self) -> int:
+        """Handle pending events, return number of events handled."""
+        count = sum(self.events.values())
+        Controller.on_event_poll(self)  # type: ignore[arg-type]
+        return sum(self.events.values()) - count
+
+    def on_continuous_reading(self, reading: Any) -> None:
+        if self.continuous_readings >= self.max_continuous:
+            self.abort_event.set()
+
+    def on_update(self, data: dict[str, Any]) -> None:
+        if data.get("fsm_state") == FSMState.CONTINUOUS:
+            self.start_memory_trace()
+        elif data.get("fsm_state") == FSMState.STOPPING:
+            self.stop_memory_trace()
+
+    def handle_exception(self, exception: Exception) -> None:
+        self.exceptions.append(repr(exception))
+
+    def start_memory_trace(self) -> None:
+        self.continuous_start = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+
+    def stop_memory_trace(self) -> None:
+        if self.continuous_start is not None and self.continuous_end is None:
+            self.continuous_end = time.perf_counter()
+        if tracemalloc.is_tracing():
+            self.memory_end, self.memory_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+
+def role_config(model: str, name: str, **options: Any) -> RoleConfig:
+    return RoleConfig(
+        enabled=True,
+        model=model,
+        resource_name=f"SIM::{name}::INSTR",
+        visa_library="@sim",
+        termination="\r",
+        timeout=4.0,
+        reset_instrument=False,
+        options=options,
+    )
+
+
+def create_states(args: argparse.Namespace, filename: str) -> dict[str, State]:
+    common = State(
+        sample="BENCHMARK",
+        timestamp=time.time(),
+        waiting_time=0.0,
+        waiting_time_continuous=0.0,
+        current_compliance=1e-3,
+        continue_in_compliance=True,
+        ramp_rate=1e6,
+        ramp_step=1e3,
+        discharge_threshold=1e3,
+        output_filename=filename,
+        sweep_mode=SweepMode(args.sweep_mode),
+    )
+    return {
+        "iv": replace(
+            common,
+            measurement_type="iv",
+            is_continuous=True,
+            voltage_begin=0.0,
+            voltage_end=-float(args.steps),
+            voltage_step=1.0,
+            source_role=Role.SMU,
+            roles={
+                Role.SMU: role_config("K2410", "smu"),
+                Role.ELM: role_config("K6514", "elm"),
+            },
+        ),
+        "iv_bias": replace(
+            common,
+            measurement_type="iv_bias",
+            is_continuous=True,
+            voltage_begin=0.0,
+            voltage_end=-float(args.steps),
+            voltage_step=1.0,
+            bias_voltage=-10.0,
+            source_role=Role.SMU,
+            bias_source_role=Role.SMU2,
+            roles={
+                Role.SMU: role_config("K2410", "smu"),
+                Role.SMU2: role_config("K2470", "smu2"),
+            },
+        ),
+        "cv": replace(
+            common,
+            measurement_type="cv",
+            voltage_begin=0.0,
+            voltage_end=float(args.steps),
+            voltage_step=1.0,
+            source_role=Role.SMU,
+            roles={
+                Role.SMU: role_config("K2410", "smu"),
+                Role.LCR: role_config("E4980A", "lcr"),
+            },
+        ),
+    }
+
+
+def measurement_class(measurement_type: str) -> type[Measurement]:
+    for spec in measurement_registry:
+        if spec.type == measurement_type:
+            return spec.measurement_cls
+    raise ValueError(f"No such measurement type: {measurement_type}")
+
+
+def run_case(state: State, args: argparse.Namespace) -> dict[str, Any]:
+    station = Station()
+    station.simulated_bench = SimulatedBench(DiodeModel(), seed=0)
+    station.simulation_time_scale = args.time_scale
+    if args.replay:
+        station.replay_trace = ReplayTrace.load(args.replay)
+    for role, config in state.roles.items():
+        station.register_instrument(role, config)
+
+    event_queue = EventQueue()
+    abort_event = threading.Event()
+    measurement = measurement_class(state.measurement_type).create(
+        state=state,
+        station=station,
+        outbox_queue=event_queue,
+        inbox_queue=queue.Queue(),
+        abort_event=abort_event,
+    )
+    profiler = Profiler()
+    profiler.patch_methods(measurement)
+    max_continuous = max(1, round(args.hours * 3600 / args.interval))
+    consumer = EventConsumer(
+        event_queue,
+        abort_event,
+        profiler,
+        max_continuous=max_continuous,
+        trace_memory=not args.no_memory,
+    )
+    job = MeasurementJob(
+        measurement,
+        timestamp_format=".6f",
+        value_format="+.3E",
+        has_finished=consumer.finished.set,
+    )
+
+    consumer.start()
+    start = time.perf_counter()
+    with profiler.patch_functions():
+        job()
+    elapsed = time.perf_counter() - start
+    consumer.join()
+
+    io_total = sum(
+        command["total"]
+        for metrics in measurement.io_metrics.values()
+        for command in metrics["commands"].values()
+    )
+    io_count = sum(metrics["count"] for metrics in measurement.io_metrics.values())
+    steps = profiler.count("acquire_reading") + consumer.continuous_readings
+    host_time = max(0.0, elapsed - io_total)
+    write_names = [name for _, name in HOT_FUNCTIONS]
+    rows = sum(profiler.count(name) for name in write_names)
+    write_time = sum(profiler.total(name) for name in write_names)
+    events = sum(consumer.events.values())
+    file_size = os.path.getsize(state.output_filename) if state.output_filename else 0
+
+    result: dict[str, Any] = {
+        "elapsed": elapsed,
+        "steps": steps,
+        "instrument": {"count": io_count, "total": io_total},
+        "host_time": host_time,
+        "host_overhead_per_step": host_time / steps if steps else None,
+        "events": {
+            "count": events,
+            "per_second": events / elapsed if elapsed else None,
+            "max_backlog": consumer.max_backlog,
+            "by_type": dict(sorted(consumer.events.items())),
+        },
+        "writer": {
+            "rows": rows,
+            "bytes": file_size,
+            "total": write_time,
+            "rows_per_second": rows / write_time if write_time else None,
+            "bytes_per_second": file_size / elapsed if elapsed else None,
+        },
+        "hot_paths": profiler.snapshot(),
+        "exceptions": consumer.exceptions,
+    }
+    if state.is_continuous:
+        readings = consumer.continuous_readings
+        simulated_hours = readings * args.interval / 3600
+        duration = None
+        if (
+            consumer.continuous_start is not None
+            and consumer.continuous_end is not None
+        ):
+            duration = consumer.continuous_end - consumer.continuous_start
+        growth = consumer.memory_end - consumer.memory_start
+        result["continuous"] = {
+            "readings": readings,
+            "simulated_hours": simulated_hours,
+            "elapsed": duration,
+            "readings_per_second": readings / duration if duration else None,
+            "memory_traced": not args.no_memory,
+            "memory_growth": growth,
+            "memory_peak": consumer.memory_peak,
+            "memory_growth_per_hour": growth / simulated_hours
+            if simulated_hours
+            else None,
+        }
+    return result
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Return regressions of mean hot path times and host overhead exceeding
+    the relative threshold.
+    """
+    regressions: list[str] = []
+
+    def check(name: str, value: float | None, reference: float | None) -> None:
+        if value is None or not reference:
+            return
+        ratio = value / reference - 1
+        if ratio > threshold:
+            regressions.append(f"{name}: {reference:.3G} -> {value:.3G} (+{ratio:.0%})")
+
+    for case, result in results["cases"].items():
+        reference = baseline.get("cases", {}).get(case)
+        if not reference:
+            continue
+        check(
+            f"{case}.host_overhead_per_step",
+            result.get("host_overhead_per_step"),
+            reference.get("host_overhead_per_step"),
+        )
+        for name, stats in result["hot_paths"].items():
+            ref_stats = reference.get("hot_paths", {}).get(name, {})
+            check(f"{case}.{name}.mean", stats.get("mean"), ref_stats.get("mean"))
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument(
+        "--case",
+        choices=["iv", "iv_bias", "cv"],
+        action="append",
+        help="measurement to run, can be repeated (default: all)",
+    )
+    parser.add_argument("--steps", type=int, default=200, help="ramp steps (1 V each)")
+    parser.add_argument(
+        "--hours", type=float, default=1.0, help="simulated hours of continuous mode"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="nominal continuous interval in seconds (simulated time)",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.0,
+        help="scale of simulated instrument latencies (0 = no delays)",
+    )
+    parser.add_argument(
+        "--sweep-mode",
+        choices=[mode.value for mode in SweepMode],
+        default=SweepMode.HOST.value,
+        help="IV sweep mode (default: host)",
+    )
+    parser.add_argument("--replay", metavar="TRACE", help="replay recorded I/O trace")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="do not trace memory allocations"
+    )
+    parser.add_argument("-o", "--output", metavar="FILE", help="write JSON results")
+    parser.add_argument("--compare", metavar="FILE", help="baseline JSON results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slow down reported as regression (default: 0.25)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cases = args.case or ["iv", "iv_bias", "cv"]
+    if args.replay and len(cases) != 1:
+        print(
+            "A recorded trace can be replayed for a single --case only.",
+            file=sys.stderr,
+        )
+        return 2
+
+    results: dict[str, Any] = {
+        "schema": SCHEMA_VERSION,
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "config": {
+            "steps": args.steps,
+            "hours": args.hours,
+            "interval": args.interval,
+            "time_scale": args.time_scale,
+            "sweep_mode": args.sweep_mode,
+            "replay": args.replay,
+        },
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory() as path:
+        for case in cases:
+            filename = os.path.join(path, f"{case}.txt")
+            state = create_states(args, filename)[case]
+            print(f"running {case}...", file=sys.stderr)
+            result = run_case(state, args)
+            results["cases"][case] = result
+            overhead = result["host_overhead_per_step"] or 0.0
+            print(
+                f"{case}: {result['steps']} steps, "
+                f"{overhead * 1e6:.1f} us host overhead/step, "
+                f"{result['events']['per_second']:.0f} events/s",
+                file=sys.stderr,
+            )
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(text)
+    else:
+        print(text)
+
+    failed = [case for case, result in results["cases"].items() if result["exceptions"]]
+    for case in failed:
+        for exception in results["cases"][case]["exceptions"]:
+            print(f"{case}: {exception}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
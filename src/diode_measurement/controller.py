@@ -2,7 +2,7 @@ import logging
 import os
 import threading
 import time
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from functools import partial
@@ -33,12 +33,14 @@ from .core.measurement import (
     FSMState,
     Measurement,
     State,
+    SweepMode,
 )
-from .core.resource import ResourceConfig, parse_resource
+from .core.pool import SessionPool
+from .core.resource import ResourceConfig, parse_resource, resource_managers
 from .core.role import Role, RoleConfig
 from .core.station import Station
 from .core.utils import get_bool, get_dict, get_float, get_int, get_str
-from .gui.dialogs import ChangeVoltageDialog
+from .gui.dialogs import ChangeVoltageDialog, IOMetricsDialog
 from .gui.mainwindow import MainWindow
 
 # Source meter units
@@ -103,6 +105,9 @@ class Snapshot:
     dmm_temperature: float | None
     tcu_temperature: float | None
     tcu_humidity: float | None
+    continuous_overruns: int | None
+    continuous_skipped: int | None
+    streaming_gaps: int | None
 
 
 @dataclass(frozen=True, slots=True)
@@ -155,6 +160,10 @@ class Controller(QtCore.QObject):
         self._event_queue: Queue[Any] = Queue()
         self._last_output_filename: str | None = None
 
+        self.session_pool: SessionPool = SessionPool()
+        self._station: Station | None = None
+        self.io_metrics_dialog: IOMetricsDialog | None = None
+
         self._background_jobs = BackgroundJobsController(self)
         self._background_jobs.failed.connect(self.handle_exception)
         self._background_jobs.finished.connect(self.finished.emit)
@@ -199,6 +208,8 @@ class Controller(QtCore.QObject):
             self.change_voltage_controller.on_change_voltage_ready
         )
 
+        self.main_window.show_io_metrics.connect(self.on_show_io_metrics)
+
         self.tcu_controller = TCUController(self)
         self.tcu_controller.event_dispatched.connect(self.submit_event)
 
@@ -301,7 +312,7 @@ class Controller(QtCore.QObject):
         )
 
         self.test_connection_controller = TestConnectionController(
-            self.main_window, self
+            self.main_window, self.current_session_pool, self
         )
         self.test_connection_controller.job_submitted.connect(
             self.submit_background_job
@@ -412,8 +423,20 @@ class Controller(QtCore.QObject):
                 dmm_temperature=self.cache.get("dmm_temperature"),
                 tcu_temperature=self.cache.get("tcu_temperature"),
                 tcu_humidity=self.cache.get("tcu_humidity"),
+                continuous_overruns=self.cache.get("continuous_overruns"),
+                continuous_skipped=self.cache.get("continuous_skipped"),
+                streaming_gaps=self.cache.get("streaming_gaps"),
             )
 
+    def io_metrics(self) -> dict[str, Any]:
+        """Return thread safe I/O metrics by role of the current or last
+        measurement.
+        """
+        station = self._station
+        if station is None:
+            return {}
+        return station.io_metrics()
+
     def get_role_model(self, role: str) -> str:
         for role_widget in self.main_window.roles():
             if role_widget.role() == role:
@@ -471,6 +494,84 @@ class Controller(QtCore.QObject):
             self.settings.value("misc/discharge_threshold"), 0.5
         )
 
+        # ramps
+        ramp_rate = max(0.1, get_float(self.settings.value("misc/ramp_rate"), 20.0))
+        ramp_step = max(0.1, get_float(self.settings.value("misc/ramp_step"), 5.0))
+
+        # acquisition
+        parallel_acquisition = get_bool(
+            self.settings.value("acquisition/parallel"), False
+        )
+        parallel_initialization = get_bool(
+            self.settings.value("acquisition/parallel_initialization"), False
+        )
+        keep_sessions = get_bool(
+            self.settings.value("acquisition/keep_sessions"), False
+        )
+        force_configure = get_bool(
+            self.settings.value("acquisition/force_configure"), False
+        )
+        write_io_metrics = get_bool(
+            self.settings.value("acquisition/write_io_metrics"), False
+        )
+        record_trace = get_bool(self.settings.value("acquisition/record_trace"), False)
+        asyncio_io = get_bool(self.settings.value("acquisition/asyncio_io"), False)
+        background_writer = get_bool(
+            self.settings.value("acquisition/background_writer"), False
+        )
+        writer_fsync = get_bool(self.settings.value("acquisition/writer_fsync"), False)
+        acquisition_timeout = get_float(
+            self.settings.value("acquisition/timeout"), 60.0
+        )
+        try:
+            sweep_mode = SweepMode(
+                get_str(self.settings.value("acquisition/sweep_mode"), SweepMode.HOST)
+            )
+        except ValueError:
+            sweep_mode = SweepMode.HOST
+        sweep_chunk_size = max(
+            1, get_int(self.settings.value("acquisition/sweep_chunk_size"), 10)
+        )
+
+        # adaptive settle
+        adaptive_settle = get_bool(
+            self.settings.value("acquisition/adaptive_settle"), False
+        )
+        settle_tolerance = (
+            get_float(self.settings.value("acquisition/settle_tolerance"), 1.0) / 100.0
+        )
+        settle_interval = get_float(
+            self.settings.value("acquisition/settle_interval"), 0.1
+        )
+        settle_min_time = get_float(
+            self.settings.value("acquisition/settle_min_time"), 0.0
+        )
+        settle_max_time = max(
+            settle_min_time,
+            get_float(self.settings.value("acquisition/settle_max_time"), 10.0),
+        )
+
+        # adaptive stepping
+        adaptive_stepping = get_bool(
+            self.settings.value("acquisition/adaptive_stepping"), False
+        )
+        adaptive_max_step = get_float(
+            self.settings.value("acquisition/adaptive_max_step"), 10.0
+        )
+        adaptive_tolerance = (
+            get_float(self.settings.value("acquisition/adaptive_tolerance"), 5.0)
+            / 100.0
+        )
+
+        # streaming It
+        streaming_it = get_bool(self.settings.value("acquisition/streaming_it"), False)
+        streaming_interval = max(
+            0.0, get_float(self.settings.value("acquisition/streaming_interval"), 0.0)
+        )
+        streaming_chunk_size = max(
+            1, get_int(self.settings.value("acquisition/streaming_chunk_size"), 100)
+        )
+
         # Filename
         output_enabled = self.main_window.general_widget.is_output_enabled()
         self._last_output_filename = (
@@ -498,6 +599,31 @@ class Controller(QtCore.QObject):
             roles=self.prepare_roles(),
             output_filename=self._last_output_filename,
             wait_for_setpoint=general_widget.is_wait_for_setpoint(),
+            parallel_acquisition=parallel_acquisition,
+            parallel_initialization=parallel_initialization,
+            keep_sessions=keep_sessions,
+            force_configure=force_configure,
+            write_io_metrics=write_io_metrics,
+            record_trace=record_trace,
+            asyncio_io=asyncio_io,
+            background_writer=background_writer,
+            writer_fsync=writer_fsync,
+            acquisition_timeout=acquisition_timeout,
+            sweep_mode=sweep_mode,
+            sweep_chunk_size=sweep_chunk_size,
+            adaptive_settle=adaptive_settle,
+            settle_tolerance=settle_tolerance,
+            settle_interval=settle_interval,
+            settle_min_time=settle_min_time,
+            settle_max_time=settle_max_time,
+            adaptive_stepping=adaptive_stepping,
+            adaptive_max_step=adaptive_max_step,
+            adaptive_tolerance=adaptive_tolerance,
+            ramp_rate=ramp_rate,
+            ramp_step=ramp_step,
+            streaming_it=streaming_it,
+            streaming_interval=streaming_interval,
+            streaming_chunk_size=streaming_chunk_size,
         )
 
         for key, value in asdict(state).items():
@@ -535,6 +661,8 @@ class Controller(QtCore.QObject):
         self.cv_plots_data_windget.stop()
         self._background_jobs.shutdown(timeout=10.0)
         self.state_machine.stop()
+        self.session_pool.close()
+        resource_managers.close_idle()
 
     def read_settings(self) -> None:
         settings = QtCore.QSettings()
@@ -943,6 +1071,15 @@ class Controller(QtCore.QObject):
             self.main_window.update_tcu_state(tcu_state)
             cache.update({"tcu_state": tcu_state})
 
+        if (continuous_overruns := data.get("continuous_overruns")) is not None:
+            cache.update({"continuous_overruns": continuous_overruns})
+
+        if (continuous_skipped := data.get("continuous_skipped")) is not None:
+            cache.update({"continuous_skipped": continuous_skipped})
+
+        if (streaming_gaps := data.get("streaming_gaps")) is not None:
+            cache.update({"streaming_gaps": streaming_gaps})
+
         if (source_output_state := data.get("source_output_state")) is not None:
             self.main_window.update_source_output_state(source_output_state)
 
@@ -954,6 +1091,10 @@ class Controller(QtCore.QObject):
         if (message := data.get("message")) is not None:
             self.main_window.set_message(message)
 
+        io_metrics = data.get("io_metrics")
+        if io_metrics is not None and self.io_metrics_dialog is not None:
+            self.io_metrics_dialog.set_metrics(io_metrics)
+
         if (progress := data.get("progress")) is not None:
             minimum, maximum, value = progress
             self.main_window.set_progress(minimum, maximum, value)
@@ -1185,12 +1326,37 @@ class Controller(QtCore.QObject):
     def request_stop(self) -> None:
         self.aborted.emit()
 
+    @QtCore.Slot()
+    def on_show_io_metrics(self) -> None:
+        dialog = self.io_metrics_dialog
+        if dialog is None:
+            dialog = IOMetricsDialog(self.main_window)
+            dialog.refresh_requested.connect(
+                lambda: dialog.set_metrics(self.io_metrics())
+            )
+            self.io_metrics_dialog = dialog
+        dialog.set_metrics(self.io_metrics())
+        dialog.show()
+        dialog.raise_()
+
+    def current_session_pool(self) -> SessionPool | None:
+        """Return session pool if sessions are kept open, else close all
+        pooled sessions.
+        """
+        if get_bool(self.settings.value("acquisition/keep_sessions"), False):
+            return self.session_pool
+        self.session_pool.close()
+        return None
+
     def create_measurement(self, state: State) -> Measurement:
         measurement_type = state.measurement_type
         for spec in self.measurement_registry:  # TODO
             if spec.type == measurement_type:
                 station = Station()
                 station.auto_reconnect = state.auto_reconnect
+                station.asyncio_io = state.asyncio_io
+                station.session_pool = self.current_session_pool()
+                self._station = station
 
                 for role_widget in self.main_window.roles():
                     role = role_widget.role()
@@ -1449,9 +1615,15 @@ class TestConnectionController(QtCore.QObject):
     job_submitted = QtCore.Signal(object)
     result_ready = QtCore.Signal(str, str)
 
-    def __init__(self, main_window: MainWindow, parent: QtCore.QObject) -> None:
+    def __init__(
+        self,
+        main_window: MainWindow,
+        session_pool: Callable[[], SessionPool | None],
+        parent: QtCore.QObject,
+    ) -> None:
         super().__init__(parent)
         self.main_window = main_window
+        self.session_pool = session_pool
         self.main_window.role_test_connection.connect(self.on_test_connection)
         self.result_ready.connect(self.on_connection_identity)
 
@@ -1464,6 +1636,7 @@ class TestConnectionController(QtCore.QObject):
                 model=role_widget.model(),
                 resource_config=resource_config,
                 on_result_ready=partial(self.result_ready.emit, role),
+                session_pool=self.session_pool(),
             )
 
             self.main_window.set_progress(0, 0, 0)
@@ -0,0 +1,465 @@
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, Literal, Self, TypeVar
+
+from .metrics import READ_PREFIX, IOMetrics, command_prefix
+from .resource import AutoReconnectResource, Resource, ResourceConfig, ResourceError
+from .trace import TraceOp, TraceRecorder
+
+__all__ = [
+    "is_async_resource",
+    "AsyncTransport",
+    "SocketTransport",
+    "SerialTransport",
+    "AsyncResource",
+    "EventLoopThread",
+    "event_loop_thread",
+    "AsyncioResource",
+    "AutoReconnectAsyncioResource",
+]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+IS_WIN: bool = os.name == "nt"
+
+SOCKET_PATTERN = re.compile(r"^TCPIP\d*::([^:]+)::(\d+)::SOCKET$", re.IGNORECASE)
+SERIAL_PATTERN = re.compile(r"^ASRL(.+)::INSTR$", re.IGNORECASE)
+
+
+def is_async_resource(resource_config: ResourceConfig) -> bool:
+    """Return True if resource is supported by asyncio transports."""
+    if resource_config.visa_library != "@py":
+        return False
+    resource_name = resource_config.resource_name
+    return bool(
+        SOCKET_PATTERN.match(resource_name) or SERIAL_PATTERN.match(resource_name)
+    )
+
+
+class AsyncTransport:
+    """Non-blocking byte transport of an asynchronous resource."""
+
+    async def open(self) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def is_open(self) -> bool:
+        raise NotImplementedError
+
+    async def write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def read_until(self, separator: bytes) -> bytes:
+        """Read until separator, return data without separator."""
+        raise NotImplementedError
+
+    async def discard(self) -> None:
+        """Discard received but not yet read data."""
+        raise NotImplementedError
+
+
+class SocketTransport(AsyncTransport):
+    """TCP socket transport based on asyncio streams."""
+
+    discard_timeout: float = 0.010
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host: str = host
+        self.port: int = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def open(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+        if writer is not None:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def write(self, data: bytes) -> None:
+        if self._writer is None:
+            raise ConnectionError("socket not connected")
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def read_until(self, separator: bytes) -> bytes:
+        if self._reader is None:
+            raise ConnectionError("socket not connected")
+        try:
+            data = await self._reader.readuntil(separator)
+        except asyncio.IncompleteReadError as exc:
+            raise ConnectionError("connection closed by instrument") from exc
+        return data[: -len(separator)]
+
+    async def discard(self) -> None:
+        reader = self._reader
+        if reader is None:
+            return
+        # Consume data until the instrument stops sending
+        while True:
+            try:
+                async with asyncio.timeout(self.discard_timeout):
+                    data = await reader.read(4096)
+            except TimeoutError:
+                return
+            if not data:
+                return
+
+
+class SerialTransport(AsyncTransport):
+    """Serial port transport using a non-blocking pyserial port.
+
+    Reading waits for the port's file descriptor where supported, else the
+    port is polled.
+    """
+
+    poll_interval: float = 0.001
+
+    def __init__(self, port: str, baud_rate: int) -> None:
+        self.port: str = port
+        self.baud_rate: int = baud_rate
+        self._serial: Any = None
+        self._buffer: bytearray = bytearray()
+
+    async def open(self) -> None:
+        try:
+            import serial
+        except ImportError as exc:
+            raise ConnectionError("serial ports require pyserial") from exc
+        self._serial = serial.serial_for_url(
+            self.port, baudrate=self.baud_rate, timeout=0, write_timeout=0
+        )
+        self._buffer.clear()
+
+    async def close(self) -> None:
+        port = self._serial
+        self._serial = None
+        if port is not None:
+            port.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._serial is not None and self._serial.is_open
+
+    def _port(self) -> Any:
+        if self._serial is None:
+            raise ConnectionError("serial port not open")
+        return self._serial
+
+    async def write(self, data: bytes) -> None:
+        port = self._port()
+        view = memoryview(data)
+        while view:
+            count = port.write(view) or 0
+            view = view[count:]
+            if view:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _wait_readable(self) -> None:
+        port = self._port()
+        loop = asyncio.get_running_loop()
+        try:
+            fd = port.fileno()
+        except (AttributeError, OSError, NotImplementedError):
+            fd = None
+        if fd is None or IS_WIN:
+            await asyncio.sleep(self.poll_interval)
+            return
+        ready: asyncio.Future[None] = loop.create_future()
+        loop.add_reader(fd, ready.set_result, None)
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+
+    async def read_until(self, separator: bytes) -> bytes:
+        port = self._port()
+        while True:
+            index = self._buffer.find(separator)
+            if index >= 0:
+                data = bytes(self._buffer[:index])
+                del self._buffer[: index + len(separator)]
+                return data
+            chunk = port.read(port.in_waiting or 1)
+            if chunk:
+                self._buffer.extend(chunk)
+            else:
+                await self._wait_readable()
+
+    async def discard(self) -> None:
+        self._buffer.clear()
+        self._port().reset_input_buffer()
+
+
+def create_transport(resource_config: ResourceConfig) -> AsyncTransport:
+    resource_name = resource_config.resource_name
+    if m := SOCKET_PATTERN.match(resource_name):
+        return SocketTransport(m.group(1), int(m.group(2)))
+    if m := SERIAL_PATTERN.match(resource_name):
+        return SerialTransport(
+            ("COM" if IS_WIN else "") + m.group(1), resource_config.baud_rate
+        )
+    raise ResourceError(f"{resource_name}: not supported by asyncio transports")
+
+
+class AsyncResource:
+    """Asyncio native message based resource for `TCPIP::SOCKET` and `ASRL`
+    resources.
+
+    Operations of one resource are serialized, operations of different
+    resources overlap in the same event loop. Each operation is limited by
+    the configured timeout, input received after a timeout is discarded
+    before the next operation.
+    """
+
+    def __init__(self, resource_config: ResourceConfig) -> None:
+        self._resource_config = resource_config
+        self._transport: AsyncTransport = create_transport(resource_config)
+        self._lock: asyncio.Lock | None = None
+        self._discard_input: bool = False
+        self.metrics: IOMetrics = IOMetrics()
+        self.trace: TraceRecorder | None = None
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args) -> Literal[False]:
+        await self.close()
+        return False
+
+    @property
+    def resource_config(self) -> ResourceConfig:
+        return self._resource_config
+
+    @property
+    def resource_name(self) -> str:
+        return self._resource_config.resource_name
+
+    @property
+    def is_open(self) -> bool:
+        return self._transport.is_open
+
+    @property
+    def termination(self) -> bytes:
+        return self._resource_config.termination.encode()
+
+    def _operation_lock(self) -> asyncio.Lock:
+        # Create lock in the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _run(self, awaitable: Awaitable[T]) -> T:
+        try:
+            async with asyncio.timeout(self._resource_config.timeout):
+                return await awaitable
+        except TimeoutError as exc:
+            raise ResourceError(f"{self.resource_name}: timeout expired") from exc
+        except (OSError, ConnectionError) as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+
+    async def open(self) -> None:
+        self._discard_input = False
+        await self._run(self._transport.open())
+
+    async def close(self) -> None:
+        try:
+            await self._transport.close()
+        except OSError as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+
+    def _record(
+        self,
+        op: TraceOp,
+        message: str,
+        response: str,
+        start: float,
+        timeout: bool = False,
+    ) -> None:
+        elapsed = time.perf_counter() - start
+        prefix = READ_PREFIX if op == TraceOp.READ else command_prefix(message)
+        if timeout:
+            self.metrics.record_timeout(prefix)
+        else:
+            termination = len(self.termination)
+            bytes_written = len(message.encode(errors="replace")) + termination
+            bytes_read = len(response.encode(errors="replace")) + termination
+            self.metrics.record(
+                prefix,
+                bytes_written if op != TraceOp.READ else 0,
+                bytes_read if op != TraceOp.WRITE else 0,
+                elapsed,
+            )
+        if self.trace is not None:
+            self.trace.record(
+                op, self.resource_name, message, response, start, elapsed, timeout
+            )
+
+    async def _exchange(self, op: TraceOp, message: str) -> str:
+        if op != TraceOp.READ:
+            logger.debug("resource.write: `%s`", message)
+            await self._transport.write(message.encode() + self.termination)
+        if op == TraceOp.WRITE:
+            return ""
+        data = await self._transport.read_until(self.termination)
+        response = data.decode(errors="replace")
+        logger.debug("resource.read: `%s`", response)
+        return response
+
+    async def _transaction(self, op: TraceOp, message: str) -> str:
+        async with self._operation_lock():
+            if self._discard_input:
+                # Drop partial or late response of a timed out operation
+                await self._run(self._transport.discard())
+                self._discard_input = False
+            start = time.perf_counter()
+            try:
+                # The timeout applies to the whole transaction
+                response = await self._run(self._exchange(op, message))
+            except ResourceError as exc:
+                if isinstance(exc.__cause__, TimeoutError):
+                    self._discard_input = True
+                    self._record(op, message, "", start, timeout=True)
+                raise
+            self._record(op, message, response, start)
+            return response
+
+    async def query(self, message: str) -> str:
+        return await self._transaction(TraceOp.QUERY, message)
+
+    async def write(self, message: str) -> int:
+        await self._transaction(TraceOp.WRITE, message)
+        return len(message.encode()) + len(self.termination)
+
+    async def read(self) -> str:
+        return await self._transaction(TraceOp.READ, "")
+
+    async def clear(self) -> None:
+        async with self._operation_lock():
+            await self._run(self._transport.discard())
+            self._discard_input = False
+
+
+class EventLoopThread:
+    """Event loop running in a daemon thread, shared by synchronous wrappers
+    so that I/O of all asyncio resources is handled by one thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name=type(self).__name__,
+                    daemon=True,
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run coroutine in the event loop thread and wait for its result."""
+        if self._thread is threading.current_thread():
+            raise RuntimeError("blocking call from inside the event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+event_loop_thread = EventLoopThread()
+
+
+class AsyncioResource(Resource):
+    """Synchronous wrapper of an `AsyncResource` for existing adapters.
+
+    Operations run in the shared event loop thread, blocking the caller
+    until completed.
+    """
+
+    def __init__(
+        self,
+        resource_config: ResourceConfig,
+        loop_thread: EventLoopThread | None = None,
+    ) -> None:
+        super().__init__(resource_config)
+        self._loop_thread: EventLoopThread = loop_thread or event_loop_thread
+        self.async_resource: AsyncResource = AsyncResource(resource_config)
+        self.async_resource.metrics = self.metrics
+
+    def __enter__(self) -> Self:
+        self.configure_fingerprint = None
+        self.async_resource.metrics = self.metrics
+        self._loop_thread.run(self.async_resource.open())
+        return self
+
+    def __exit__(self, *args) -> Literal[False]:
+        try:
+            self._loop_thread.run(self.async_resource.close())
+        finally:
+            self.configure_fingerprint = None
+        return False
+
+    def probe(self) -> bool:
+        return self.async_resource.is_open
+
+    def _sync(self, method: Callable[..., Coroutine[Any, Any, T]], *args: Any) -> T:
+        if not self.async_resource.is_open:
+            raise RuntimeError("no open resource")
+        self.async_resource.trace = self.trace
+        return self._loop_thread.run(method(*args))
+
+    def query(self, message: str) -> str:
+        return self._sync(self.async_resource.query, message)
+
+    def write(self, message: str) -> int:
+        return self._sync(self.async_resource.write, message)
+
+    def read(self) -> str:
+        return self._sync(self.async_resource.read)
+
+    def clear(self) -> None:
+        self._sync(self.async_resource.clear)
+
+    @property
+    def supports_srq(self) -> bool:
+        return False
+
+
+class AutoReconnectAsyncioResource(AutoReconnectResource, AsyncioResource): ...
@@ -0,0 +1,104 @@
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .resource import Resource
+
+__all__ = ["CompletionWaiter", "service_request_waiter"]
+
+
+def service_request_waiter(resource: Any) -> Callable[[float], bool] | None:
+    """Return wait function for service requests if supported by resource.
+
+    Service requests are enabled on return, call before initiating the
+    operation to wait for.
+    """
+    if isinstance(resource, Resource) and resource.supports_srq:
+        resource.enable_srq()
+        return resource.wait_for_srq
+    return None
+
+
+class CompletionWaiter:
+    """Wait for completion of an instrument operation.
+
+    If a service request wait function is provided the waiter blocks until
+    the instrument requests service. Otherwise completion is polled with an
+    exponential backoff starting at the minimum interval. The duration of
+    completed operations is learned per key (e.g. a tuple of timing relevant
+    settings), the first poll of known operations is delayed until shortly
+    before the expected completion.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.002,
+        max_interval: float = 0.250,
+        smoothing: float = 0.5,
+    ) -> None:
+        if min_interval <= 0:
+            raise ValueError("min_interval must be > 0")
+        if max_interval < min_interval:
+            raise ValueError("max_interval must be >= min_interval")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in range (0, 1]")
+        self.min_interval: float = float(min_interval)
+        self.max_interval: float = float(max_interval)
+        self.smoothing: float = float(smoothing)
+        self._expected: dict[Hashable, float] = {}
+        self._clock: Callable[[], float] = time.monotonic
+        self._sleep: Callable[[float], None] = time.sleep
+
+    def expected(self, key: Hashable = None) -> float | None:
+        """Return learned duration for key or None if unknown."""
+        return self._expected.get(key)
+
+    def reset(self) -> None:
+        self._expected.clear()
+
+    def wait(
+        self,
+        is_complete: Callable[[], bool],
+        timeout: float,
+        key: Hashable = None,
+        wait_for_srq: Callable[[float], bool] | None = None,
+    ) -> bool:
+        """Wait until operation is complete, return False on timeout."""
+        start = self._clock()
+        threshold = start + timeout
+
+        if wait_for_srq is not None:
+            if not wait_for_srq(timeout):
+                # Check once in case the service request was missed
+                if is_complete():
+                    self._learn(key, self._clock() - start)
+                    return True
+                return False
+            if is_complete():
+                self._learn(key, self._clock() - start)
+                return True
+            # Service requested for another reason, continue polling
+
+        expected = self._expected.get(key)
+        if expected is not None:
+            delay = min(expected * 0.9, threshold - self._clock())
+            if delay > 0:
+                self._sleep(delay)
+
+        interval = self.min_interval
+        while True:
+            if is_complete():
+                self._learn(key, self._clock() - start)
+                return True
+            remaining = threshold - self._clock()
+            if remaining <= 0:
+                return False
+            self._sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_interval)
+
+    def _learn(self, key: Hashable, elapsed: float) -> None:
+        expected = self._expected.get(key)
+        if expected is None:
+            self._expected[key] = elapsed
+        else:
+            self._expected[key] = expected + self.smoothing * (elapsed - expected)
@@ -1,5 +1,6 @@
 import logging
 from dataclasses import dataclass, field
+from enum import StrEnum
 from queue import Empty, Queue
 from threading import Event
 from typing import Any
@@ -21,6 +22,12 @@ from .station import Station
 logger = logging.getLogger(__name__)
 
 
+class SweepMode(StrEnum):
+    HOST = "host"
+    BUFFERED = "buffered"
+    SCRIPT = "script"
+
+
 @dataclass(frozen=True, slots=True)
 class State:
     measurement_type: str = ""
@@ -46,6 +53,31 @@ class State:
     settle_waiting_time: float = 1.0
     tcu_poll_interval: float = 5.0
     wait_for_setpoint: bool = False
+    parallel_acquisition: bool = False
+    parallel_initialization: bool = False
+    keep_sessions: bool = False
+    force_configure: bool = False
+    write_io_metrics: bool = False
+    record_trace: bool = False
+    asyncio_io: bool = False
+    background_writer: bool = False
+    writer_fsync: bool = False
+    acquisition_timeout: float = 60.0
+    sweep_mode: SweepMode = SweepMode.HOST
+    sweep_chunk_size: int = 10
+    adaptive_settle: bool = False
+    settle_tolerance: float = 0.01
+    settle_interval: float = 0.1
+    settle_min_time: float = 0.0
+    settle_max_time: float = 10.0
+    adaptive_stepping: bool = False
+    adaptive_max_step: float = 10.0
+    adaptive_tolerance: float = 0.05
+    ramp_rate: float = 20.0
+    ramp_step: float = 5.0
+    streaming_it: bool = False
+    streaming_interval: float = 0.0
+    streaming_chunk_size: int = 100
 
     def find_role(self, role: Role) -> RoleConfig | None:
         return self.roles.get(role)
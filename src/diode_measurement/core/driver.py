@@ -1,13 +1,17 @@
 import logging
-from collections.abc import Iterable, Mapping
-from typing import Any, Protocol, runtime_checkable
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal, Protocol, Self, runtime_checkable
 
 from comet.driver.generic import InstrumentError
 
 from .resource import Resource
 
 __all__ = [
+    "BufferCursor",
     "Driver",
+    "Transaction",
     "driver_registry",
     "driver_factory",
 ]
@@ -28,6 +32,139 @@ def handle_exception(method):
 class DriverError(Exception): ...
 
 
+class Transaction:
+    """Queue writes of a driver adapter and send them on commit as compound
+    commands, followed by a single operation complete query and error check.
+
+    Queries issued inside a transaction send all queued writes first.
+
+    >>> with adapter.transaction():
+    ...     adapter.set_sense_current_range(1e-6)
+    ...     adapter.set_sense_current_nplc(1.0)
+    """
+
+    def __init__(
+        self, adapter: Any, separator: str = ";", max_length: int = 200
+    ) -> None:
+        self.adapter = adapter
+        self.separator: str = separator
+        self.max_length: int = max_length
+        self.messages: list[str] = []
+        self._written: bool = False
+        self._outer: Transaction | None = None
+
+    def __enter__(self) -> Self:
+        self._outer = getattr(self.adapter, "_transaction", None)
+        if self._outer is None:
+            self.adapter._transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> Literal[False]:
+        if self._outer is not None:
+            return False  # nested, committed by outer transaction
+        self.adapter._transaction = None
+        if exc_type is None:
+            self.commit()
+        else:
+            self.messages.clear()
+        return False
+
+    def write(self, message: str) -> None:
+        self.messages.append(message)
+
+    def compounds(self) -> list[str]:
+        """Return queued messages joined to compound commands."""
+        compounds: list[str] = []
+        for message in self.messages:
+            if compounds and (
+                len(compounds[-1]) + len(self.separator) + len(message)
+                <= self.max_length
+            ):
+                compounds[-1] = f"{compounds[-1]}{self.separator}{message}"
+            else:
+                compounds.append(message)
+        return compounds
+
+    def flush(self) -> None:
+        """Send queued messages without waiting for completion."""
+        resource = self.adapter._resource
+        for compound in self.compounds():
+            resource.write(compound)
+            self._written = True
+        self.messages.clear()
+
+    def commit(self) -> None:
+        self.flush()
+        if self._written:
+            self._written = False
+            try:
+                self.adapter._resource.query("*OPC?")
+            except Exception as exc:
+                raise DriverError(f"{type(self.adapter).__name__}: {exc}") from exc
+            error = self.adapter.next_error()
+            if error is not None:
+                raise DriverError(
+                    f"{type(self.adapter).__name__}: {error.code}: {error.message}"
+                )
+
+
+@dataclass(slots=True)
+class BufferCursor:
+    """Read position in an instrument buffer filled continuously by the
+    trigger model, readings are read incrementally by index.
+
+    A full buffer is re-armed once all of its readings have been read. The
+    time between arming of the first and the current buffer is the offset
+    added to instrument timestamps (relative to the first reading of a
+    buffer), so timestamps are continuous over all buffers. Sampling pauses
+    while re-arming, every re-arm is counted as a gap.
+    """
+
+    size: int
+    index: int = 0
+    offset: float = 0.0
+    origin: float | None = None
+    started: float | None = None
+    gaps: int = 0
+
+    def arm(self) -> None:
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        else:
+            self.gaps += 1
+        self.offset = now - self.started
+        self.origin = None
+        self.index = 0
+
+    def restart(self) -> None:
+        """Continue after the instrument buffer was cleared while sampling,
+        timestamps of following readings are relative to the first reading
+        after the clear.
+        """
+        if self.started is not None:
+            self.offset = time.monotonic() - self.started
+        self.origin = None
+
+    def timestamp(self, t: float) -> float:
+        """Return instrument timestamp relative to the start of sampling."""
+        if self.origin is None:
+            self.origin = t
+        return self.offset + t - self.origin
+
+    def advance(self, count: int, max_count: int) -> tuple[int, int]:
+        """Return zero based range (begin, end) of unread readings of a
+        buffer holding count readings, limited to max_count readings.
+        """
+        begin = self.index
+        self.index = max(begin, min(count, self.size, begin + max(1, max_count)))
+        return begin, self.index
+
+    @property
+    def full(self) -> bool:
+        return self.index >= self.size
+
+
 class Driver(Protocol):
     def __init__(self, resource: Resource) -> None: ...
     def identify(self) -> str: ...
@@ -84,6 +221,57 @@ class VoltageMeasurable(Protocol):
     def measure_v(self) -> float: ...
 
 
+@runtime_checkable
+class ComplianceMeasurable(Protocol):
+    def measure_iv_compliance(self) -> tuple[float, float, bool]: ...
+
+
+@runtime_checkable
+class BufferedSweepMeasurable(Protocol):
+    max_sweep_points: int
+
+    def sweep_iv(
+        self, voltages: Sequence[float], delay: float, abort_on_compliance: bool
+    ) -> list[tuple[float, float, float]]: ...
+
+
+@runtime_checkable
+class BufferedCurrentMeasurable(Protocol):
+    max_buffer_points: int
+
+    def start_i_buffered(self, interval: float) -> None: ...
+
+    def read_i_buffered(self, max_count: int) -> list[tuple[float, float]]: ...
+
+    def stop_i_buffered(self) -> None: ...
+
+    def i_buffered_gaps(self) -> int: ...
+
+
+@runtime_checkable
+class ScriptSweepMeasurable(Protocol):
+    def start_script_sweep(
+        self,
+        voltages: Sequence[float],
+        delay: float,
+        ramp_step: float,
+        ramp_delay: float,
+        abort_on_compliance: bool,
+        ramp_down: bool,
+    ) -> None: ...
+    def read_script_sweep(self) -> tuple[str, list[float]]: ...
+    def abort_script_sweep(self) -> None: ...
+
+
+@runtime_checkable
+class VoltageRamping(Protocol):
+    def start_voltage_ramp(
+        self, begin: float, end: float, rate: float, step: float
+    ) -> None: ...
+    def voltage_ramp_running(self) -> bool: ...
+    def abort_voltage_ramp(self) -> None: ...
+
+
 driver_registry: dict[str, type[Driver]] = {}
 
 
@@ -0,0 +1,133 @@
+import logging
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Literal, Self
+
+from .role import Role
+
+__all__ = ["RoleExecutor", "RoleExecutorError"]
+
+logger = logging.getLogger(__name__)
+
+
+class RoleExecutorError(RuntimeError):
+    """Raised if one or more role tasks failed, collecting all errors."""
+
+    def __init__(self, errors: Mapping[Role, BaseException]) -> None:
+        self.errors: dict[Role, BaseException] = dict(errors)
+        message = "; ".join(
+            f"{role.upper()}: {exc}" for role, exc in self.errors.items()
+        )
+        super().__init__(message)
+
+
+class RoleExecutor:
+    """Run one task per role, either sequentially or concurrently.
+
+    In parallel mode every role is executed in its own worker thread, so
+    instruments on separate sessions are queried at the same time. The
+    timeout applies to each role, all tasks are started at once. Tasks
+    exceeding the timeout are joined for up to `join_timeout` seconds (the
+    resource timeout bounding blocking I/O) before the error is raised.
+    Workers still running after that are abandoned together with their
+    thread pool.
+    """
+
+    def __init__(
+        self,
+        parallel: bool = False,
+        timeout: float | None = None,
+        join_timeout: float = 4.0,
+    ) -> None:
+        self.parallel: bool = parallel
+        self.timeout: float | None = timeout
+        self.join_timeout: float = join_timeout
+        self._pool: ThreadPoolExecutor | None = None
+        self._workers: int = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> Literal[False]:
+        self.shutdown()
+        return False
+
+    def _ensure_pool(self, workers: int) -> ThreadPoolExecutor:
+        pool = self._pool
+        if pool is None or self._workers < workers:
+            if pool is not None:
+                pool.shutdown(wait=True)
+            pool = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix=f"{type(self).__name__}-worker",
+            )
+            self._pool = pool
+            self._workers = workers
+        return pool
+
+    def _abandon_pool(self) -> None:
+        # Do not block on hung workers, a new pool is created on next run.
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._workers = 0
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            self._workers = 0
+
+    def run(self, tasks: Mapping[Role, Callable[[], Any]]) -> dict[Role, Any]:
+        """Execute tasks and return results by role.
+
+        In sequential mode the first exception is propagated unchanged, in
+        parallel mode a `RoleExecutorError` collects the errors of all
+        failed roles.
+        """
+        if not self.parallel or len(tasks) < 2:
+            return self._run_sequential(tasks)
+        return self._run_parallel(tasks)
+
+    def _run_sequential(
+        self, tasks: Mapping[Role, Callable[[], Any]]
+    ) -> dict[Role, Any]:
+        return {role: task() for role, task in tasks.items()}
+
+    def _run_parallel(self, tasks: Mapping[Role, Callable[[], Any]]) -> dict[Role, Any]:
+        pool = self._ensure_pool(len(tasks))
+        futures: dict[Role, Future] = {
+            role: pool.submit(task) for role, task in tasks.items()
+        }
+        _, pending = wait(futures.values(), timeout=self.timeout)
+
+        results: dict[Role, Any] = {}
+        errors: dict[Role, BaseException] = {}
+        for role, future in futures.items():
+            if future in pending:
+                errors[role] = TimeoutError(
+                    f"task exceeded timeout of {self.timeout:G} s"
+                )
+        if pending:
+            # Running tasks can not be cancelled, wait for them to return
+            # before any other thread talks to the same sessions.
+            logger.warning("waiting for %d timed out task(s)...", len(pending))
+            _, pending = wait(pending, timeout=self.join_timeout)
+        if pending:
+            logger.error("abandoning %d hung task(s)", len(pending))
+            self._abandon_pool()
+        for role, future in futures.items():
+            if role in errors:
+                continue
+            exc = future.exception()
+            if exc is not None:
+                errors[role] = exc
+            else:
+                results[role] = future.result()
+
+        if errors:
+            for role, exc in errors.items():
+                logger.error("%s task failed: %s", role.upper(), exc)
+            raise RoleExecutorError(errors)
+
+        return results
@@ -2,10 +2,11 @@ import contextlib
 import logging
 import math
 import time
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from contextlib import suppress
 from dataclasses import dataclass
 from enum import StrEnum
+from functools import partial
 from queue import Queue
 from threading import Event
 from typing import Any, Self
@@ -16,17 +17,29 @@ from comet.functions import LinearRange
 from ..actors import TCUActor
 from ..writer import Writer
 from .actor import ActorNotRunningError
-from .context import Context, PendingChanges, RuntimeState, State
-from .driver import VoltageMeasurable
+from .context import Context, PendingChanges, RuntimeState, State, SweepMode
+from .driver import (
+    BufferedSweepMeasurable,
+    ComplianceMeasurable,
+    ScriptSweepMeasurable,
+    VoltageMeasurable,
+    VoltageRamping,
+)
 from .events import (
     ChangeVoltageDoneEvent,
     ExceptionEvent,
     Reading,
     UpdateMetricsEvent,
 )
+from .executor import RoleExecutor
+from .pool import is_session_error
+from .ramp import AdaptiveRange
 from .resource import drain_output_buffer
-from .role import Role
+from .role import Role, configure_fingerprint
+from .settle import SettleDetector
 from .station import Station
+from .switch import channel_group_delay, channel_groups, static_channels
+from .timers import DeadlineScheduler
 
 __all__ = [
     "MeasurementParameters",
@@ -74,6 +87,8 @@ class IVReading(Reading):
     i_smu2: float
     i_elm: float
     i_elm2: float
+    settle_time: float = math.nan
+    channel_group: int | None = None
 
 
 class Measurement:
@@ -84,7 +99,19 @@ class Measurement:
 
         self.tcu = TCUController(context)
 
+        self.role_executor = RoleExecutor(
+            parallel=self.state.parallel_acquisition,
+            timeout=self.state.acquisition_timeout,
+            join_timeout=max(
+                (role.timeout for role in self.state.roles.values()), default=4.0
+            ),
+        )
+        self.initialize_executor = RoleExecutor(
+            parallel=self.state.parallel_initialization
+        )
+
         self.writers: list[Writer] = []
+        self.io_metrics: dict[str, Any] = {}
 
     @classmethod
     def create(
@@ -127,8 +154,14 @@ class Measurement:
 
     def on_finished(self) -> None:
         for writer in self.writers:
-            self.on_write_end(writer)
-            writer.flush()
+            try:
+                self.on_write_end(writer)
+            finally:
+                try:
+                    writer.close()
+                except Exception as exc:
+                    logger.exception("failed to close writer")
+                    self.context.submit_event(ExceptionEvent(exc))
 
     def check_error_state(self, context) -> None:
         error = context.next_error()
@@ -149,6 +182,14 @@ class Measurement:
         """Emit update progress event."""
         self.submit_update({"progress": (begin, end, step)})
 
+    def read_instruments(
+        self, tasks: Mapping[Role, Callable[[], Any]]
+    ) -> dict[Role, Any]:
+        """Execute instrument readings by role, concurrently if parallel
+        acquisition is enabled.
+        """
+        return self.role_executor.run(tasks)
+
     def initialize(self) -> None: ...
 
     def measure(self) -> None: ...
@@ -175,6 +216,9 @@ class Measurement:
                     logger.debug("measure... done.")
                 except Exception as exc:
                     logger.exception("failed to initialize measurement")
+                    self.station.clear_configure_fingerprints()
+                    if is_session_error(exc):
+                        self.station.mark_resources_failed()
                     self.context.submit_event(ExceptionEvent(exc))
                 finally:
                     logger.debug("finalize...")
@@ -185,6 +229,10 @@ class Measurement:
             logger.exception("failed to run measurement")
             self.context.submit_event(ExceptionEvent(exc))
         finally:
+            self.role_executor.shutdown()
+            self.initialize_executor.shutdown()
+            self.io_metrics = self.station.io_metrics()
+            self.submit_update({"io_metrics": self.io_metrics})
             logger.debug("handle finished callbacks...")
             self.on_finished()
             logger.debug("handle finished callbacks... done.")
@@ -211,6 +259,37 @@ class RangeMeasurement(Measurement):
                     "failed to drain output buffer for %r: %r", role.upper(), exc
                 )
 
+    def update_instrument_state(self, role: Role | None, **changes: Any) -> None:
+        """Keep last applied source state, reapplied on automatic reconnect."""
+        if role is not None:
+            state = self.station.instrument_state(role)
+            for name, value in changes.items():
+                setattr(state, name, value)
+
+    def instrument_role(self, instrument: Any) -> Role | None:
+        for role, other in self.station.instruments.items():
+            if other is instrument:
+                return role
+        return None
+
+    def restore_voltage(self, role: Role, begin: float, end: float) -> None:
+        """Ramp voltage of an instrument restored after reconnecting."""
+        instrument = self.station.instruments[role]
+        if role == self.state.source_role:
+            set_voltage = self.set_source_voltage
+        elif role == self.state.bias_source_role:
+            set_voltage = self.set_bias_source_voltage
+        else:
+            set_voltage = instrument.set_voltage_level
+        self.ramp_voltage(
+            instrument,
+            begin,
+            end,
+            set_voltage,
+            f"Restore {role.upper()} to {end} V",
+            interruptible=False,
+        )
+
     # Source
 
     def get_source_output_state(self) -> bool:
@@ -219,6 +298,7 @@ class RangeMeasurement(Measurement):
     def set_source_output_state(self, state: bool) -> None:
         logger.info("Source output state: %s", state)
         self.source_instrument.set_output_enabled(state)  # type: ignore
+        self.update_instrument_state(self.state.source_role, output_enabled=state)
         self.submit_update({"source_output_state": state})
 
     def get_source_voltage(self) -> float:
@@ -226,7 +306,9 @@ class RangeMeasurement(Measurement):
 
     def set_source_voltage(self, voltage: float) -> None:
         logger.info("Source voltage level: %gV", voltage)
+        self.compliance_status.pop(self.source_instrument, None)
         self.source_instrument.set_voltage_level(voltage)  # type: ignore
+        self.update_instrument_state(self.state.source_role, voltage_level=voltage)
         self.submit_update({"source_voltage": voltage})
 
     def set_source_voltage_range(self, voltage: float) -> None:
@@ -241,6 +323,7 @@ class RangeMeasurement(Measurement):
     def set_bias_source_output_state(self, state: bool) -> None:
         logger.info("Bias source output state: %s", state)
         self.bias_source_instrument.set_output_enabled(state)  # type: ignore
+        self.update_instrument_state(self.state.bias_source_role, output_enabled=state)
         self.submit_update({"bias_source_output_state": state})
 
     def get_bias_source_voltage(self) -> float:
@@ -248,13 +331,34 @@ class RangeMeasurement(Measurement):
 
     def set_bias_source_voltage(self, voltage: float) -> None:
         logger.info("Bias source voltage level: %gV", voltage)
+        self.compliance_status.pop(self.bias_source_instrument, None)
         self.bias_source_instrument.set_voltage_level(voltage)  # type: ignore
+        self.update_instrument_state(self.state.bias_source_role, voltage_level=voltage)
         self.submit_update({"bias_source_voltage": voltage})
 
     def set_bias_source_voltage_range(self, voltage: float) -> None:
         logger.info("Bias source voltage range: %gV", voltage)
         self.bias_source_instrument.set_voltage_range(voltage)  # type: ignore
 
+    def measure_iv(self, instrument: Any) -> tuple[float, float]:
+        """Measure I and V, the compliance state is kept for the next
+        compliance check if the instrument returns it with the reading.
+        """
+        if isinstance(instrument, ComplianceMeasurable):
+            i, v, tripped = instrument.measure_iv_compliance()
+            self.compliance_status[instrument] = tripped
+            return i, v
+        return instrument.measure_iv()
+
+    def compliance_tripped(self, instrument: Any) -> bool:
+        """Return compliance state of the last reading or query the
+        instrument if not available.
+        """
+        tripped = self.compliance_status.pop(instrument, None)
+        if tripped is None:
+            return instrument.compliance_tripped()
+        return tripped
+
     def check_current_compliance(self) -> None:
         """Raise exception if current compliance tripped and continue in
         compliance option is not active.
@@ -263,7 +367,7 @@ class RangeMeasurement(Measurement):
         if (
             not continue_in_compliance
             and self.source_instrument is not None
-            and self.source_instrument.compliance_tripped()
+            and self.compliance_tripped(self.source_instrument)
         ):
             raise RuntimeError("Source compliance tripped!")
 
@@ -279,11 +383,17 @@ class RangeMeasurement(Measurement):
         if self.source_instrument is not None:
             logger.info("Source current compliance level: %gA", compliance)
             self.source_instrument.set_current_compliance_level(compliance)
+            self.update_instrument_state(
+                self.state.source_role, current_compliance=compliance
+            )
 
     def set_bias_source_compliance(self, compliance: float) -> None:
         if self.bias_source_instrument is not None:
             logger.info("Bias source current compliance level: %gA", compliance)
             self.bias_source_instrument.set_current_compliance_level(compliance)
+            self.update_instrument_state(
+                self.state.bias_source_role, current_compliance=compliance
+            )
 
     def check_bias_current_compliance(self) -> None:
         """Raise exception if biascurrent compliance tripped and continue in
@@ -293,7 +403,7 @@ class RangeMeasurement(Measurement):
         if (
             not continue_in_compliance
             and self.bias_source_instrument is not None
-            and self.bias_source_instrument.compliance_tripped()
+            and self.compliance_tripped(self.bias_source_instrument)
         ):
             raise RuntimeError("Source compliance tripped!")
 
@@ -306,34 +416,72 @@ class RangeMeasurement(Measurement):
             self.check_error_state(self.bias_source_instrument)
 
     def apply_waiting_time(self) -> None:
+        if self.state.adaptive_settle:
+            self.apply_adaptive_settle()
+            return
         waiting_time: float = self.state.waiting_time
         logger.info("Waiting for %.2f sec", waiting_time)
         time.sleep(waiting_time)
+        self.settle_time = waiting_time
+
+    def apply_adaptive_settle(self) -> None:
+        """Wait until the current converged, bounded by min and max settle
+        time.
+        """
+        detector = SettleDetector(
+            tolerance=self.state.settle_tolerance,
+            interval=self.state.settle_interval,
+            min_time=self.state.settle_min_time,
+            max_time=self.state.settle_max_time,
+        )
+        self.settle_time = detector.wait(
+            self.read_settle_current, lambda: self.context.stop_requested
+        )
+        logger.info("Settled after %.2f sec", self.settle_time)
+
+    def read_settle_current(self) -> float:
+        """Return current reading used for settle detection."""
+        elm = self.station.instruments.get(Role.ELM)
+        if elm is not None:
+            return elm.measure_i()
+        return self.source_instrument.measure_i()  # type: ignore
 
     def apply_waiting_time_continuous(self, estimate: Estimate) -> None:
+        """Wait for the next deadline of the continuous sampling schedule,
+        aborted by stop or change voltage requests.
+        """
         self.context.process_inbox()
+        scheduler: DeadlineScheduler = self.continuous_scheduler
         waiting_time: float = self.context.runtime_state.waiting_time_continuous
+        if waiting_time != scheduler.period:
+            logger.info("Continuous sampling period: %.2f sec", waiting_time)
+            scheduler.reset(waiting_time, aligned=True)
+        skipped: int = scheduler.advance()
+        if skipped:
+            logger.warning("Continuous sampling overrun, skipped %d tick(s)", skipped)
+            self.submit_update(
+                {
+                    "continuous_overruns": scheduler.overruns,
+                    "continuous_skipped": scheduler.skipped,
+                }
+            )
         interval: float = 1.0
-        logger.info("Waiting for %.2f sec", waiting_time)
-        if waiting_time < interval:
-            time.sleep(waiting_time)
-        else:
-            now: float = time.monotonic()
-            threshold: float = now + waiting_time
-            while now < threshold:
-                if self.context.stop_requested:
-                    self.update_message("Stopping...")
-                    break
-                # Abort waiting in case change voltsage request arrives
-                self.context.process_inbox()
-                if self.context.runtime_state.pending.voltage_change is not None:
-                    break
-                remaining: float = round(threshold - now)
+        remaining: float = scheduler.remaining()
+        logger.info("Waiting for %.2f sec", remaining)
+        while remaining > 0:
+            if self.context.stop_requested:
+                self.update_message("Stopping...")
+                break
+            # Abort waiting in case change voltsage request arrives
+            self.context.process_inbox()
+            if self.context.runtime_state.pending.voltage_change is not None:
+                break
+            if remaining >= interval:
                 self.update_estimate_message_continuous(
-                    f"Next reading in {remaining:d} sec...", estimate
+                    f"Next reading in {round(remaining):d} sec...", estimate
                 )
-                time.sleep(interval)
-                now = time.monotonic()
+            self.context.wait(min(interval, remaining))
+            remaining = scheduler.remaining()
 
     def apply_change_voltage(self):
         parameters = self.context.runtime_state.pending.pop_voltage_change()
@@ -346,6 +494,7 @@ class RangeMeasurement(Measurement):
             )
             if not self.context.stop_requested:  # hack
                 self.set_fsm_state(FSMState.CONTINUOUS)
+            self.continuous_scheduler.reset(aligned=True)
             self.context.submit_event(ChangeVoltageDoneEvent())
 
     def update_estimate_message(self, message: str, estimate: Estimate) -> None:
@@ -372,6 +521,15 @@ class RangeMeasurement(Measurement):
         self.update_progress(0, estimate.total, estimate.passed)
 
     def initialize(self) -> None:
+        self.station.voltage_ramp = self.restore_voltage
+        self.compliance_status: dict[Any, bool] = {}
+        self.settle_time = math.nan
+        self.channel_groups: list[list[str]] = []
+        self.channel_group: int | None = None
+        self.continuous_scheduler = DeadlineScheduler(
+            self.context.runtime_state.waiting_time_continuous
+        )
+
         self.safe_drain_output_buffers()
 
         source_role = self.state.source_role
@@ -392,11 +550,16 @@ class RangeMeasurement(Measurement):
             if self.bias_source_instrument is None:
                 raise RuntimeError("No bias source instrument set")
 
+        # Identify, reset, clear and configure are executed concurrently per
+        # role if enabled, output state and ramps are applied sequentially.
         logger.debug("querying context identities...")
-        for role, instrument in self.station.instruments.items():
-            logger.debug("reading %s identity...", role.upper())
-            identity: str = instrument.identify()
-            logger.debug("reading %s identity... done.", role.upper())
+        identities: dict[Role, str] = self.initialize_executor.run(
+            {
+                role: instrument.identify
+                for role, instrument in self.station.instruments.items()
+            }
+        )
+        for role, identity in identities.items():
             logger.info("%s IDN: %s", role.upper(), identity)
         logger.debug("querying context identities... done.")
 
@@ -424,30 +587,15 @@ class RangeMeasurement(Measurement):
         # Switch
         self.initialize_switch()
 
-        # Reset (optional)
-        for role, instrument in self.station.instruments.items():
-            role_config = self.state.find_role(role)
-            if role_config and role_config.reset_instrument:
-                logger.info("Reset %s...", role.upper())
-                instrument.reset()
-                logger.info("Reset %s... done.", role.upper())
-
-        # Clear state
-        for role, instrument in self.station.instruments.items():
-            logger.info("Clear %s...", role.upper())
-            instrument.clear()
-            logger.info("Clear %s... done.", role.upper())
-
-        # Configure
-        for role, instrument in self.station.instruments.items():
-            logger.info("Configure %s...", role.upper())
-            role_config = self.state.find_role(role)
-            if role_config is not None:
-                for name, value in role_config.options.items():
-                    logger.info("%s: %r", name, value)
-                instrument.configure(role_config.options)
-                self.check_error_state(instrument)
-            logger.info("Configure %s... done.", role.upper())
+        # Reset (optional), clear and configure
+        self.initialize_executor.run(
+            {
+                role: partial(
+                    self.configure_instrument, role, instrument, identities[role]
+                )
+                for role, instrument in self.station.instruments.items()
+            }
+        )
 
         # Compliance
         self.context.process_inbox()
@@ -491,6 +639,52 @@ class RangeMeasurement(Measurement):
 
         self.apply_settle_waiting_time()
 
+    def configure_instrument(self, role: Role, instrument: Any, identity: str) -> None:
+        """Reset (optional), clear and configure an instrument. Configuration
+        is skipped if the same options were already applied to the identified
+        instrument on the current session, unless forced.
+        """
+        role_config = self.state.find_role(role)
+        resource = self.station.resources.get(role)
+
+        if role_config and role_config.reset_instrument:
+            logger.info("Reset %s...", role.upper())
+            if resource is not None:
+                resource.configure_fingerprint = None
+            instrument.reset()
+            logger.info("Reset %s... done.", role.upper())
+
+        logger.info("Clear %s...", role.upper())
+        instrument.clear()
+        logger.info("Clear %s... done.", role.upper())
+
+        if role_config is None:
+            return
+
+        fingerprint = configure_fingerprint(
+            role_config.model, identity, role_config.options
+        )
+        # Reapplied on automatic reconnect
+        self.station.instrument_state(role).options = role_config.options
+        if (
+            resource is not None
+            and not self.state.force_configure
+            and resource.configure_fingerprint == fingerprint
+        ):
+            logger.info("Configure %s... unchanged, skipped.", role.upper())
+            return
+
+        logger.info("Configure %s...", role.upper())
+        if resource is not None:
+            resource.configure_fingerprint = None
+        for name, value in role_config.options.items():
+            logger.info("%s: %s: %r", role.upper(), name, value)
+        instrument.configure(role_config.options)
+        self.check_error_state(instrument)
+        if resource is not None:
+            resource.configure_fingerprint = fingerprint
+        logger.info("Configure %s... done.", role.upper())
+
     def initialize_elms(self) -> None:
         elm = self.station.instruments.get(Role.ELM)
         if elm is not None:
@@ -507,6 +701,45 @@ class RangeMeasurement(Measurement):
         if switch is not None:
             switch.open_all_channels()
             logger.info("Switch: opened ALL channels")
+            # Configured channels must be closed again
+            self.station.resources[Role.SWITCH].configure_fingerprint = None
+            self.channel_groups = channel_groups(self.state)
+            if self.channel_groups:
+                logger.info("Switch: %d channel groups", len(self.channel_groups))
+
+    def select_channel_group(self, index: int) -> None:
+        """Open channels of the previous channel group and close channels of
+        the selected group, then apply the channel group delay. Statically
+        configured channels of the switch are kept closed.
+        """
+        if index == self.channel_group:
+            return
+        switch = self.station.instruments[Role.SWITCH]
+        channels = self.channel_groups[index]
+        if self.channel_group is not None:
+            previous = self.channel_groups[self.channel_group]
+            keep = set(channels).union(static_channels(self.state))
+            switch.open_channels([c for c in previous if c not in keep])
+        switch.close_channels(channels)
+        self.channel_group = index
+        logger.info("Switch: channel group %d: %s", index, ", ".join(channels))
+        delay = channel_group_delay(self.state)
+        if delay > 0:
+            time.sleep(delay)
+
+    def acquire_step_reading(self, voltage: float) -> Any:
+        """Acquire a reading for every channel group or a single reading if
+        not multiplexing, return the reading of the first channel group.
+        """
+        if not self.channel_groups:
+            return self.acquire_reading(voltage)
+        first_reading = None
+        for index in range(len(self.channel_groups)):
+            self.select_channel_group(index)
+            reading = self.acquire_reading(voltage)
+            if first_reading is None:
+                first_reading = reading
+        return first_reading
 
     def apply_settle_waiting_time(self) -> None:
         """Wait after output enable/ramp"""
@@ -515,18 +748,67 @@ class RangeMeasurement(Measurement):
         time.sleep(waiting_time_settle)
         logger.debug("apply settle time... done.")
 
-    def measure(self) -> None:
-        ramp: LinearRange = LinearRange(
+    def create_ramp(self) -> LinearRange | AdaptiveRange:
+        if self.state.adaptive_stepping:
+            return AdaptiveRange(
+                self.state.voltage_begin,
+                self.state.voltage_end,
+                min_step=self.state.voltage_step,
+                max_step=self.state.adaptive_max_step,
+                tolerance=self.state.adaptive_tolerance,
+            )
+        return LinearRange(
             self.state.voltage_begin,
             self.state.voltage_end,
             self.state.voltage_step,
         )
 
+    def ramp_feedback_value(self, reading: Any) -> float:
+        """Return value fed back to adaptive ramps, the ELM current if
+        available, else the SMU current.
+        """
+        i_elm = getattr(reading, "i_elm", math.nan)
+        if math.isfinite(i_elm):
+            return i_elm
+        return getattr(reading, "i_smu", math.nan)
+
+    def measure(self) -> None:
+        ramp: LinearRange | AdaptiveRange = self.create_ramp()
+
         self.update_message(f"Ramp to {ramp.end} V")
         estimate: Estimate = Estimate(len(ramp))
 
         self.set_fsm_state(FSMState.RAMPING)
 
+        if isinstance(ramp, LinearRange) and self.use_script_sweep():
+            self.measure_script_sweep(ramp, estimate)
+        elif isinstance(ramp, LinearRange) and self.use_buffered_sweep():
+            self.measure_buffered_sweep(ramp, estimate)
+        else:
+            self.measure_host_sweep(ramp, estimate)
+
+        if self.context.stop_requested:
+            self.update_message("Stopping...")
+            return
+
+        self.update_message("")
+
+        if self.state.is_continuous:
+            if self.channel_groups:
+                # Continuous readings are taken on the first channel group
+                self.select_channel_group(0)
+            self.update_message("Continuous measurement...")
+            self.set_fsm_state(FSMState.CONTINUOUS)
+            self.continuous_scheduler.reset(aligned=True)
+            self.submit_update({"continuous_overruns": 0, "continuous_skipped": 0})
+            self.acquire_continuous_reading()
+
+    def measure_host_sweep(
+        self, ramp: LinearRange | AdaptiveRange, estimate: Estimate
+    ) -> None:
+        """Sweep point by point, the host sets each voltage and reads all
+        instruments.
+        """
         for step, voltage in enumerate(ramp):
             self.context.process_inbox()
 
@@ -534,13 +816,12 @@ class RangeMeasurement(Measurement):
             self.update_estimate_progress(estimate)
 
             if self.context.stop_requested:
-                self.update_message("Stopping...")
                 return
             self.set_source_voltage(voltage)
 
             self.apply_waiting_time()
 
-            self.acquire_reading(voltage)
+            reading = self.acquire_step_reading(voltage)
 
             self.check_current_compliance()
             self.update_current_compliance()
@@ -549,18 +830,245 @@ class RangeMeasurement(Measurement):
                 self.check_bias_current_compliance()
                 self.update_bias_current_compliance()
 
-            estimate.advance()
+            if isinstance(ramp, AdaptiveRange):
+                ramp.feed(self.ramp_feedback_value(reading))
+                # Progress by voltage, counted in minimum steps
+                for _ in range(ramp.last_step_count):
+                    estimate.advance()
+            else:
+                estimate.advance()
 
-        self.update_message("")
+    def supports_buffered_sweep(self) -> bool:
+        """Return True if the source instrument alone provides all readings
+        required for a ramp point.
+        """
+        return False
+
+    def use_buffered_sweep(self) -> bool:
+        if self.state.sweep_mode != SweepMode.BUFFERED:
+            return False
+        if self.state.adaptive_stepping:
+            logger.warning("Buffered sweep requires a linear ramp, using host sweep.")
+            return False
+        if self.channel_groups:
+            logger.warning(
+                "Buffered sweep does not support channel groups, using host sweep."
+            )
+            return False
+        if not isinstance(self.source_instrument, BufferedSweepMeasurable):
+            logger.warning(
+                "Source instrument does not support buffered sweeps, using host sweep."
+            )
+            return False
+        if not self.supports_buffered_sweep():
+            logger.warning(
+                "Buffered sweep requires the source to be the only reading "
+                "instrument, using host sweep."
+            )
+            return False
+        return True
+
+    def measure_buffered_sweep(self, ramp: LinearRange, estimate: Estimate) -> None:
+        """Sweep in chunks using the source instrument's list sweep and
+        reading buffer. Unless continuing in compliance, the sweep is aborted
+        at the first point in compliance and only readings up to this point
+        are written. Stop requests and compliance changes apply between
+        chunks.
+        """
+        source = self.source_instrument
+        if not isinstance(source, BufferedSweepMeasurable):
+            raise TypeError("Source instrument does not support buffered sweeps.")
+        voltages: list[float] = list(ramp)
+        chunk_size: int = max(
+            1, min(source.max_sweep_points, self.state.sweep_chunk_size)
+        )
+        waiting_time: float = self.state.waiting_time
 
-        if self.context.stop_requested:
-            self.update_message("Stopping...")
-            return
+        for offset in range(0, len(voltages), chunk_size):
+            self.context.process_inbox()
 
-        if self.state.is_continuous:
-            self.update_message("Continuous measurement...")
-            self.set_fsm_state(FSMState.CONTINUOUS)
-            self.acquire_continuous_reading()
+            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
+            self.update_estimate_progress(estimate)
+
+            if self.context.stop_requested:
+                return
+
+            chunk = voltages[offset : offset + chunk_size]
+            logger.info(
+                "Source voltage sweep: %gV to %gV (%d points)",
+                chunk[0],
+                chunk[-1],
+                len(chunk),
+            )
+            abort_on_compliance = not self.context.runtime_state.continue_in_compliance
+            role = self.state.source_role
+            # First reading is taken after the source delay
+            t_first = time.time() + waiting_time
+            self.update_instrument_state(role, operation="sweep")
+            try:
+                results = source.sweep_iv(chunk, waiting_time, abort_on_compliance)
+            finally:
+                self.update_instrument_state(role, operation=None)
+            self.update_instrument_state(role, voltage_level=self.get_source_voltage())
+            aborted = len(results) < len(chunk)
+            chunk = chunk[: len(results)]
+            if chunk:
+                self.submit_update({"source_voltage": chunk[-1]})
+
+            self.acquire_sweep_readings(chunk, results, t_first)
+
+            if aborted:
+                raise RuntimeError("Source compliance tripped!")
+            self.check_current_compliance()
+            self.update_current_compliance()
+
+            for _ in chunk:
+                estimate.advance()
+
+    def use_script_sweep(self) -> bool:
+        if self.state.sweep_mode != SweepMode.SCRIPT:
+            return False
+        if self.state.adaptive_stepping:
+            logger.warning("Script sweep requires a linear ramp, using host sweep.")
+            return False
+        if self.channel_groups:
+            logger.warning(
+                "Script sweep does not support channel groups, using host sweep."
+            )
+            return False
+        if not isinstance(self.source_instrument, ScriptSweepMeasurable):
+            logger.warning(
+                "Source instrument does not support script sweeps, using host sweep."
+            )
+            return False
+        if not self.supports_buffered_sweep():
+            logger.warning(
+                "Script sweep requires the source to be the only reading "
+                "instrument, using host sweep."
+            )
+            return False
+        return True
+
+    def measure_script_sweep(self, ramp: LinearRange, estimate: Estimate) -> None:
+        """Run the sweep in chunks as script on the source instrument, rows
+        printed by the script are converted to readings. The script aborts
+        and ramps down on compliance, and ramps down after the last chunk
+        unless continuous mode follows. Compliance changes apply between
+        chunks, a stopped or failed script is aborted and the source ramped
+        down from the level the script stopped at.
+        """
+        source = self.source_instrument
+        if not isinstance(source, ScriptSweepMeasurable):
+            raise TypeError("Source instrument does not support script sweeps.")
+        voltages: list[float] = list(ramp)
+        chunk_size: int = max(1, self.state.sweep_chunk_size)
+        ramp_step: float = self.state.ramp_step
+
+        logger.info(
+            "Source voltage script sweep: %gV to %gV (%d points)",
+            ramp.begin,
+            ramp.end,
+            len(voltages),
+        )
+        for offset in range(0, len(voltages), chunk_size):
+            self.context.process_inbox()
+
+            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
+            self.update_estimate_progress(estimate)
+
+            if self.context.stop_requested:
+                return
+
+            self.update_current_compliance()
+
+            chunk = voltages[offset : offset + chunk_size]
+            last_chunk = offset + chunk_size >= len(voltages)
+            abort_on_compliance = not self.context.runtime_state.continue_in_compliance
+            self.run_script_sweep(
+                source,
+                chunk,
+                ramp_step,
+                abort_on_compliance,
+                last_chunk and not self.state.is_continuous,
+                f"Ramp to {ramp.end} V",
+                estimate,
+            )
+
+    def run_script_sweep(
+        self,
+        source: ScriptSweepMeasurable,
+        voltages: list[float],
+        ramp_step: float,
+        abort_on_compliance: bool,
+        ramp_down: bool,
+        message: str,
+        estimate: Estimate,
+    ) -> None:
+        role = self.state.source_role
+        self.update_instrument_state(role, operation="script sweep")
+        source.start_script_sweep(
+            voltages,
+            self.state.waiting_time,
+            ramp_step,
+            ramp_step / self.state.ramp_rate,
+            abort_on_compliance,
+            ramp_down,
+        )
+        finished = False
+        try:
+            while not finished:
+                self.context.process_inbox()
+
+                self.update_estimate_message(message, estimate)
+                self.update_estimate_progress(estimate)
+
+                if self.context.stop_requested:
+                    return
+
+                kind, values = source.read_script_sweep()
+                match kind:
+                    case "P":
+                        _, voltage, i, v, _ = values
+                        self.update_instrument_state(role, voltage_level=voltage)
+                        self.submit_update({"source_voltage": voltage})
+                        self.acquire_sweep_readings(
+                            [voltage], [(0.0, i, v)], time.time()
+                        )
+                        estimate.advance()
+                    case "R":
+                        self.update_instrument_state(role, voltage_level=values[0])
+                        self.submit_update({"source_voltage": values[0]})
+                    case "C":
+                        finished = True
+                        self.update_instrument_state(role, voltage_level=0.0)
+                        self.submit_update({"source_voltage": 0.0})
+                        raise RuntimeError("Source compliance tripped!")
+                    case "E":
+                        finished = True
+        finally:
+            self.update_instrument_state(role, operation=None)
+            if not finished:
+                self.abort_script_sweep(source)
+
+    def abort_script_sweep(self, source: ScriptSweepMeasurable) -> None:
+        """Abort the sweep script and ramp the source to zero from the level
+        the script stopped at, as the script does on compliance.
+        """
+        source.abort_script_sweep()
+        source_voltage = self.get_source_voltage()
+        self.update_instrument_state(
+            self.state.source_role, voltage_level=source_voltage
+        )
+        self.submit_update({"source_voltage": source_voltage})
+        logger.info("Ramp source to zero after aborted script sweep...")
+        self.ramp_voltage(
+            source,
+            source_voltage,
+            0.0,
+            self.set_source_voltage,
+            "Ramp to 0.0 V",
+            interruptible=False,
+        )
 
     def finalize(self) -> None:
         try:
@@ -586,6 +1094,8 @@ class RangeMeasurement(Measurement):
 
             self.finalize_switch()
         finally:
+            self.station.voltage_ramp = None
+
             self.tcu.stop()
 
             self.submit_update(
@@ -653,37 +1163,171 @@ class RangeMeasurement(Measurement):
 
         self.update_message("")
 
-    def acquire_reading(self, source_voltage: float) -> None:
+    def acquire_reading(self, source_voltage: float) -> Reading:
         raise NotImplementedError
 
     def acquire_reading_data(self, source_voltage: float) -> IVReading:
         raise NotImplementedError
 
+    def acquire_sweep_readings(
+        self,
+        voltages: list[float],
+        results: list[tuple[float, float, float]],
+        t_first: float,
+    ) -> None:
+        raise NotImplementedError
+
     def acquire_continuous_reading(self) -> None: ...
 
+    def ramp_voltage(
+        self,
+        instrument: Any,
+        begin: float,
+        end: float,
+        set_voltage: Callable[[float], None],
+        message: str,
+        interruptible: bool = True,
+    ) -> None:
+        """Ramp instrument voltage from begin to end at the configured ramp
+        rate, using the instrument's native ramp if supported.
+
+        Interruptible ramps stop early if a stop was requested.
+        """
+        rate: float = abs(self.state.ramp_rate)
+        step: float = abs(self.state.ramp_step)
+        if isinstance(instrument, VoltageRamping) and abs(end - begin) > step:
+            self.ramp_voltage_native(
+                instrument, begin, end, rate, step, set_voltage, message, interruptible
+            )
+        else:
+            self.ramp_voltage_host(
+                begin, end, rate, step, set_voltage, message, interruptible
+            )
+
+    def ramp_voltage_host(
+        self,
+        begin: float,
+        end: float,
+        rate: float,
+        step: float,
+        set_voltage: Callable[[float], None],
+        message: str,
+        interruptible: bool,
+    ) -> None:
+        waiting_time: float = step / rate
+
+        ramp: LinearRange = LinearRange(begin, end, step)
+        estimate: Estimate = Estimate(len(ramp))
+
+        for voltage in ramp:
+            self.update_estimate_message(message, estimate)
+            self.update_estimate_progress(estimate)
+
+            if interruptible and self.context.stop_requested:
+                break
+            set_voltage(voltage)
+            if interruptible:
+                self.context.wait(waiting_time)
+            else:
+                time.sleep(waiting_time)
+            estimate.advance()
+
+    def ramp_voltage_native(
+        self,
+        instrument: Any,
+        begin: float,
+        end: float,
+        rate: float,
+        step: float,
+        set_voltage: Callable[[float], None],
+        message: str,
+        interruptible: bool,
+    ) -> None:
+        """Run native voltage ramp. A failed non-interruptible ramp (ramp
+        down) is aborted and continued as host ramp from the read back level.
+        """
+        role = self.instrument_role(instrument)
+        try:
+            self.update_instrument_state(role, operation="ramp")
+            try:
+                self.run_native_ramp(
+                    instrument,
+                    begin,
+                    end,
+                    rate,
+                    step,
+                    set_voltage,
+                    message,
+                    interruptible,
+                )
+            finally:
+                self.update_instrument_state(role, operation=None)
+        except Exception as exc:
+            if interruptible:
+                raise
+            logger.error("Native voltage ramp failed: %s, using host ramp.", exc)
+            instrument.abort_voltage_ramp()
+            level: float = instrument.get_voltage_level()
+            set_voltage(level)
+            self.ramp_voltage_host(
+                level, end, rate, step, set_voltage, message, interruptible
+            )
+
+    def run_native_ramp(
+        self,
+        instrument: Any,
+        begin: float,
+        end: float,
+        rate: float,
+        step: float,
+        set_voltage: Callable[[float], None],
+        message: str,
+        interruptible: bool,
+    ) -> None:
+        interval: float = 0.250
+        duration: float = abs(end - begin) / rate
+        timeout: float = duration * 2 + 60.0
+
+        logger.info("Native voltage ramp: %gV to %gV at %gV/s", begin, end, rate)
+        instrument.start_voltage_ramp(begin, end, rate, step)
+
+        start = time.monotonic()
+        while instrument.voltage_ramp_running():
+            elapsed = time.monotonic() - start
+            remaining = max(0.0, duration - elapsed)
+            self.update_message(
+                f"{message} | Elapsed {elapsed:.0f} s | Remaining {remaining:.0f} s"
+            )
+            self.update_progress(0, 100, min(100, round(100 * elapsed / duration)))
+
+            if interruptible and self.context.stop_requested:
+                instrument.abort_voltage_ramp()
+                set_voltage(instrument.get_voltage_level())
+                return
+            if elapsed > timeout:
+                instrument.abort_voltage_ramp()
+                set_voltage(instrument.get_voltage_level())
+                raise TimeoutError(f"Voltage ramp timeout, exceeded {timeout:G} s")
+            time.sleep(interval)
+
+        set_voltage(end)
+
     def ramp_to_begin(self) -> None:
         source_voltage = self.get_source_voltage()
         voltage_begin: float = self.state.voltage_begin
         voltage_end: float = self.state.voltage_end
-        voltage_step: float = 5.0
-        waiting_time: float = 0.250
 
         # Set voltage range according to highest voltage in ramp.
         # Including reverse ramps, eg. -100V...+10V -> range is 100V
         self.set_source_voltage_range(max(abs(voltage_begin), abs(voltage_end)))
 
-        ramp: LinearRange = LinearRange(source_voltage, voltage_begin, voltage_step)
-        estimate: Estimate = Estimate(len(ramp))
-
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            if self.context.stop_requested:
-                break
-            self.set_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
+        self.ramp_voltage(
+            self.source_instrument,
+            source_voltage,
+            voltage_begin,
+            self.set_source_voltage,
+            f"Ramp to {voltage_begin} V",
+        )
 
     def ramp_to_zero(self) -> None:
         source_voltage = self.get_source_voltage()
@@ -704,21 +1348,16 @@ class RangeMeasurement(Measurement):
         )
 
         source_voltage_end: float = 0.0
-        source_voltage_step: float = 5.0
-        waiting_time: float = 0.250
 
-        ramp: LinearRange = LinearRange(
-            source_voltage, source_voltage_end, source_voltage_step
-        )
-        estimate: Estimate = Estimate(len(ramp))
         logger.info("Ramp source to zero...")
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            self.set_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
+        self.ramp_voltage(
+            self.source_instrument,
+            source_voltage,
+            source_voltage_end,
+            self.set_source_voltage,
+            f"Ramp to {source_voltage_end} V",
+            interruptible=False,
+        )
         logger.info("Ramp source to zero... done.")
 
     def ramp_bias_to_bias(self) -> None:
@@ -726,31 +1365,20 @@ class RangeMeasurement(Measurement):
         self.set_bias_source_voltage_range(bias_voltage_end)
 
         bias_voltage_begin: float = 0.0
-        bias_voltage_step: float = 5.0
-        waiting_time: float = 0.250
 
-        ramp: LinearRange = LinearRange(
-            bias_voltage_begin, bias_voltage_end, bias_voltage_step
+        logger.info("Ramp bias source to %g V...", bias_voltage_end)
+        self.ramp_voltage(
+            self.bias_source_instrument,
+            bias_voltage_begin,
+            bias_voltage_end,
+            self.set_bias_source_voltage,
+            f"Ramp bias to {bias_voltage_end} V",
         )
-        estimate: Estimate = Estimate(len(ramp))
-
-        logger.info("Ramp bias source to %g V...", ramp.end)
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp bias to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            if self.context.stop_requested:
-                break
-            self.set_bias_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
-        logger.info("Ramp bias source to %g V... done.", ramp.end)
+        logger.info("Ramp bias source to %g V... done.", bias_voltage_end)
 
     def ramp_bias_to_zero(self) -> None:
         bias_source_voltage: float = self.get_bias_source_voltage()
         end_voltage: float = 0.0
-        step_voltage: float = 5.0
-        waiting_time: float = 0.250
         self.submit_update(
             {
                 "smu_voltage": None,
@@ -766,16 +1394,15 @@ class RangeMeasurement(Measurement):
                 "tcu_state": None,
             }
         )
-        ramp: LinearRange = LinearRange(bias_source_voltage, end_voltage, step_voltage)
-        estimate: Estimate = Estimate(len(ramp))
         logger.info("Ramp bias source to zero...")
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp bias to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            self.set_bias_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
+        self.ramp_voltage(
+            self.bias_source_instrument,
+            bias_source_voltage,
+            end_voltage,
+            self.set_bias_source_voltage,
+            f"Ramp bias to {end_voltage} V",
+            interruptible=False,
+        )
         logger.info("Ramp bias source to zero... done.")
 
     def ramp_to_continuous(
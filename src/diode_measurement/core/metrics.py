@@ -0,0 +1,148 @@
+import math
+import re
+import threading
+from typing import Any
+
+__all__ = ["command_prefix", "LatencyHistogram", "IOMetrics"]
+
+READ_PREFIX: str = "<read>"
+
+
+def command_prefix(message: str, max_length: int = 32) -> str:
+    """Return command prefix of a message used to group metrics.
+
+    >>> command_prefix(":MEAS:CURR? (@1)")
+    ':MEAS:CURR?'
+    >>> command_prefix("smua.source.levelv = 1.0")
+    'smua.source.levelv'
+    >>> command_prefix("print(smua.measure.iv())")
+    'smua.measure.iv'
+    """
+    # Group TSP queries by the printed expression
+    m = re.match(r"^\s*print\s*\((.*)\)\s*$", message, re.DOTALL)
+    if m:
+        message = m.group(1)
+    m = re.match(r"^\s*([^\s(,=]+)", message)
+    if not m:
+        return "<empty>"
+    return m.group(1)[:max_length]
+
+
+class LatencyHistogram:
+    """Latency histogram with logarithmic buckets.
+
+    Buckets grow by a factor of 2**(1/8) starting at 10 us, percentiles are
+    approximated by the upper bound of the bucket (relative error < 9 %).
+    """
+
+    base: float = 1e-5
+    factor: float = 2 ** (1 / 8)
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def bucket(self, value: float) -> int:
+        if value <= self.base:
+            return 0
+        return math.ceil(math.log(value / self.base, self.factor))
+
+    def upper_bound(self, bucket: int) -> float:
+        return self.base * self.factor**bucket
+
+    def add(self, value: float) -> None:
+        bucket = self.bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Return approximated q-th percentile (0 to 100) in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        cumulative = 0
+        for bucket in sorted(self.buckets):
+            cumulative += self.buckets[bucket]
+            if cumulative >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+
+class CommandMetrics:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.bytes_written: int = 0
+        self.bytes_read: int = 0
+        self.timeouts: int = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> dict[str, Any]:
+        latency = self.latency
+        return {
+            "count": self.count,
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "timeouts": self.timeouts,
+            "total": latency.total,
+            "p50": latency.percentile(50),
+            "p95": latency.percentile(95),
+            "max": latency.max,
+        }
+
+
+class IOMetrics:
+    """Thread safe I/O metrics of a resource, grouped by command prefix."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._commands: dict[str, CommandMetrics] = {}
+        self._reconnects: int = 0
+
+    def _command(self, prefix: str) -> CommandMetrics:
+        command = self._commands.get(prefix)
+        if command is None:
+            command = self._commands.setdefault(prefix, CommandMetrics())
+        return command
+
+    def record(
+        self, prefix: str, bytes_written: int, bytes_read: int, elapsed: float
+    ) -> None:
+        with self._lock:
+            command = self._command(prefix)
+            command.count += 1
+            command.bytes_written += bytes_written
+            command.bytes_read += bytes_read
+            command.latency.add(elapsed)
+
+    def record_timeout(self, prefix: str) -> None:
+        with self._lock:
+            self._command(prefix).timeouts += 1
+
+    def record_reconnect(self) -> None:
+        with self._lock:
+            self._reconnects += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._commands.clear()
+            self._reconnects = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return metrics as JSON serializable dictionary, latencies in
+        seconds.
+        """
+        with self._lock:
+            commands = {
+                prefix: command.snapshot()
+                for prefix, command in sorted(self._commands.items())
+            }
+            return {
+                "count": sum(command["count"] for command in commands.values()),
+                "timeouts": sum(command["timeouts"] for command in commands.values()),
+                "reconnects": self._reconnects,
+                "commands": commands,
+            }
@@ -0,0 +1,142 @@
+import contextlib
+import logging
+import threading
+from collections.abc import Iterator
+
+import pyvisa
+
+from .resource import Resource, ResourceConfig, ResourceError
+
+__all__ = ["SessionPool", "is_session_error"]
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[type[Resource], ResourceConfig]
+
+
+def is_session_error(exc: BaseException) -> bool:
+    """Return True if exception or one of its causes is an I/O error."""
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        if isinstance(current, (ResourceError, pyvisa.Error, ConnectionError)):
+            return True
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class SessionPool:
+    """Keep resource sessions open between measurements.
+
+    Sessions are keyed by resource class and resource configuration. A leased
+    session is returned to the pool afterwards and reused by the next lease
+    with the same key if it passes a health probe. Opening a session evicts
+    idle sessions of the same resource name with different settings.
+
+    Sessions marked as failed (e.g. by a measurement handling an I/O error)
+    are closed on release instead of returned to the pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[SessionKey, Resource] = {}
+        self._leased: set[SessionKey] = set()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    @classmethod
+    def session_key(cls, resource: Resource) -> SessionKey:
+        return type(resource), resource.resource_config
+
+    def acquire(self, resource: Resource) -> Resource:
+        """Return an open session for the (not yet opened) resource, either
+        a healthy idle session with the same key or the opened resource.
+        """
+        key = self.session_key(resource)
+        with self._lock:
+            if key in self._leased:
+                raise ResourceError(f"{resource.resource_name}: session in use")
+            session = self._idle.pop(key, None)
+            stale = [
+                other
+                for other_key, other in self._idle.items()
+                if other.resource_name == resource.resource_name
+            ]
+            for other in stale:
+                del self._idle[self.session_key(other)]
+            self._leased.add(key)
+        try:
+            for other in stale:
+                logger.info(
+                    "evict session with changed settings: %r", other.resource_name
+                )
+                self._close(other)
+            if session is not None:
+                if session.probe():
+                    logger.debug("reuse session: %r", session.resource_name)
+                    return session
+                logger.info("discard unhealthy session: %r", session.resource_name)
+                self._close(session)
+            logger.debug("open session: %r", resource.resource_name)
+            return resource.__enter__()
+        except BaseException:
+            with self._lock:
+                self._leased.discard(key)
+            raise
+
+    def release(self, resource: Resource, discard: bool = False) -> None:
+        """Return a leased session to the pool, close it if discarded or
+        marked as failed.
+        """
+        key = self.session_key(resource)
+        discard = discard or resource.failed
+        resource.failed = False
+        with self._lock:
+            self._leased.discard(key)
+            if not discard:
+                self._idle[key] = resource
+                return
+        logger.info("discard failed session: %r", resource.resource_name)
+        self._close(resource)
+
+    @contextlib.contextmanager
+    def lease(self, resource: Resource) -> Iterator[Resource]:
+        """Lease a session, discard it if a resource error occurred or the
+        session was marked as failed.
+        """
+        session = self.acquire(resource)
+        discard = False
+        try:
+            yield session
+        except BaseException as exc:
+            discard = is_session_error(exc)
+            raise
+        finally:
+            self.release(session, discard=discard)
+
+    def evict(self, resource_name: str | None = None) -> None:
+        """Close idle sessions of resource name or all idle sessions."""
+        with self._lock:
+            keys = [
+                key
+                for key, session in self._idle.items()
+                if resource_name is None or session.resource_name == resource_name
+            ]
+            sessions = [self._idle.pop(key) for key in keys]
+        for session in sessions:
+            self._close(session)
+
+    def close(self) -> None:
+        """Close all idle sessions."""
+        self.evict()
+
+    def _close(self, resource: Resource) -> None:
+        try:
+            resource.__exit__(None, None, None)
+        except Exception as exc:
+            logger.warning(
+                "failed to close session %r: %s", resource.resource_name, exc
+            )
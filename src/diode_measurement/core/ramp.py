@@ -0,0 +1,87 @@
+import math
+from collections.abc import Iterator
+
+__all__ = ["AdaptiveRange"]
+
+
+class AdaptiveRange:
+    """Voltage range with adaptive step size.
+
+    Values fed back after every step are compared with a linear extrapolation
+    of the two previous points. If the relative deviation exceeds the
+    tolerance (the slope changes) the step is reset to the minimum step
+    before the next point, while the curve is linear the step is doubled up
+    to the maximum step. The ramp only moves towards the end voltage, no
+    point is sampled twice.
+
+    >>> r = AdaptiveRange(0, 100, 1, 10)
+    >>> for voltage in r:
+    ...     r.feed(measure(voltage))
+    """
+
+    def __init__(
+        self,
+        begin: float,
+        end: float,
+        min_step: float,
+        max_step: float,
+        tolerance: float = 0.05,
+    ) -> None:
+        min_step = abs(min_step)
+        if not min_step:
+            raise ValueError("min_step must not be zero")
+        if tolerance < 0:
+            raise ValueError("tolerance must be >= 0")
+        self.begin: float = float(begin)
+        self.end: float = float(end)
+        self.min_step: float = min_step
+        self.max_step: float = max(abs(max_step), min_step)
+        self.tolerance: float = float(tolerance)
+        self.step: float = self.min_step
+        self.last_step_count: int = 1
+        self._voltage: float = self.begin
+        self._points: list[tuple[float, float]] = []
+
+    def __len__(self) -> int:
+        """Return maximum number of points (all using the minimum step)."""
+        return math.ceil(abs(self.end - self.begin) / self.min_step - 1e-9) + 1
+
+    def __iter__(self) -> Iterator[float]:
+        self.step = self.min_step
+        self._points.clear()
+        direction = 1.0 if self.end >= self.begin else -1.0
+        epsilon = self.min_step * 1e-6
+        voltage = self.begin
+        index = 0
+        self.last_step_count = 1
+        while True:
+            self._voltage = voltage
+            yield voltage
+            if abs(self.end - voltage) < epsilon:
+                return
+            voltage += direction * self.step
+            if direction * (voltage - self.end) > -epsilon:
+                voltage = self.end
+            # Progress counted in minimum steps, consistent with len()
+            distance = abs(voltage - self.begin) / self.min_step
+            previous, index = index, math.ceil(distance - 1e-6)
+            self.last_step_count = index - previous
+
+    def feed(self, value: float) -> None:
+        """Feed back the value measured at the current voltage."""
+        if not math.isfinite(value):
+            return
+        self._points.append((self._voltage, value))
+        del self._points[:-3]
+        if len(self._points) < 3:
+            return
+        (v0, y0), (v1, y1), (v2, y2) = self._points
+        if v1 == v0:
+            return
+        predicted = y1 + (y1 - y0) / (v1 - v0) * (v2 - v1)
+        scale = max(abs(y2), abs(predicted))
+        deviation = abs(y2 - predicted) / scale if scale else 0.0
+        if deviation > self.tolerance:
+            self.step = self.min_step
+        else:
+            self.step = min(self.step * 2, self.max_step)
@@ -1,20 +1,35 @@
+import contextlib
 import logging
+import random
 import re
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from typing import Any, Literal, Self
 
 import pyvisa
-from pyvisa.constants import StatusCode
-from pyvisa.resources import MessageBasedResource
+from pyvisa.constants import (
+    EventMechanism,
+    EventType,
+    ResourceAttribute,
+    StatusCode,
+)
+from pyvisa.resources import GPIBInstrument, MessageBasedResource
+
+from .metrics import READ_PREFIX, IOMetrics, command_prefix
+from .trace import ReplayTrace, TraceError, TraceOp, TraceRecorder
 
 __all__ = [
     "parse_resource",
     "ResourceConfig",
     "ResourceError",
+    "ReconnectError",
+    "ResourceManagerRegistry",
+    "resource_managers",
     "Resource",
     "AutoReconnectResource",
+    "ReplayResource",
     "drain_output_buffer",
 ]
 
@@ -25,6 +40,9 @@ def parse_resource(resource_name: str) -> tuple[str, str]:
     """Create valid VISA resource name for short descriptors."""
     resource_name = resource_name.strip()
 
+    if m := re.match(r"^sim\:(\w*)$", resource_name, re.IGNORECASE):
+        resource_name = f"SIM::{m.group(1) or '0'}::INSTR"
+
     if m := re.match(r"^(\d+)$", resource_name):
         resource_name = f"GPIB0::{m.group(1)}::INSTR"
 
@@ -45,16 +63,78 @@ def parse_resource(resource_name: str) -> tuple[str, str]:
         visa_library = "@py"
     if resource_name.startswith("TCPIP"):
         visa_library = "@py"
+    if resource_name.startswith("SIM::"):
+        visa_library = "@sim"
 
     return resource_name, visa_library
 
 
-def list_resources() -> list[str]:
-    rm = pyvisa.ResourceManager()
-    try:
+class ResourceManagerRegistry:
+    """Process wide VISA resource managers, one per VISA library.
+
+    Managers are reference counted and kept open when released, so library
+    discovery is done only once. Idle managers are closed by `close_idle()`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._managers: dict[str, pyvisa.ResourceManager] = {}
+        self._refcounts: dict[str, int] = {}
+        self._factory: Callable[[str], pyvisa.ResourceManager] = pyvisa.ResourceManager
+
+    def acquire(self, visa_library: str = "") -> pyvisa.ResourceManager:
+        with self._lock:
+            rm = self._managers.get(visa_library)
+            if rm is None:
+                logger.debug("open resource manager: %r", visa_library)
+                rm = self._factory(visa_library)
+                self._managers[visa_library] = rm
+            self._refcounts[visa_library] = self._refcounts.get(visa_library, 0) + 1
+            return rm
+
+    def release(self, visa_library: str = "") -> None:
+        with self._lock:
+            count = self._refcounts.get(visa_library, 0)
+            if count <= 0:
+                raise RuntimeError(f"resource manager not acquired: {visa_library!r}")
+            self._refcounts[visa_library] = count - 1
+
+    @contextlib.contextmanager
+    def manager(self, visa_library: str = "") -> Iterator[pyvisa.ResourceManager]:
+        rm = self.acquire(visa_library)
+        try:
+            yield rm
+        finally:
+            self.release(visa_library)
+
+    def refcount(self, visa_library: str = "") -> int:
+        with self._lock:
+            return self._refcounts.get(visa_library, 0)
+
+    def close_idle(self) -> None:
+        """Close all resource managers without references."""
+        with self._lock:
+            idle = [
+                visa_library
+                for visa_library in self._managers
+                if not self._refcounts.get(visa_library)
+            ]
+            managers = [self._managers.pop(visa_library) for visa_library in idle]
+            for visa_library in idle:
+                self._refcounts.pop(visa_library, None)
+        for rm in managers:
+            try:
+                rm.close()
+            except pyvisa.Error as exc:
+                logger.warning("failed to close resource manager: %s", exc)
+
+
+resource_managers = ResourceManagerRegistry()
+
+
+def list_resources(visa_library: str = "") -> list[str]:
+    with resource_managers.manager(visa_library) as rm:
         return list(rm.list_resources())
-    finally:
-        rm.close()
 
 
 @dataclass(frozen=True, slots=True)
@@ -69,17 +149,30 @@ class ResourceConfig:
 class ResourceError(Exception): ...
 
 
+class ReconnectError(Exception):
+    """Raised by the reconnect callback if the instrument state can not be
+    restored and the failed operation must not be retried.
+    """
+
+
 class Resource:
     def __init__(self, resource_config: ResourceConfig) -> None:
         self._resource_config = resource_config
         self._rm: pyvisa.ResourceManager | None = None
         self._resource: MessageBasedResource | None = None
+        self.configure_fingerprint: str | None = None
+        self.failed: bool = False  # session must not be reused
+        self.metrics: IOMetrics = IOMetrics()
+        self.trace: TraceRecorder | None = None
 
     def __enter__(self) -> Self:
+        resource_config = self._resource_config
+        self.configure_fingerprint = None
+        try:
+            self._rm = resource_managers.acquire(resource_config.visa_library)
+        except pyvisa.Error as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
         try:
-            resource_config = self._resource_config
-            self._rm = pyvisa.ResourceManager(resource_config.visa_library)
-
             resource = self._rm.open_resource(
                 resource_name=resource_config.resource_name,
                 read_termination=resource_config.termination,
@@ -96,8 +189,12 @@ class Resource:
                     f"Expected MessageBasedResource, got {type(resource).__name__}"
                 )
             self._resource = resource
-        except pyvisa.Error as exc:
-            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        except BaseException as exc:
+            self._rm = None
+            resource_managers.release(resource_config.visa_library)
+            if isinstance(exc, pyvisa.Error):
+                raise ResourceError(f"{self.resource_name}: {exc}") from exc
+            raise
         return self
 
     def __exit__(self, *args) -> Literal[False]:
@@ -107,12 +204,11 @@ class Resource:
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
         finally:
-            try:
-                if self._rm is not None:
-                    self._rm.close()
-            finally:
-                self._rm = None
-                self._resource = None
+            if self._rm is not None:
+                resource_managers.release(self._resource_config.visa_library)
+            self._rm = None
+            self._resource = None
+            self.configure_fingerprint = None
         return False
 
     @property
@@ -121,61 +217,206 @@ class Resource:
             raise RuntimeError("no open resource")
         return self._resource
 
+    @property
+    def resource_config(self) -> ResourceConfig:
+        return self._resource_config
+
     @property
     def resource_name(self) -> str:
         return self._resource_config.resource_name
 
+    def probe(self) -> bool:
+        """Return True if the session is open and the instrument responds to
+        a status byte request (serial poll for GPIB).
+        """
+        if self._resource is None:
+            return False
+        try:
+            self._resource.get_visa_attribute(ResourceAttribute.timeout_value)
+            self._resource.read_stb()
+        except pyvisa.VisaIOError as exc:
+            # Status byte not supported by interface, session is valid
+            return exc.error_code == StatusCode.error_nonsupported_operation
+        except pyvisa.Error:
+            return False
+        return True
+
+    def _message_size(self, message: str) -> int:
+        return len(message.encode(errors="replace")) + len(
+            self._resource_config.termination
+        )
+
+    def _record_error(
+        self, op: TraceOp, prefix: str, message: str, start: float, exc: Exception
+    ) -> None:
+        if (
+            isinstance(exc, pyvisa.VisaIOError)
+            and exc.error_code == StatusCode.error_timeout
+        ):
+            self.metrics.record_timeout(prefix)
+            if self.trace is not None:
+                elapsed = time.perf_counter() - start
+                self.trace.record(
+                    op, self.resource_name, message, "", start, elapsed, timeout=True
+                )
+
+    def _record(
+        self,
+        op: TraceOp,
+        prefix: str,
+        message: str,
+        response: str,
+        bytes_written: int,
+        bytes_read: int,
+        start: float,
+    ) -> None:
+        elapsed = time.perf_counter() - start
+        self.metrics.record(prefix, bytes_written, bytes_read, elapsed)
+        if self.trace is not None:
+            self.trace.record(op, self.resource_name, message, response, start, elapsed)
+
     def query(self, message: str) -> str:
+        prefix = command_prefix(message)
+        start = time.perf_counter()
         try:
             logger.debug("resource.write: `%s`", message)
             result = self.resource.query(message)
             logger.debug("resource.read: `%s`", result)
-            return result
         except pyvisa.Error as exc:
+            self._record_error(TraceOp.QUERY, prefix, message, start, exc)
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        self._record(
+            TraceOp.QUERY,
+            prefix,
+            message,
+            result,
+            self._message_size(message),
+            self._message_size(result),
+            start,
+        )
+        return result
 
     def write(self, message: str) -> int:
+        prefix = command_prefix(message)
+        start = time.perf_counter()
         try:
             logger.debug("resource.write: `%s`", message)
-            return self.resource.write(message)
+            count = self.resource.write(message)
         except pyvisa.Error as exc:
+            self._record_error(TraceOp.WRITE, prefix, message, start, exc)
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        self._record(TraceOp.WRITE, prefix, message, "", count, 0, start)
+        return count
 
     def read(self) -> str:
+        start = time.perf_counter()
         try:
             result = self.resource.read()
             logger.debug("resource.read: `%s`", result)
-            return result
         except pyvisa.Error as exc:
+            self._record_error(TraceOp.READ, READ_PREFIX, "", start, exc)
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        self._record(
+            TraceOp.READ, READ_PREFIX, "", result, 0, self._message_size(result), start
+        )
+        return result
 
     def clear(self) -> None:
+        start = time.perf_counter()
         try:
             self.resource.clear()
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        if self.trace is not None:
+            elapsed = time.perf_counter() - start
+            self.trace.record(TraceOp.CLEAR, self.resource_name, "", "", start, elapsed)
+
+    @property
+    def supports_srq(self) -> bool:
+        """Return True if the resource supports waiting for service requests."""
+        return isinstance(self._resource, GPIBInstrument)
+
+    def enable_srq(self) -> None:
+        """Enable queueing of service requests and discard stale requests,
+        call before initiating an operation so an early request is not lost.
+        """
+        resource = self.resource
+        if not isinstance(resource, GPIBInstrument):
+            raise ResourceError(f"{self.resource_name}: SRQ not supported")
+        try:
+            resource.enable_event(EventType.service_request, EventMechanism.queue)
+            resource.discard_events(EventType.service_request, EventMechanism.queue)
+        except pyvisa.Error as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+
+    def wait_for_srq(self, timeout: float) -> bool:
+        """Wait for a service request of this instrument, return False on
+        timeout.
+        """
+        resource = self.resource
+        if not isinstance(resource, GPIBInstrument):
+            raise ResourceError(f"{self.resource_name}: SRQ not supported")
+        try:
+            resource.wait_for_srq(max(0, round(timeout * 1_000)))
+            return True
+        except pyvisa.VisaIOError as exc:
+            if exc.error_code == StatusCode.error_timeout:
+                with contextlib.suppress(pyvisa.Error):
+                    resource.discard_events(
+                        EventType.service_request, EventMechanism.queue
+                    )
+                return False
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        except pyvisa.Error as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
 
 
 class AutoReconnectResource(Resource):
-    retry_attempts: int = 3
-    retry_delay: float = 1.0
+    """Resource reconnecting on I/O errors and retrying the operation.
+
+    Reconnect attempts are delayed by an exponential backoff with random
+    jitter. After reopening the session the `on_reconnect` callback is
+    called to restore the instrument state before the failed operation is
+    retried, errors while restoring count as failed attempt. A
+    `ReconnectError` raised by the callback is passed on without retrying.
+    """
+
+    retry_attempts: int = 5
+    retry_delay: float = 0.5  # initial backoff in seconds
+    retry_max_delay: float = 8.0
+    retry_jitter: float = 0.5  # relative, randomly reduces the delay
+
+    on_reconnect: Callable[[], None] | None = None
+    _restoring: bool = False
+
+    def retry_backoff(self, attempt: int) -> float:
+        """Return delay in seconds before reconnect attempt (starting at 1)."""
+        delay = min(self.retry_max_delay, self.retry_delay * 2 ** (attempt - 1))
+        return delay * (1.0 - self.retry_jitter * random.random())
 
     def _reconnect_retry(self, target: Callable, *args) -> Any:
+        # Operations of the restore callback are not retried individually
+        if self._restoring:
+            return target(*args)
         for attempt in range(self.retry_attempts + 1):
             try:
                 if attempt:
+                    delay = self.retry_backoff(attempt)
                     logger.info(
-                        "auto reconnect to resource (%d/%d): %r",
+                        "auto reconnect to resource in %.2f s (%d/%d): %r",
+                        delay,
                         attempt,
                         self.retry_attempts,
                         self.resource_name,
                     )
+                    self.metrics.record_reconnect()
                     try:
                         self.__exit__()
                     except Exception:
                         ...
-                    time.sleep(self.retry_delay)
+                    time.sleep(delay)
                     self.__enter__()
+                    self._restore()
                 return target(*args)
             except (pyvisa.Error, ConnectionError, ResourceError):
                 if attempt < self.retry_attempts:
@@ -183,6 +424,25 @@ class AutoReconnectResource(Resource):
                 else:
                     raise
 
+    def _restore(self) -> None:
+        if self.on_reconnect is None:
+            return
+        logger.info("restore instrument state: %r", self.resource_name)
+        self._restoring = True
+        try:
+            self.on_reconnect()
+        except ReconnectError:
+            self.failed = True
+            raise
+        except ResourceError:
+            raise
+        except Exception as exc:
+            raise ResourceError(
+                f"{self.resource_name}: failed to restore instrument state: {exc}"
+            ) from exc
+        finally:
+            self._restoring = False
+
     def query(self, message: str) -> str:
         return self._reconnect_retry(super().query, message)
 
@@ -196,6 +456,73 @@ class AutoReconnectResource(Resource):
         return self._reconnect_retry(super().clear)
 
 
+class ReplayResource(Resource):
+    """Resource serving responses of a recorded trace instead of an
+    instrument.
+
+    Raises `ResourceError` if the requested operations differ from the
+    recording. Recorded timeouts are replayed as errors.
+    """
+
+    def __init__(self, resource_config: ResourceConfig, replay: ReplayTrace) -> None:
+        super().__init__(resource_config)
+        self.replay: ReplayTrace = replay
+        self._is_open: bool = False
+
+    def __enter__(self) -> Self:
+        self.configure_fingerprint = None
+        self._is_open = True
+        return self
+
+    def __exit__(self, *args) -> Literal[False]:
+        self._is_open = False
+        self.configure_fingerprint = None
+        return False
+
+    def probe(self) -> bool:
+        return self._is_open
+
+    def _replay(self, op: TraceOp, message: str) -> str:
+        if not self._is_open:
+            raise RuntimeError("no open resource")
+        start = time.perf_counter()
+        try:
+            record = self.replay.next_record(self.resource_name, op, message)
+        except TraceError as exc:
+            raise ResourceError(exc) from exc
+        if op == TraceOp.CLEAR:
+            return ""
+        prefix = READ_PREFIX if op == TraceOp.READ else command_prefix(message)
+        if record.timeout:
+            self.metrics.record_timeout(prefix)
+            raise ResourceError(f"{self.resource_name}: replayed timeout")
+        bytes_written = self._message_size(message) if message else 0
+        bytes_read = self._message_size(record.response) if record.response else 0
+        self._record(
+            op, prefix, message, record.response, bytes_written, bytes_read, start
+        )
+        return record.response
+
+    def query(self, message: str) -> str:
+        logger.debug("replay.query: `%s`", message)
+        return self._replay(TraceOp.QUERY, message)
+
+    def write(self, message: str) -> int:
+        logger.debug("replay.write: `%s`", message)
+        self._replay(TraceOp.WRITE, message)
+        return self._message_size(message)
+
+    def read(self) -> str:
+        return self._replay(TraceOp.READ, "")
+
+    def clear(self) -> None:
+        self._replay(TraceOp.CLEAR, "")
+
+    @property
+    def supports_srq(self) -> bool:
+        return False
+
+
 def _drain_output_buffer(
     resource: MessageBasedResource,
     *,
@@ -1,8 +1,11 @@
+import hashlib
+import json
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import StrEnum
 from typing import Any
 
-__all__ = ["RoleConfig", "Role"]
+__all__ = ["RoleConfig", "Role", "configure_fingerprint"]
 
 
 class Role(StrEnum):
@@ -26,3 +29,11 @@ class RoleConfig:
     timeout: float
     reset_instrument: bool
     options: dict[str, Any] = field(default_factory=dict)
+
+
+def configure_fingerprint(model: str, identity: str, options: Mapping[str, Any]) -> str:
+    """Return fingerprint of instrument configuration options applied to an
+    identified instrument.
+    """
+    data = json.dumps([model, identity, options], sort_keys=True, default=repr)
+    return hashlib.sha256(data.encode()).hexdigest()
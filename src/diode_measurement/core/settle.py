@@ -0,0 +1,62 @@
+import math
+import time
+from collections.abc import Callable
+
+__all__ = ["SettleDetector"]
+
+
+class SettleDetector:
+    """Detect settling of a signal by polling until the relative change
+    between two consecutive readings drops below a tolerance.
+    """
+
+    def __init__(
+        self,
+        tolerance: float,
+        interval: float,
+        min_time: float = 0.0,
+        max_time: float = 10.0,
+    ) -> None:
+        if tolerance < 0:
+            raise ValueError("tolerance must be >= 0")
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        if min_time < 0:
+            raise ValueError("min_time must be >= 0")
+        if max_time < min_time:
+            raise ValueError("max_time must be >= min_time")
+        self.tolerance = float(tolerance)
+        self.interval = float(interval)
+        self.min_time = float(min_time)
+        self.max_time = float(max_time)
+        self._clock: Callable[[], float] = time.monotonic
+        self._sleep: Callable[[float], None] = time.sleep
+
+    def is_settled(self, previous: float, current: float) -> bool:
+        if not (math.isfinite(previous) and math.isfinite(current)):
+            return False
+        delta = abs(current - previous)
+        return delta <= self.tolerance * max(abs(previous), abs(current))
+
+    def wait(
+        self,
+        read: Callable[[], float],
+        abort: Callable[[], bool] | None = None,
+    ) -> float:
+        """Poll readings until settled, stopped by abort or the maximum time
+        is reached. Return the elapsed settle time in seconds.
+        """
+        start = self._clock()
+        previous = read()
+        while True:
+            elapsed = self._clock() - start
+            if elapsed >= self.max_time:
+                return elapsed
+            if abort is not None and abort():
+                return elapsed
+            self._sleep(min(self.interval, self.max_time - elapsed))
+            current = read()
+            elapsed = self._clock() - start
+            if elapsed >= self.min_time and self.is_settled(previous, current):
+                return elapsed
+            previous = current
@@ -1,21 +1,56 @@
 import logging
+from collections.abc import Callable
 from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
+from ..sim import SIM_LIBRARY, SimulatedBench, create_simulated_resource
+from .aio import AsyncioResource, AutoReconnectAsyncioResource, is_async_resource
 from .driver import Driver, driver_factory
-from .resource import AutoReconnectResource, Resource, ResourceConfig
+from .pool import SessionPool
+from .resource import (
+    AutoReconnectResource,
+    ReconnectError,
+    ReplayResource,
+    Resource,
+    ResourceConfig,
+)
 from .role import Role, RoleConfig
+from .trace import ReplayTrace, TraceRecorder
 
-__all__ = ["Station"]
+__all__ = ["InstrumentState", "Station"]
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class InstrumentState:
+    """Last instrument state applied by a measurement, reapplied by the
+    adapter after an automatic reconnect.
+    """
+
+    options: dict[str, Any] | None = None
+    current_compliance: float | None = None
+    voltage_level: float | None = None
+    output_enabled: bool | None = None
+    operation: str | None = None  # running instrument side sweep or ramp
+
+
 class Station:
     def __init__(self) -> None:
         self.auto_reconnect: bool = False
+        self.asyncio_io: bool = False
+        self.session_pool: SessionPool | None = None
+        self.trace_recorder: TraceRecorder | None = None
+        self.replay_trace: ReplayTrace | None = None
+        self.simulated_bench: SimulatedBench | None = None
+        self.simulation_time_scale: float = 1.0
         self.instruments: dict[Role, Any] = {}
         self.resources: dict[Role, Resource] = {}
+        self.instrument_states: dict[Role, InstrumentState] = {}
+        # Ramp voltage of role from begin to end, provided by the measurement
+        self.voltage_ramp: Callable[[Role, float, float], None] | None = None
         self._instrument_registry: dict[Role, tuple[type[Driver], Resource]] = {}
         self._driver_factory = driver_factory
 
@@ -34,17 +69,111 @@ class Station:
             termination=role_config.termination,
             timeout=role_config.timeout,
         )
-        resource = self._create_resource(resource_config)
+        resource = self._create_resource(resource_config, model)
         self._instrument_registry[role] = driver_cls, resource
 
-    def _create_resource(self, config: ResourceConfig) -> Resource:
+    def _create_resource(self, config: ResourceConfig, model: str) -> Resource:
+        # Serve recorded responses instead of instruments
+        if self.replay_trace is not None:
+            return ReplayResource(config, self.replay_trace)
+        # Connect to simulated instrument
+        if config.visa_library == SIM_LIBRARY:
+            return create_simulated_resource(
+                config, model, self.simulated_bench, self.simulation_time_scale
+            )
+        # Use asyncio transports for socket and serial resources
+        if self.asyncio_io and is_async_resource(config):
+            if self.auto_reconnect:
+                return AutoReconnectAsyncioResource(config)
+            return AsyncioResource(config)
         # If auto reconnect use experimental class AutoReconnectResource
         resource_cls = AutoReconnectResource if self.auto_reconnect else Resource
         return resource_cls(config)
 
+    def clear_configure_fingerprints(self) -> None:
+        """Force configuration of all instruments on next use."""
+        for resource in self.resources.values():
+            resource.configure_fingerprint = None
+
+    def mark_resources_failed(self) -> None:
+        """Mark all resources as failed, pooled sessions are closed on
+        release instead of being reused.
+        """
+        for resource in self.resources.values():
+            resource.failed = True
+
     def create_instruments(self, stack: ExitStack) -> None:
         for role, (cls, resource) in self._instrument_registry.items():
             logger.debug("creating instrument context %s: %s...", role, cls.__name__)
-            context = cls(stack.enter_context(resource))
+            if self.session_pool is not None:
+                resource = stack.enter_context(self.session_pool.lease(resource))
+            else:
+                stack.enter_context(resource)
+            context = cls(resource)
+            resource.metrics.reset()
+            resource.trace = self.trace_recorder
+            if isinstance(resource, AutoReconnectResource):
+                resource.on_reconnect = partial(self.restore_instrument, role)
+                stack.callback(setattr, resource, "on_reconnect", None)
             self.resources[role] = resource
             self.instruments[role] = context
+            self.instrument_states[role] = InstrumentState()
+
+    def instrument_state(self, role: Role) -> InstrumentState:
+        """Return last applied state of instrument, to be updated by the
+        measurement.
+        """
+        return self.instrument_states.setdefault(role, InstrumentState())
+
+    def restore_instrument(self, role: Role) -> None:
+        """Reapply configuration, compliance, voltage level and output state
+        of an instrument after reconnecting.
+
+        An enabled output is restored at zero volt (or the read back level if
+        still enabled) and ramped to the last level. Raises `ReconnectError`
+        if an instrument side sweep or ramp was running.
+        """
+        instrument = self.instruments[role]
+        state = self.instrument_state(role)
+        if state.operation is not None:
+            raise ReconnectError(
+                f"{role.upper()}: connection lost while running {state.operation}"
+            )
+        logger.info("restoring %s state: %s", role.upper(), state)
+        # Configuration may be lost, force configure on next measurement
+        self.resources[role].configure_fingerprint = None
+        instrument.clear()
+        if state.options is not None:
+            instrument.configure(state.options)
+        if state.current_compliance is not None:
+            instrument.set_current_compliance_level(state.current_compliance)
+        if not state.output_enabled:
+            if state.voltage_level is not None:
+                instrument.set_voltage_level(state.voltage_level)
+            if state.output_enabled is not None:
+                instrument.set_output_enabled(False)
+            return
+        if instrument.get_output_enabled():
+            begin = instrument.get_voltage_level()
+        else:
+            begin = 0.0
+            instrument.set_voltage_level(begin)
+            instrument.set_output_enabled(True)
+        if state.voltage_level is not None:
+            if self.voltage_ramp is not None:
+                self.voltage_ramp(role, begin, state.voltage_level)
+            else:
+                instrument.set_voltage_level(state.voltage_level)
+
+    def detach_trace(self) -> None:
+        """Stop recording I/O of all resources."""
+        self.trace_recorder = None
+        for resource in self.resources.values():
+            resource.trace = None
+
+    def io_metrics(self) -> dict[str, Any]:
+        """Return I/O metrics of all resources by role."""
+        return {
+            role.value: resource.metrics.snapshot()
+            for role, resource in self.resources.items()
+        }
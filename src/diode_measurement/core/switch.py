@@ -0,0 +1,62 @@
+import re
+from collections.abc import Iterable
+
+from .context import State
+from .role import Role
+
+__all__ = [
+    "parse_channel_groups",
+    "format_channel_groups",
+    "channel_groups",
+    "channel_group_delay",
+    "static_channels",
+]
+
+
+def parse_channel_groups(text: str) -> list[list[str]]:
+    """Parse channel groups separated by newline or semicolon, channels of a
+    group are separated by comma or whitespace.
+
+    >>> parse_channel_groups("1A01, 1B01; 1A02")
+    [['1A01', '1B01'], ['1A02']]
+    """
+    groups: list[list[str]] = []
+    for line in re.split(r"[;\n]", text):
+        channels = [channel for channel in re.split(r"[,\s]+", line) if channel]
+        if channels:
+            groups.append(channels)
+    return groups
+
+
+def format_channel_groups(
+    groups: Iterable[Iterable[str]], separator: str = "; "
+) -> str:
+    """Format channel groups, inverse of `parse_channel_groups`."""
+    return separator.join(", ".join(channels) for channels in groups)
+
+
+def channel_groups(state: State) -> list[list[str]]:
+    """Return channel groups of the enabled switch role or an empty list."""
+    role_config = state.find_role(Role.SWITCH)
+    if role_config is None or not role_config.enabled:
+        return []
+    groups = role_config.options.get("channel_groups") or []
+    return [list(channels) for channels in groups if channels]
+
+
+def channel_group_delay(state: State) -> float:
+    """Return waiting time after switching a channel group in seconds."""
+    role_config = state.find_role(Role.SWITCH)
+    if role_config is None:
+        return 0.0
+    return float(role_config.options.get("channel_group_delay", 0.0))
+
+
+def static_channels(state: State) -> list[str]:
+    """Return channels closed by the enabled switch role configuration, kept
+    closed while switching channel groups.
+    """
+    role_config = state.find_role(Role.SWITCH)
+    if role_config is None or not role_config.enabled:
+        return []
+    return list(role_config.options.get("channels") or [])
@@ -1,7 +1,7 @@
 import time
 from collections.abc import Callable
 
-__all__ = ["IntervalTimer"]
+__all__ = ["IntervalTimer", "DeadlineScheduler"]
 
 
 class IntervalTimer:
@@ -23,3 +23,57 @@ class IntervalTimer:
 
     def __bool__(self) -> bool:
         return self.expired()
+
+
+class DeadlineScheduler:
+    """Schedule ticks at exact multiples of a period, free of drift.
+
+    Deadlines are anchored on the monotonic clock, the time spent between
+    ticks does not accumulate. Deadlines already passed when advancing are
+    skipped and counted as overrun.
+    """
+
+    def __init__(self, period: float) -> None:
+        if period < 0:
+            raise ValueError("period must be >= 0")
+        self.period = float(period)
+        self.overruns: int = 0
+        self.skipped: int = 0
+        self._clock: Callable[[], float] = time.monotonic
+        self._wall_clock: Callable[[], float] = time.time
+        self._anchor: float = self._clock()
+        self._tick: int = 0
+
+    def reset(self, period: float | None = None, aligned: bool = False) -> None:
+        """Re-anchor the schedule, the current deadline is now.
+
+        If aligned, deadlines are placed on multiples of the period in wall
+        clock time, so that schedules of different stations coincide.
+        """
+        if period is not None:
+            if period < 0:
+                raise ValueError("period must be >= 0")
+            self.period = float(period)
+        self._anchor = self._clock()
+        if aligned and self.period:
+            self._anchor -= self._wall_clock() % self.period
+        self._tick = 0
+
+    @property
+    def deadline(self) -> float:
+        return self._anchor + self._tick * self.period
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - self._clock())
+
+    def advance(self) -> int:
+        """Move to the next deadline, return the number of skipped ticks."""
+        self._tick += 1
+        now = self._clock()
+        if not self.period or now <= self.deadline:
+            return 0
+        skipped = int((now - self.deadline) // self.period) + 1
+        self._tick += skipped
+        self.overruns += 1
+        self.skipped += skipped
+        return skipped
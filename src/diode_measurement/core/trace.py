@@ -0,0 +1,161 @@
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import BinaryIO
+
+__all__ = [
+    "TraceOp",
+    "TraceRecord",
+    "TraceRecorder",
+    "TraceError",
+    "read_trace",
+    "ReplayTrace",
+]
+
+MAGIC: bytes = b"DMTRACE\x01"
+
+# op, timeout, timestamp, elapsed, resource name, message and response size
+RECORD_HEADER = struct.Struct("<BBddHII")
+
+
+class TraceError(Exception): ...
+
+
+class TraceOp(IntEnum):
+    WRITE = 1
+    QUERY = 2
+    READ = 3
+    CLEAR = 4
+
+
+@dataclass(frozen=True, slots=True)
+class TraceRecord:
+    op: TraceOp
+    resource_name: str
+    message: str
+    response: str
+    timestamp: float  # seconds since start of recording
+    elapsed: float  # seconds
+    timeout: bool = False
+
+
+class TraceRecorder:
+    """Record resource I/O to a binary trace file.
+
+    The file starts with a magic number followed by records of a fixed size
+    header and the UTF-8 encoded resource name, message and response.
+    Recording is thread safe, resources of all roles share one recorder.
+    """
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self._fp = fp
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._fp.write(MAGIC)
+
+    def record(
+        self,
+        op: TraceOp,
+        resource_name: str,
+        message: str,
+        response: str,
+        start: float,
+        elapsed: float,
+        timeout: bool = False,
+    ) -> None:
+        """Record operation, start is a `time.perf_counter()` value."""
+        name_data = resource_name.encode()
+        message_data = message.encode(errors="replace")
+        response_data = response.encode(errors="replace")
+        header = RECORD_HEADER.pack(
+            op,
+            timeout,
+            start - self._start,
+            elapsed,
+            len(name_data),
+            len(message_data),
+            len(response_data),
+        )
+        with self._lock:
+            self._fp.write(header + name_data + message_data + response_data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._fp.flush()
+
+
+def _read_exactly(fp: BinaryIO, size: int) -> bytes:
+    data = fp.read(size)
+    if len(data) != size:
+        raise TraceError("Unexpected end of trace file.")
+    return data
+
+
+def read_trace(fp: BinaryIO) -> Iterator[TraceRecord]:
+    """Iterate over records of a binary trace file."""
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise TraceError("Not a trace file or unsupported version.")
+    while header := fp.read(RECORD_HEADER.size):
+        if len(header) != RECORD_HEADER.size:
+            raise TraceError("Unexpected end of trace file.")
+        op, timeout, timestamp, elapsed, name_size, message_size, response_size = (
+            RECORD_HEADER.unpack(header)
+        )
+        yield TraceRecord(
+            op=TraceOp(op),
+            resource_name=_read_exactly(fp, name_size).decode(),
+            message=_read_exactly(fp, message_size).decode(),
+            response=_read_exactly(fp, response_size).decode(),
+            timestamp=timestamp,
+            elapsed=elapsed,
+            timeout=bool(timeout),
+        )
+
+
+class ReplayTrace:
+    """Recorded responses by resource name, consumed in recorded order.
+
+    If realtime is enabled, replayed operations take the recorded time.
+    """
+
+    def __init__(self, records: Iterable[TraceRecord], realtime: bool = False) -> None:
+        self.realtime: bool = realtime
+        self._lock = threading.Lock()
+        self._records: dict[str, deque[TraceRecord]] = {}
+        for record in records:
+            self._records.setdefault(record.resource_name, deque()).append(record)
+
+    @classmethod
+    def load(cls, filename: str, realtime: bool = False) -> "ReplayTrace":
+        with open(filename, "rb") as fp:
+            return cls(read_trace(fp), realtime=realtime)
+
+    def resource_names(self) -> list[str]:
+        return list(self._records)
+
+    def remaining(self, resource_name: str) -> int:
+        with self._lock:
+            return len(self._records.get(resource_name, ()))
+
+    def next_record(self, resource_name: str, op: TraceOp, message: str) -> TraceRecord:
+        """Return next record of resource, raise `TraceError` if the requested
+        operation does not match the recording.
+        """
+        with self._lock:
+            records = self._records.get(resource_name)
+            if not records:
+                raise TraceError(f"{resource_name}: end of trace at {message!r}")
+            record = records[0]
+            if record.op != op or record.message != message:
+                raise TraceError(
+                    f"{resource_name}: trace mismatch, expected "
+                    f"{record.op.name} {record.message!r}, got {op.name} {message!r}"
+                )
+            records.popleft()
+        if self.realtime and record.elapsed > 0:
+            time.sleep(record.elapsed)
+        return record
@@ -101,9 +101,24 @@ class K237Adapter:
         return float(self._query("X"))
 
     def measure_iv(self) -> tuple[float, float]:
-        i = self.measure_i()
-        v = self.get_voltage_level()  # not possible in function VOLT
-        return i, v
+        """Read source and measure value in one output line."""
+        self._write("G5,2,0X")
+        result = self._query("X")
+        try:
+            v, i = result.split(",")[:2]
+            return float(i), float(v)
+        except Exception as exc:
+            raise ValueError(f"Unexpected instrument response: {result!r}") from exc
+
+    def measure_iv_compliance(self) -> tuple[float, float, bool]:
+        """Read source and measure value with prefix in one output line."""
+        self._write("G5,1,0X")
+        result = self._query("X")
+        try:
+            source, measure = result.split(",")[:2]
+            return float(measure[5:]), float(source[5:]), source[0:2] == "OS"
+        except Exception as exc:
+            raise ValueError(f"Unexpected instrument response: {result!r}") from exc
 
     @handle_exception
     def _write(self, message: str) -> None:
@@ -1,9 +1,15 @@
-from collections.abc import Mapping
+import time
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from comet.driver.keithley.k2400 import K2400
 
-from diode_measurement.core.driver import InstrumentError, handle_exception
+from diode_measurement.core.driver import (
+    BufferCursor,
+    InstrumentError,
+    Transaction,
+    handle_exception,
+)
 from diode_measurement.core.resource import Resource
 from diode_measurement.core.scpi import parse_scpi_error
 
@@ -11,10 +17,16 @@ __all__ = ["K2400Adapter"]
 
 
 class K2400Adapter:
+    max_sweep_points: int = 100  # source list memory limit
+    max_buffer_points: int = 2500
+
     def __init__(self, resource: Resource) -> None:
         self._resource: Resource = resource
+        self._transaction: Transaction | None = None
         self._driver: K2400 = K2400(resource)
         self._format_element: str | None = None
+        self._buffer: BufferCursor = BufferCursor(self.max_buffer_points)
+        self._trigger_delay: str = "0"
 
     def identify(self) -> str:
         return self._driver.identify()
@@ -29,29 +41,30 @@ class K2400Adapter:
         return parse_scpi_error(self._query(":SYST:ERR?"))
 
     def configure(self, options: Mapping[str, Any]) -> None:
-        beeper_state = options.get("beeper.state", False)
-        self.set_system_beeper_state(beeper_state)
+        with self.transaction():
+            beeper_state = options.get("beeper.state", False)
+            self.set_system_beeper_state(beeper_state)
 
-        route_terminals = options.get("route.terminals", "FRON")
-        self.set_route_terminals(route_terminals)
+            route_terminals = options.get("route.terminals", "FRON")
+            self.set_route_terminals(route_terminals)
 
-        self.set_source_function("VOLT")
+            self.set_source_function("VOLT")
 
-        self._write(":SENS:FUNC:CONC ON")  # enable concurrent measurements
-        self._write(":SENS:FUNC:ON 'VOLT','CURR'")
-        self._write(":FORM:ELEM VOLT,CURR")
+            self._write(":SENS:FUNC:CONC ON")  # enable concurrent measurements
+            self._write(":SENS:FUNC:ON 'VOLT','CURR'")
+            self._write(":FORM:ELEM VOLT,CURR")
 
-        filter_mode = options.get("filter.mode", "MOV")
-        self.set_sense_average_tcontrol(filter_mode)
+            filter_mode = options.get("filter.mode", "MOV")
+            self.set_sense_average_tcontrol(filter_mode)
 
-        filter_count = options.get("filter.count", 10)
-        self.set_sense_average_count(filter_count)
+            filter_count = options.get("filter.count", 10)
+            self.set_sense_average_count(filter_count)
 
-        filter_enable = options.get("filter.enable", False)
-        self.set_sense_average_state(filter_enable)
+            filter_enable = options.get("filter.enable", False)
+            self.set_sense_average_state(filter_enable)
 
-        nplc = options.get("nplc", 1.0)
-        self.set_sense_current_nplc(nplc)
+            nplc = options.get("nplc", 1.0)
+            self.set_sense_current_nplc(nplc)
 
     def get_output_enabled(self) -> bool:
         return self._query(":OUTP:STAT?") == "1"
@@ -84,12 +97,165 @@ class K2400Adapter:
         return v
 
     def measure_iv(self) -> tuple[float, float]:
-        if self._format_element != "VOLT,CURR":
+        if self._format_element not in {"VOLT,CURR", "VOLT,CURR,STAT"}:
             self._write(":FORM:ELEM VOLT,CURR")
             self._format_element = "VOLT,CURR"
         v, i = self._query(":READ?").split(",")[:2]
         return float(i), float(v)
 
+    def measure_iv_compliance(self) -> tuple[float, float, bool]:
+        """Measure I and V, compliance is taken from the status element."""
+        if self._format_element != "VOLT,CURR,STAT":
+            self._write(":FORM:ELEM VOLT,CURR,STAT")
+            self._format_element = "VOLT,CURR,STAT"
+        result = self._query(":READ?")
+        try:
+            v, i, status = result.split(",")[:3]
+            return float(i), float(v), bool(int(float(status)) & 0x8)
+        except Exception as exc:
+            raise ValueError(
+                f"Unexpected instrument response for READ?: {result!r}"
+            ) from exc
+
+    def sweep_iv(
+        self,
+        voltages: Sequence[float],
+        delay: float,
+        abort_on_compliance: bool = False,
+        timeout: float | None = None,
+        interval: float = 0.050,
+    ) -> list[tuple[float, float, float]]:
+        """Run a source list sweep, return readings as list of (t, I, V) with
+        t relative to the first reading, using the instrument timestamps.
+
+        With abort on compliance the sweep stops at the first point in
+        compliance, only readings up to this point are returned.
+        """
+        count = len(voltages)
+        if not count:
+            return []
+        if timeout is None:
+            timeout = count * (delay + 1.0) + 10.0
+        if self._format_element != "VOLT,CURR,TIME":
+            self._write(":FORM:ELEM VOLT,CURR,TIME")
+            self._format_element = "VOLT,CURR,TIME"
+        source_delay = self._query(":SOUR:DEL?")
+        source_delay_auto = self._query(":SOUR:DEL:AUTO?")
+        points = ",".join(format(voltage, ".3E") for voltage in voltages)
+        self._write(f":SOUR:LIST:VOLT {points}")
+        self._write(f":SOUR:DEL {delay:.3E}")
+        self._write(f":TRIG:COUN {count:d}")
+        self._write(":SOUR:VOLT:MODE LIST")
+        if abort_on_compliance:
+            self._write(":SOUR:SWE:CAB EARL")
+        # On failure keep the first sweep point, one step from the level
+        # before the sweep.
+        level = voltages[0]
+        try:
+            # Request operation complete
+            self._write("*CLS")
+            self._write_nowait("*OPC")
+            # Initiate sweep
+            self._write_nowait(":INIT")
+            threshold = time.monotonic() + timeout
+            interval = min(timeout, interval)
+            while not int(self._query("*ESR?")) & 0x1:
+                if time.monotonic() > threshold:
+                    self._write_nowait(":ABOR")
+                    raise RuntimeError(f"Sweep timeout, exceeded {timeout:G} s")
+                time.sleep(interval)
+            result = self._query(":FETC?")
+            try:
+                values = [float(value) for value in result.split(",")]
+                # Aborting on compliance returns fewer readings
+                if len(values) % 3 or not 0 < len(values) <= 3 * count:
+                    raise ValueError(f"expected up to {count:d} readings")
+                if not abort_on_compliance and len(values) != 3 * count:
+                    raise ValueError(f"expected {count:d} readings")
+            except Exception as exc:
+                raise ValueError(
+                    f"Unexpected instrument response for FETC?: {result!r}"
+                ) from exc
+            t0 = values[2]
+            readings = [
+                (t - t0, i, v)
+                for v, i, t in zip(values[0::3], values[1::3], values[2::3])
+            ]
+            # Keep source level at last swept point
+            level = voltages[len(readings) - 1]
+            return readings
+        finally:
+            self._write(f":SOUR:VOLT:LEV {level:.3E}")
+            self._write(":SOUR:VOLT:MODE FIX")
+            self._write(":TRIG:COUN 1")
+            self._write(f":SOUR:DEL {source_delay}")
+            self._write(f":SOUR:DEL:AUTO {source_delay_auto}")
+            if abort_on_compliance:
+                self._write(":SOUR:SWE:CAB NEV")
+
+    def start_i_buffered(self, interval: float) -> None:
+        """Start sampling current into the trace buffer, read new readings
+        using read_i_buffered() until stop_i_buffered().
+        """
+        if self._format_element != "CURR,TIME":
+            self._write(":FORM:ELEM CURR,TIME")
+            self._format_element = "CURR,TIME"
+        self._trigger_delay = self._query(":TRIG:DEL?")
+        self._write(f":TRIG:DEL {interval:.3E}")
+        self._buffer = BufferCursor(self.max_buffer_points)
+        self._arm_i_buffered()
+
+    def _arm_i_buffered(self) -> None:
+        self._write(":TRAC:FEED:CONT NEV")
+        self._write(":TRAC:CLE")
+        self._write(f":TRAC:POIN {self.max_buffer_points:d}")
+        self._write(":TRAC:TST:FORM ABS")
+        self._write(":TRAC:FEED SENS")
+        self._write(":TRAC:FEED:CONT NEXT")
+        self._write(f":TRIG:COUN {self.max_buffer_points:d}")
+        self._write_nowait(":INIT")
+        self._buffer.arm()
+
+    def read_i_buffered(self, max_count: int) -> list[tuple[float, float]]:
+        """Return new readings as list of (t, I) with t relative to the
+        start of sampling, using the instrument timestamps.
+
+        The trace buffer can only be read as a whole, it is cleared after
+        every fetch so every reading is transferred once. All readings
+        stored are returned, exceeding max_count if sampling outpaces
+        polling.
+        """
+        count = int(float(self._query(":TRAC:POIN:ACT?")))
+        readings: list[tuple[float, float]] = []
+        if count:
+            result = self._query(":TRAC:DATA?;:TRAC:CLE;:TRAC:FEED:CONT NEXT")
+            try:
+                values = [float(value) for value in result.split(",")]
+                if len(values) % 2 or len(values) < 2 * count:
+                    raise ValueError(f"expected {count:d} readings")
+            except Exception as exc:
+                raise ValueError(
+                    f"Unexpected instrument response for TRAC:DATA?: {result!r}"
+                ) from exc
+            index = self._buffer.index
+            begin, end = self._buffer.advance(index + len(values) // 2, len(values))
+            pairs = list(zip(values[0::2], values[1::2]))[: end - begin]
+            readings = [(self._buffer.timestamp(t), i) for i, t in pairs]
+            self._buffer.restart()
+        if self._buffer.full:
+            self._arm_i_buffered()
+        return readings
+
+    def stop_i_buffered(self) -> None:
+        self._write_nowait(":ABOR")
+        self._write(":TRAC:FEED:CONT NEV")
+        self._write(":TRIG:COUN 1")
+        self._write(f":TRIG:DEL {self._trigger_delay}")
+
+    def i_buffered_gaps(self) -> int:
+        """Return number of sampling gaps caused by re-arming the buffer."""
+        return self._buffer.gaps
+
     def set_system_beeper_state(self, state: bool) -> None:
         self._write(f":SYST:BEEP:STAT {state:d}")
 
@@ -111,11 +277,26 @@ class K2400Adapter:
     def set_sense_current_nplc(self, nplc: float) -> None:
         self._write(f":SENS:CURR:NPLC {nplc:E}")
 
+    def transaction(self) -> Transaction:
+        """Return transaction queueing writes until commit."""
+        return Transaction(self)
+
     @handle_exception
     def _write(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.write(message)
+            return
         _ = self._resource.write(message)
         _ = self._resource.query("*OPC?")
 
+    @handle_exception
+    def _write_nowait(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.flush()
+        _ = self._resource.write(message)
+
     @handle_exception
     def _query(self, message: str) -> str:
+        if self._transaction is not None:
+            self._transaction.flush()
         return self._resource.query(message).strip()
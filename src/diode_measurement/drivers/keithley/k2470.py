@@ -1,9 +1,16 @@
-from collections.abc import Mapping
+import math
+import time
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from comet.driver.keithley.k2470 import K2470
 
-from diode_measurement.core.driver import InstrumentError, handle_exception
+from diode_measurement.core.driver import (
+    BufferCursor,
+    InstrumentError,
+    Transaction,
+    handle_exception,
+)
 from diode_measurement.core.resource import Resource
 from diode_measurement.core.scpi import parse_scpi_error
 
@@ -11,9 +18,15 @@ __all__ = ["K2470Adapter"]
 
 
 class K2470Adapter:
+    max_sweep_points: int = 100
+    max_buffer_points: int = 10000
+
     def __init__(self, resource: Resource) -> None:
         self._resource: Resource = resource
+        self._transaction: Transaction | None = None
         self._driver: K2470 = K2470(resource)
+        self._buffer: BufferCursor = BufferCursor(self.max_buffer_points)
+        self._buffer_interval: float = 0.0
 
     def identify(self) -> str:
         return self._driver.identify()
@@ -28,44 +41,47 @@ class K2470Adapter:
         return parse_scpi_error(self._query(":SYST:ERR?"))
 
     def configure(self, options: Mapping[str, Any]) -> None:
-        route_terminals = options.get("route.terminals", "FRON")
-        self.set_route_terminals(route_terminals)
+        with self.transaction():
+            route_terminals = options.get("route.terminals", "FRON")
+            self.set_route_terminals(route_terminals)
 
-        self.set_source_function("VOLT")
+            self.set_source_function("VOLT")
 
-        self.set_sense_function("CURR")
+            self.set_sense_function("CURR")
 
-        sense_range = options.get("sense.range", 1e-08)
-        self.set_sense_current_range(sense_range)
+            sense_range = options.get("sense.range", 1e-08)
+            self.set_sense_current_range(sense_range)
 
-        sense_auto_range_lower_limit = options.get(
-            "sense.auto_range.lower_limit", 1e-08
-        )
-        self.set_sense_current_range_auto_lower_limit(sense_auto_range_lower_limit)
+            sense_auto_range_lower_limit = options.get(
+                "sense.auto_range.lower_limit", 1e-08
+            )
+            self.set_sense_current_range_auto_lower_limit(sense_auto_range_lower_limit)
 
-        sense_auto_range = options.get("sense.auto_range", True)
-        self.set_sense_current_range_auto(sense_auto_range)
+            sense_auto_range = options.get("sense.auto_range", True)
+            self.set_sense_current_range_auto(sense_auto_range)
 
-        filter_mode = options.get("filter.mode", "MOV")
-        self.set_sense_current_average_tcontrol(filter_mode)
+            filter_mode = options.get("filter.mode", "MOV")
+            self.set_sense_current_average_tcontrol(filter_mode)
 
-        filter_count = options.get("filter.count", 10)
-        self.set_sense_current_average_count(filter_count)
+            filter_count = options.get("filter.count", 10)
+            self.set_sense_current_average_count(filter_count)
 
-        filter_enable = options.get("filter.enable", False)
-        self.set_sense_current_average_enable(filter_enable)
+            filter_enable = options.get("filter.enable", False)
+            self.set_sense_current_average_enable(filter_enable)
 
-        nplc = options.get("nplc", 1.0)
-        self.set_sense_current_nplc(nplc)
+            nplc = options.get("nplc", 1.0)
+            self.set_sense_current_nplc(nplc)
 
-        system_breakdown_protection = options.get("system.breakdown.protection", "AUTO")
-        self.set_system_breakdown_protection(system_breakdown_protection)
+            system_breakdown_protection = options.get(
+                "system.breakdown.protection", "AUTO"
+            )
+            self.set_system_breakdown_protection(system_breakdown_protection)
 
-        source_delay_auto = options.get("source.delay.auto", True)
-        self.set_source_voltage_delay_auto(source_delay_auto)
+            source_delay_auto = options.get("source.delay.auto", True)
+            self.set_source_voltage_delay_auto(source_delay_auto)
 
-        sense_azero = options.get("sense.azero", True)
-        self.set_sense_current_azero(sense_azero)
+            sense_azero = options.get("sense.azero", True)
+            self.set_sense_current_azero(sense_azero)
 
     def get_output_enabled(self) -> bool:
         return self._query(":OUTP:STAT?") == "1"
@@ -108,6 +124,156 @@ class K2470Adapter:
                 f"Unexpected instrument response for READ?: {result!r}"
             ) from exc
 
+    def measure_iv_compliance(self) -> tuple[float, float, bool]:
+        """Measure I and V and read the compliance state at once."""
+        result = self._query(
+            ':READ? "defbuffer1", SOUR, READ;:SOUR:VOLT:ILIM:LEV:TRIP?'
+        )
+        try:
+            reading, tripped = result.split(";", 1)
+            source, current = reading.split(",", 1)
+            return float(current), float(source), tripped.strip() == "1"
+        except Exception as exc:
+            raise ValueError(
+                f"Unexpected instrument response for READ?: {result!r}"
+            ) from exc
+
+    def sweep_iv(
+        self,
+        voltages: Sequence[float],
+        delay: float,
+        abort_on_compliance: bool = False,
+        timeout: float | None = None,
+        interval: float = 0.050,
+    ) -> list[tuple[float, float, float]]:
+        """Run a source list sweep, return readings as list of (t, I, V) with
+        t relative to the first reading, using the instrument timestamps.
+
+        With abort on compliance the sweep stops at the first point exceeding
+        the source limit, only readings up to this point are returned.
+        """
+        count = len(voltages)
+        if not count:
+            return []
+        if timeout is None:
+            timeout = count * (delay + 1.0) + 10.0
+        points = ",".join(format(voltage, ".3E") for voltage in voltages)
+        fail_abort = "ON" if abort_on_compliance else "OFF"
+        # On failure keep the first sweep point, one step from the level
+        # before the sweep.
+        level = voltages[0]
+        try:
+            self._write(':TRAC:CLE "defbuffer1"')
+            self._write(f":SOUR:LIST:VOLT {points}")
+            self._write(
+                f':SOUR:SWE:VOLT:LIST 1, {delay:.3E}, 1, {fail_abort}, "defbuffer1"'
+            )
+            self._write_nowait(":INIT")
+            self._wait_trigger_idle(timeout, interval, abort_on_compliance)
+            if abort_on_compliance:
+                count = min(count, int(self._query(':TRAC:ACT? "defbuffer1"')))
+                if not count:
+                    return []
+            result = self._query(
+                f':TRAC:DATA? 1, {count:d}, "defbuffer1", SOUR, READ, REL'
+            )
+            try:
+                values = [float(value) for value in result.split(",")]
+                if len(values) != 3 * count:
+                    raise ValueError(f"expected {count:d} readings")
+            except Exception as exc:
+                raise ValueError(
+                    f"Unexpected instrument response for TRAC:DATA?: {result!r}"
+                ) from exc
+            # Keep source level at last swept point
+            level = voltages[count - 1]
+            t0 = values[2]
+            return [
+                (t - t0, i, v)
+                for v, i, t in zip(values[0::3], values[1::3], values[2::3])
+            ]
+        finally:
+            self.set_voltage_level(level)
+
+    def start_i_buffered(self, interval: float) -> None:
+        """Start sampling current into the reading buffer, read new readings
+        using read_i_buffered() until stop_i_buffered().
+        """
+        self._buffer = BufferCursor(self.max_buffer_points)
+        self._buffer_interval = interval
+        self._arm_i_buffered()
+
+    def _arm_i_buffered(self) -> None:
+        points = self.max_buffer_points
+        self._write(':TRAC:CLE "defbuffer1"')
+        self._write(f':TRAC:POIN {points:d}, "defbuffer1"')
+        self._write(
+            f':TRIG:LOAD "SimpleLoop", {points:d}, {self._buffer_interval:.3E}, '
+            '"defbuffer1"'
+        )
+        self._write_nowait(":INIT")
+        self._buffer.arm()
+
+    def read_i_buffered(self, max_count: int) -> list[tuple[float, float]]:
+        """Return new readings as list of (t, I) with t relative to the
+        start of sampling, using the instrument timestamps.
+        """
+        count = int(self._query(':TRAC:ACT? "defbuffer1"'))
+        begin, end = self._buffer.advance(count, max_count)
+        readings: list[tuple[float, float]] = []
+        if end > begin:
+            result = self._query(
+                f':TRAC:DATA? {begin + 1:d}, {end:d}, "defbuffer1", REL, READ'
+            )
+            try:
+                values = [float(value) for value in result.split(",")]
+                if len(values) != 2 * (end - begin):
+                    raise ValueError(f"expected {end - begin:d} readings")
+            except Exception as exc:
+                raise ValueError(
+                    f"Unexpected instrument response for TRAC:DATA?: {result!r}"
+                ) from exc
+            readings = [
+                (self._buffer.timestamp(t), i)
+                for t, i in zip(values[0::2], values[1::2])
+            ]
+        if self._buffer.full:
+            self._arm_i_buffered()
+        return readings
+
+    def stop_i_buffered(self) -> None:
+        self._write_nowait(":ABOR")
+
+    def i_buffered_gaps(self) -> int:
+        """Return number of sampling gaps caused by re-arming the buffer."""
+        return self._buffer.gaps
+
+    def start_voltage_ramp(
+        self, begin: float, end: float, rate: float, step: float
+    ) -> None:
+        """Start a linear source sweep from begin to end at rate (V/s)."""
+        points = max(2, math.ceil(abs(end - begin) / abs(step)) + 1)
+        delay = abs(end - begin) / (points - 1) / abs(rate)
+        self._write(':TRAC:CLE "defbuffer1"')
+        self._write(
+            f":SOUR:SWE:VOLT:LIN {begin:.3E}, {end:.3E}, {points:d}, {delay:.3E}, "
+            '1, FIXED, OFF, OFF, "defbuffer1"'
+        )
+        self._write_nowait(":INIT")
+
+    def voltage_ramp_running(self) -> bool:
+        state = self._query(":TRIG:STAT?").split(";")[0]
+        if state == "IDLE":
+            return False
+        if state not in {"RUNNING", "WAITING", "BUILDING", "PAUSED"}:
+            raise RuntimeError(f"Voltage ramp failed, trigger state: {state}")
+        return True
+
+    def abort_voltage_ramp(self) -> None:
+        """Abort ramp and hold the present output voltage."""
+        self._write(":ABOR")
+        self.set_voltage_level(self.measure_v())
+
     def set_route_terminals(self, terminal: str) -> None:
         self._write(f":ROUT:TERM {terminal}")
 
@@ -157,11 +323,44 @@ class K2470Adapter:
     def set_sense_current_azero(self, enabled: bool) -> None:
         self._write(f":SENS:CURR:AZER {enabled:d}")
 
+    def _wait_trigger_idle(
+        self, timeout: float, interval: float, accept_failed: bool = False
+    ) -> None:
+        threshold = time.monotonic() + timeout
+        interval = min(timeout, interval)
+        while True:
+            state = self._query(":TRIG:STAT?").split(";")[0]
+            if state == "IDLE":
+                return
+            if accept_failed and state in {"FAILED", "ABORTED"}:
+                return
+            if state not in {"RUNNING", "WAITING", "BUILDING", "PAUSED"}:
+                raise RuntimeError(f"Trigger model failed, state: {state}")
+            if time.monotonic() > threshold:
+                self._write(":ABOR")
+                raise RuntimeError(f"Trigger model timeout, exceeded {timeout:G} s")
+            time.sleep(interval)
+
+    def transaction(self) -> Transaction:
+        """Return transaction queueing writes until commit."""
+        return Transaction(self)
+
     @handle_exception
     def _write(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.write(message)
+            return
         _ = self._resource.write(message)
         _ = self._resource.query("*OPC?")
 
+    @handle_exception
+    def _write_nowait(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.flush()
+        _ = self._resource.write(message)
+
     @handle_exception
     def _query(self, message: str) -> str:
+        if self._transaction is not None:
+            self._transaction.flush()
         return self._resource.query(message).strip()
@@ -1,17 +1,86 @@
-from collections.abc import Mapping
+import math
+import time
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from comet.driver.keithley.k2657a import K2657A
 
-from diode_measurement.core.driver import InstrumentError, handle_exception
+from diode_measurement.core.driver import (
+    InstrumentError,
+    Transaction,
+    handle_exception,
+)
 from diode_measurement.core.resource import Resource
 
 __all__ = ["K2657AAdapter"]
 
+# Keep alive while waiting, prints W rows for delays exceeding one second.
+WAIT_FUNCTION: list[str] = [
+    "local function dm_wait(seconds)",
+    "  while seconds > 0 do",
+    "    local d = math.min(seconds, 1.0)",
+    "    delay(d)",
+    "    seconds = seconds - d",
+    '    if seconds > 0 then print("W") end',
+    "  end",
+    "end",
+]
+
+# Sweep script, parameters are passed by dm_* globals. Prints tab separated
+# rows: R (ramp step), W (keep alive), P (point), C (compliance), E (end).
+SWEEP_SCRIPT: list[str] = [
+    *WAIT_FUNCTION,
+    "local function dm_ramp(target)",
+    "  local level = smua.source.levelv",
+    "  local n = math.ceil(math.abs(target - level) / dm_ramp_step)",
+    "  for k = 1, n do",
+    "    smua.source.levelv = level + (target - level) * k / n",
+    "    delay(dm_ramp_delay)",
+    '    print("R", smua.source.levelv)',
+    "  end",
+    "end",
+    "local aborted = false",
+    "for index = 1, table.getn(dm_voltages) do",
+    "  smua.source.levelv = dm_voltages[index]",
+    "  dm_wait(dm_delay)",
+    "  local i, v = smua.measure.iv()",
+    "  local compliance = smua.source.compliance",
+    '  print("P", index, dm_voltages[index], i, v, compliance)',
+    "  if compliance and dm_abort_compliance then",
+    "    dm_ramp(0)",
+    '    print("C", index)',
+    "    aborted = true",
+    "    break",
+    "  end",
+    "end",
+    "if dm_ramp_down and not aborted then dm_ramp(0) end",
+    'print("E")',
+]
+
+# Buffered sweep script, stops at the first point in compliance unless
+# dm_abort_compliance is false. Prints tab separated rows: W (keep alive),
+# P (time, I, V, compliance), E (end).
+SWEEP_IV_SCRIPT: list[str] = [
+    *WAIT_FUNCTION,
+    "timer.reset()",
+    "for index = 1, table.getn(dm_levels) do",
+    "  smua.source.levelv = dm_levels[index]",
+    "  dm_wait(dm_delay)",
+    "  local i, v = smua.measure.iv()",
+    "  local compliance = smua.source.compliance",
+    '  print("P", timer.measure.t(), i, v, compliance)',
+    "  if compliance and dm_abort_compliance then break end",
+    "end",
+    'print("E")',
+]
+
 
 class K2657AAdapter:
+    max_sweep_points: int = 100
+
     def __init__(self, resource: Resource) -> None:
         self._resource: Resource = resource
+        self._transaction: Transaction | None = None
         self._driver: K2657A = K2657A(resource)
 
     def identify(self) -> str:
@@ -30,23 +99,24 @@ class K2657AAdapter:
         return InstrumentError(error.code, error.message)
 
     def configure(self, options: Mapping[str, Any]) -> None:
-        beeper_enable = options.get("beeper.enable", False)
-        self.set_beeper_enable(beeper_enable)
+        with self.transaction():
+            beeper_enable = options.get("beeper.enable", False)
+            self.set_beeper_enable(beeper_enable)
 
-        self.set_source_function("DCVOLTS")
-        self.set_display_measure_function("DCAMPS")
+            self.set_source_function("DCVOLTS")
+            self.set_display_measure_function("DCAMPS")
 
-        filter_mode = options.get("filter.mode", "REPEAT_AVG")
-        self.set_measure_filter_type(filter_mode)
+            filter_mode = options.get("filter.mode", "REPEAT_AVG")
+            self.set_measure_filter_type(filter_mode)
 
-        filter_count = options.get("filter.count", 10)
-        self.set_measure_filter_count(filter_count)
+            filter_count = options.get("filter.count", 10)
+            self.set_measure_filter_count(filter_count)
 
-        filter_enable = options.get("filter.enable", False)
-        self.set_measure_filter_enable(filter_enable)
+            filter_enable = options.get("filter.enable", False)
+            self.set_measure_filter_enable(filter_enable)
 
-        nplc = options.get("nplc", 1.0)
-        self.set_measure_nplc(nplc)
+            nplc = options.get("nplc", 1.0)
+            self.set_measure_nplc(nplc)
 
     def get_output_enabled(self) -> bool:
         return self._print("smua.source.output") == "1"
@@ -77,9 +147,173 @@ class K2657AAdapter:
         return self._driver.measure_voltage()
 
     def measure_iv(self) -> tuple[float, float]:
-        i = self.measure_i()  # TODO print(smua.measure.iv())
-        v = self.measure_v()
-        return i, v
+        """Measure I and V at once using smua.measure.iv()."""
+        result = self._print("smua.measure.iv()")
+        try:
+            i, v = result.split("\t")
+            return float(i), float(v)
+        except Exception as exc:
+            raise ValueError(f"Unexpected instrument response: {result!r}") from exc
+
+    def measure_iv_compliance(self) -> tuple[float, float, bool]:
+        """Measure I and V and read the compliance state at once."""
+        result = self._query(
+            "local i, v = smua.measure.iv() print(i, v, smua.source.compliance)"
+        )
+        try:
+            i, v, compliance = result.split("\t")
+            return float(i), float(v), compliance.strip() == "true"
+        except Exception as exc:
+            raise ValueError(f"Unexpected instrument response: {result!r}") from exc
+
+    def sweep_iv(
+        self,
+        voltages: Sequence[float],
+        delay: float,
+        abort_on_compliance: bool = False,
+        timeout: float | None = None,
+    ) -> list[tuple[float, float, float]]:
+        """Run a sweep script, return readings as list of (t, I, V) with t
+        relative to the first reading, using the instrument timer.
+
+        With abort on compliance the script stops at the first point in
+        compliance, only readings up to this point are returned and the
+        source level is kept at this point.
+        """
+        count = len(voltages)
+        if not count:
+            return []
+        if timeout is None:
+            timeout = count * (delay + 1.0) + 10.0
+        self._load_script("dm_sweep_iv", SWEEP_IV_SCRIPT)
+        self._write_table("dm_levels", voltages)
+        self._write(f"dm_delay = {delay:E}")
+        self._write(f"dm_abort_compliance = {str(abort_on_compliance).lower()}")
+        readings: list[tuple[float, float, float]] = []
+        finished = False
+        try:
+            self._write_nowait("dm_sweep_iv.run()")
+            threshold = time.monotonic() + timeout
+            while not finished:
+                if time.monotonic() > threshold:
+                    raise RuntimeError(f"Sweep timeout, exceeded {timeout:G} s")
+                kind, values = self.read_script_sweep()
+                if kind == "P":
+                    t, i, v, _ = values
+                    readings.append((t, i, v))
+                elif kind == "E":
+                    finished = True
+            if len(readings) > count:
+                raise ValueError(f"expected up to {count:d} readings")
+        finally:
+            if not finished:
+                self._clear()
+                # Keep source level at last swept point, or the first sweep
+                # point, one step from the level before the sweep.
+                level = voltages[max(0, len(readings) - 1)]
+                self._write(f"smua.source.levelv = {level:E}")
+        t0 = readings[0][0] if readings else 0.0
+        return [(t - t0, i, v) for t, i, v in readings]
+
+    def start_script_sweep(
+        self,
+        voltages: Sequence[float],
+        delay: float,
+        ramp_step: float,
+        ramp_delay: float,
+        abort_on_compliance: bool,
+        ramp_down: bool,
+    ) -> None:
+        """Upload and run the sweep script, read its rows using
+        read_script_sweep() until the end row.
+        """
+        self._load_script("dm_sweep", SWEEP_SCRIPT)
+        self._write_table("dm_voltages", voltages)
+        self._write(f"dm_delay = {delay:E}")
+        self._write(f"dm_ramp_step = {max(abs(ramp_step), 1e-3):E}")
+        self._write(f"dm_ramp_delay = {ramp_delay:E}")
+        self._write(f"dm_abort_compliance = {str(abort_on_compliance).lower()}")
+        self._write(f"dm_ramp_down = {str(ramp_down).lower()}")
+        self._write_nowait("dm_sweep.run()")
+
+    def _load_script(self, name: str, lines: Sequence[str]) -> None:
+        self._write_nowait(f"loadscript {name}")
+        for line in lines:
+            self._write_nowait(line)
+        self._write_nowait("endscript")
+
+    def _write_table(self, name: str, values: Sequence[float]) -> None:
+        self._write(f"{name} = {{}}")
+        for offset in range(0, len(values), 50):
+            points = ", ".join(
+                format(value, ".3E") for value in values[offset : offset + 50]
+            )
+            self._write(
+                f"for _, value in ipairs({{{points}}}) do "
+                f"table.insert({name}, value) end"
+            )
+
+    def read_script_sweep(self) -> tuple[str, list[float]]:
+        """Read next row printed by the sweep script, return kind and
+        values (booleans converted to 1.0 or 0.0).
+        """
+        result = self._read()
+        try:
+            kind, *fields = [field.strip() for field in result.split("\t")]
+            booleans = {"true": 1.0, "false": 0.0}
+            values = [
+                booleans[field] if field in booleans else float(field)
+                for field in fields
+            ]
+        except Exception as exc:
+            raise ValueError(f"Unexpected script output: {result!r}") from exc
+        if kind not in {"R", "W", "P", "C", "E"}:
+            raise ValueError(f"Unexpected script output: {result!r}")
+        return kind, values
+
+    def abort_script_sweep(self) -> None:
+        """Abort a running script by device clear, the source level is kept."""
+        self._clear()
+
+    def start_voltage_ramp(
+        self, begin: float, end: float, rate: float, step: float
+    ) -> None:
+        """Start a timer driven linear source sweep from begin to end at rate
+        (V/s), without measurements.
+        """
+        points = max(2, math.ceil(abs(end - begin) / abs(step)) + 1)
+        delay = abs(end - begin) / (points - 1) / abs(rate)
+        self._write(f"smua.trigger.source.linearv({begin:E}, {end:E}, {points:d})")
+        self._write("smua.trigger.source.action = smua.ENABLE")
+        self._write("smua.trigger.measure.action = smua.DISABLE")
+        self._write("smua.trigger.endpulse.action = smua.SOURCE_HOLD")
+        self._write("smua.trigger.endsweep.action = smua.SOURCE_HOLD")
+        self._write(f"smua.trigger.count = {points:d}")
+        self._write(f"trigger.timer[1].delay = {delay:E}")
+        self._write(f"trigger.timer[1].count = {points - 1:d}")
+        self._write("trigger.timer[1].passthrough = true")
+        self._write("trigger.timer[1].stimulus = smua.trigger.ARMED_EVENT_ID")
+        self._write("smua.trigger.source.stimulus = trigger.timer[1].EVENT_ID")
+        self._write_nowait("smua.trigger.initiate()")
+
+    def voltage_ramp_running(self) -> bool:
+        running = bool(int(float(self._print("status.operation.sweeping.condition"))))
+        if not running:
+            self._reset_voltage_ramp()
+        return running
+
+    def abort_voltage_ramp(self) -> None:
+        """Abort ramp and hold the present output voltage."""
+        self._write("smua.abort()")
+        self._reset_voltage_ramp()
+        self.set_voltage_level(self.measure_v())
+
+    def _reset_voltage_ramp(self) -> None:
+        """Restore trigger model defaults changed by the voltage ramp."""
+        self._write("smua.trigger.source.stimulus = 0")
+        self._write("smua.trigger.source.action = smua.DISABLE")
+        self._write("smua.trigger.endpulse.action = smua.SOURCE_IDLE")
+        self._write("smua.trigger.endsweep.action = smua.SOURCE_IDLE")
 
     def set_beeper_enable(self, enabled: bool) -> None:
         value = {True: "ON", False: "OFF"}[enabled]
@@ -105,14 +339,37 @@ class K2657AAdapter:
             raise ValueError(f"Invalid display measure function: {function}")
         self._write(f"display.smua.measure.func = display.MEASURE_{function}")
 
+    def transaction(self) -> Transaction:
+        """Return transaction queueing writes until commit."""
+        return Transaction(self, separator=" ")
+
     @handle_exception
     def _write(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.write(message)
+            return
         _ = self._resource.write(message)
         _ = self._resource.query("*OPC?")
 
+    @handle_exception
+    def _write_nowait(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.flush()
+        _ = self._resource.write(message)
+
     @handle_exception
     def _query(self, message: str) -> str:
+        if self._transaction is not None:
+            self._transaction.flush()
         return self._resource.query(message).strip()
 
+    @handle_exception
+    def _read(self) -> str:
+        return self._resource.read().strip()
+
+    @handle_exception
+    def _clear(self) -> None:
+        self._resource.clear()
+
     def _print(self, message: str):
         return self._query(f"print({message})")
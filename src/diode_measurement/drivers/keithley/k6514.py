@@ -1,10 +1,15 @@
-import time
 from collections.abc import Iterable, Mapping
 from typing import Any
 
 from comet.driver.keithley.k6514 import K6514
 
-from diode_measurement.core.driver import InstrumentError, handle_exception
+from diode_measurement.core.completion import CompletionWaiter, service_request_waiter
+from diode_measurement.core.driver import (
+    BufferCursor,
+    InstrumentError,
+    Transaction,
+    handle_exception,
+)
 from diode_measurement.core.resource import Resource
 from diode_measurement.core.scpi import parse_scpi_error
 
@@ -12,8 +17,16 @@ __all__ = ["K6514Adapter"]
 
 
 class K6514Adapter:
+    max_buffer_points: int = 2500
+
     def __init__(self, resource: Resource) -> None:
         self._resource: Resource = resource
+        self._transaction: Transaction | None = None
+        self._completion: CompletionWaiter = CompletionWaiter()
+        self._timing: dict[str, Any] = {}  # settings affecting conversion time
+        self._service_request_enabled: bool = False
+        self._buffer: BufferCursor = BufferCursor(self.max_buffer_points)
+        self._trigger_delay: str = "0"
         self._driver: K6514 = K6514(resource)
 
     def identify(self) -> str:
@@ -21,44 +34,49 @@ class K6514Adapter:
 
     def reset(self) -> None:
         self._driver.reset()
+        self._service_request_enabled = False
 
     def clear(self) -> None:
         self._driver.clear()
+        self._service_request_enabled = False
 
     def next_error(self) -> InstrumentError | None:
         return parse_scpi_error(self._query(":SYST:ERR?"))
 
     def configure(self, options: Mapping[str, Any]) -> None:
-        self.set_format_elements(["READ"])
-        self.set_sense_function("CURR")
+        # Service requests are enabled again on next reading
+        self._service_request_enabled = False
+        with self.transaction():
+            self.set_format_elements(["READ"])
+            self.set_sense_function("CURR")
 
-        sense_range = options.get("sense.range", 200e-6)
-        self.set_sense_current_range(sense_range)
+            sense_range = options.get("sense.range", 200e-6)
+            self.set_sense_current_range(sense_range)
 
-        sense_auto_range_lower_limit = options.get(
-            "sense.auto_range.lower_limit", 2e-12
-        )
-        self.set_sense_current_range_auto_lower_limit(sense_auto_range_lower_limit)
+            sense_auto_range_lower_limit = options.get(
+                "sense.auto_range.lower_limit", 2e-12
+            )
+            self.set_sense_current_range_auto_lower_limit(sense_auto_range_lower_limit)
 
-        sense_auto_range_upper_limit = options.get(
-            "sense.auto_range.upper_limit", 20e-3
-        )
-        self.set_sense_current_range_auto_upper_limit(sense_auto_range_upper_limit)
+            sense_auto_range_upper_limit = options.get(
+                "sense.auto_range.upper_limit", 20e-3
+            )
+            self.set_sense_current_range_auto_upper_limit(sense_auto_range_upper_limit)
 
-        sense_auto_range = options.get("sense.auto_range", True)
-        self.set_sense_current_range_auto(sense_auto_range)
+            sense_auto_range = options.get("sense.auto_range", True)
+            self.set_sense_current_range_auto(sense_auto_range)
 
-        filter_mode = options.get("filter.mode", "MOV")
-        self.set_sense_average_tcontrol(filter_mode)
+            filter_mode = options.get("filter.mode", "MOV")
+            self.set_sense_average_tcontrol(filter_mode)
 
-        filter_count = options.get("filter.count", 10)
-        self.set_sense_average_count(filter_count)
+            filter_count = options.get("filter.count", 10)
+            self.set_sense_average_count(filter_count)
 
-        filter_enable = options.get("filter.enable", False)
-        self.set_sense_average_state(filter_enable)
+            filter_enable = options.get("filter.enable", False)
+            self.set_sense_average_state(filter_enable)
 
-        nplc = options.get("nplc", 5.0)
-        self.set_sense_current_nplcycles(nplc)
+            nplc = options.get("nplc", 5.0)
+            self.set_sense_current_nplcycles(nplc)
 
     def get_output_enabled(self) -> bool:
         return False
@@ -77,24 +95,89 @@ class K6514Adapter:
     def compliance_tripped(self) -> bool:
         return False
 
-    def measure_i(self, timeout: float = 10.0, interval: float = 0.250) -> float:
+    def measure_i(self, timeout: float = 10.0) -> float:
+        wait_for_srq = service_request_waiter(self._resource)
         # Request operation complete
         self._write("*CLS")
+        if wait_for_srq is not None:
+            self._enable_service_request()
         self._write_nowait("*OPC")
         # Initiate measurement
         self._write_nowait(":INIT")
-        threshold = time.monotonic() + timeout
-        interval = min(timeout, interval)
-        while time.monotonic() < threshold:
-            # Read event status
-            if int(self._query("*ESR?")) & 0x1:
-                try:
-                    result = self._query(":FETC?")
-                    return float(result.split(",")[0])
-                except Exception as exc:
-                    raise RuntimeError(f"Failed to fetch ELM reading: {exc}") from exc
-            time.sleep(interval)
-        raise RuntimeError(f"Electrometer reading timeout, exceeded {timeout:G} s")
+        if not self._completion.wait(
+            self._operation_complete,
+            timeout,
+            key=tuple(sorted(self._timing.items())),
+            wait_for_srq=wait_for_srq,
+        ):
+            raise RuntimeError(f"Electrometer reading timeout, exceeded {timeout:G} s")
+        try:
+            result = self._query(":FETC?")
+            return float(result.split(",")[0])
+        except Exception as exc:
+            raise RuntimeError(f"Failed to fetch ELM reading: {exc}") from exc
+
+    def start_i_buffered(self, interval: float) -> None:
+        """Start sampling current into the trace buffer, read new readings
+        using read_i_buffered() until stop_i_buffered().
+        """
+        self.set_format_elements(["READ", "TIME"])
+        self._trigger_delay = self._query(":TRIG:DEL?")
+        self._write(f":TRIG:DEL {interval:.3E}")
+        self._buffer = BufferCursor(self.max_buffer_points)
+        self._arm_i_buffered()
+
+    def _arm_i_buffered(self) -> None:
+        self._write(":TRAC:FEED:CONT NEV")
+        self._write(":TRAC:CLE")
+        self._write(f":TRAC:POIN {self.max_buffer_points:d}")
+        self._write(":TRAC:TST:FORM ABS")
+        self._write(":TRAC:FEED SENS")
+        self._write(":TRAC:FEED:CONT NEXT")
+        self._write(f":TRIG:COUN {self.max_buffer_points:d}")
+        self._write_nowait(":INIT")
+        self._buffer.arm()
+
+    def read_i_buffered(self, max_count: int) -> list[tuple[float, float]]:
+        """Return new readings as list of (t, I) with t relative to the
+        start of sampling, using the instrument timestamps.
+
+        The trace buffer can only be read as a whole, it is cleared after
+        every fetch so every reading is transferred once. All readings
+        stored are returned, exceeding max_count if sampling outpaces
+        polling.
+        """
+        count = int(float(self._query(":TRAC:POIN:ACT?")))
+        readings: list[tuple[float, float]] = []
+        if count:
+            result = self._query(":TRAC:DATA?;:TRAC:CLE;:TRAC:FEED:CONT NEXT")
+            try:
+                values = [float(value) for value in result.split(",")]
+                if len(values) % 2 or len(values) < 2 * count:
+                    raise ValueError(f"expected {count:d} readings")
+            except Exception as exc:
+                raise ValueError(
+                    f"Unexpected instrument response for TRAC:DATA?: {result!r}"
+                ) from exc
+            index = self._buffer.index
+            begin, end = self._buffer.advance(index + len(values) // 2, len(values))
+            pairs = list(zip(values[0::2], values[1::2]))[: end - begin]
+            readings = [(self._buffer.timestamp(t), i) for i, t in pairs]
+            self._buffer.restart()
+        if self._buffer.full:
+            self._arm_i_buffered()
+        return readings
+
+    def stop_i_buffered(self) -> None:
+        self._write_nowait(":ABOR")
+        self._write(":TRAC:FEED:CONT NEV")
+        self._write(":TRIG:COUN 1")
+        self._write(f":TRIG:DEL {self._trigger_delay}")
+        self.set_format_elements(["READ"])
+
+    def i_buffered_gaps(self) -> int:
+        """Return number of sampling gaps caused by re-arming the buffer."""
+        return self._buffer.gaps
 
     def measure_iv(self) -> tuple[float, float]:
         return self.measure_i(), float("nan")  # TODO
@@ -110,6 +193,7 @@ class K6514Adapter:
         self._write(f":SENS:CURR:RANG {level:E}")
 
     def set_sense_current_range_auto(self, enabled: bool) -> None:
+        self._timing["sense.auto_range"] = enabled
         self._write(f":SENS:CURR:RANG:AUTO {enabled:d}")
 
     def set_sense_current_range_auto_lower_limit(self, limit: float) -> None:
@@ -119,29 +203,54 @@ class K6514Adapter:
         self._write(f":SENS:CURR:RANG:AUTO:ULIM {limit:E}")
 
     def set_sense_average_tcontrol(self, tcontrol: str) -> None:
+        self._timing["filter.mode"] = tcontrol
         self._write(f":SENS:AVER:TCON {tcontrol}")
 
     def set_sense_average_count(self, count: int) -> None:
+        self._timing["filter.count"] = count
         self._write(f":SENS:AVER:COUN {count:d}")
 
     def set_sense_average_state(self, state: bool) -> None:
+        self._timing["filter.enable"] = state
         self._write(f":SENS:AVER:STAT {state:d}")
 
     def set_sense_current_nplcycles(self, nplc: float) -> None:
+        self._timing["nplc"] = nplc
         self._write(f":SENS:CURR:NPLC {nplc:E}")
 
     def set_zero_check_enabled(self, enabled: bool) -> None:
         self._write(f":SYST:ZCH {enabled:d}")
 
+    def _enable_service_request(self) -> None:
+        """Request service on operation complete (ESB summary bit)."""
+        if not self._service_request_enabled:
+            self._write("*ESE 1")
+            self._write("*SRE 32")
+            self._service_request_enabled = True
+
+    def _operation_complete(self) -> bool:
+        return bool(int(self._query("*ESR?")) & 0x1)
+
+    def transaction(self) -> Transaction:
+        """Return transaction queueing writes until commit."""
+        return Transaction(self)
+
     @handle_exception
     def _write(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.write(message)
+            return
         _ = self._resource.write(message)
         _ = self._resource.query("*OPC?")
 
     @handle_exception
-    def _write_nowait(self, message: str):
+    def _write_nowait(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.flush()
         _ = self._resource.write(message)
 
     @handle_exception
     def _query(self, message: str) -> str:
+        if self._transaction is not None:
+            self._transaction.flush()
         return self._resource.query(message).strip()
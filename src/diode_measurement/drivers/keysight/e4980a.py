@@ -1,8 +1,12 @@
-import time
 from collections.abc import Mapping
 from typing import Any
 
-from diode_measurement.core.driver import InstrumentError, handle_exception
+from diode_measurement.core.completion import CompletionWaiter, service_request_waiter
+from diode_measurement.core.driver import (
+    InstrumentError,
+    Transaction,
+    handle_exception,
+)
 from diode_measurement.core.resource import Resource
 from diode_measurement.core.scpi import parse_scpi_error
 
@@ -12,53 +16,62 @@ __all__ = ["E4980AAdapter"]
 class E4980AAdapter:
     def __init__(self, resource: Resource) -> None:
         self._resource: Resource = resource
+        self._transaction: Transaction | None = None
+        self._completion: CompletionWaiter = CompletionWaiter()
+        self._timing: dict[str, Any] = {}  # settings affecting conversion time
+        self._service_request_enabled: bool = False
 
     def identify(self) -> str:
         return self._query("*IDN?").strip()
 
     def reset(self) -> None:
         self._write("*RST")
+        self._service_request_enabled = False
 
     def clear(self) -> None:
         self._write("*CLS")
+        self._service_request_enabled = False
 
     def next_error(self) -> InstrumentError | None:
         return parse_scpi_error(self._query(":SYST:ERR?"))
 
     def configure(self, options: Mapping[str, Any]) -> None:
-        self._write(":SYST:BEEP:STAT 0")
-        self._write(":BIAS:RANG:AUTO 1")
-        self._write(":INIT:CONT OFF")
-        self._write(":TRIG:SOUR BUS")
+        # Service requests are enabled again on next reading
+        self._service_request_enabled = False
+        with self.transaction():
+            self._write(":SYST:BEEP:STAT 0")
+            self._write(":BIAS:RANG:AUTO 1")
+            self._write(":INIT:CONT OFF")
+            self._write(":TRIG:SOUR BUS")
 
-        function_type = options.get("function.type", "CPRP")
-        self.set_function_impedance_type(function_type)
+            function_type = options.get("function.type", "CPRP")
+            self.set_function_impedance_type(function_type)
 
-        # Aperture
-        integration_time = options.get("aperture.integration_time", "MED")
-        averaging_rate = options.get("aperture.averaging_rate", 1)
-        self.set_aperture(integration_time, averaging_rate)
+            # Aperture
+            integration_time = options.get("aperture.integration_time", "MED")
+            averaging_rate = options.get("aperture.averaging_rate", 1)
+            self.set_aperture(integration_time, averaging_rate)
 
-        # Correction cable length
-        correction_length = options.get("correction.length", 0)
-        self.set_correction_length(correction_length)
+            # Correction cable length
+            correction_length = options.get("correction.length", 0)
+            self.set_correction_length(correction_length)
 
-        # Enable open correction
-        correction_open_enabled = options.get("correction.open.enabled", False)
-        self.set_correction_open_state(correction_open_enabled)
+            # Enable open correction
+            correction_open_enabled = options.get("correction.open.enabled", False)
+            self.set_correction_open_state(correction_open_enabled)
 
-        # Enable open correction
-        correction_short_enabled = options.get("correction.short.enabled", False)
-        self.set_correction_short_state(correction_short_enabled)
+            # Enable open correction
+            correction_short_enabled = options.get("correction.short.enabled", False)
+            self.set_correction_short_state(correction_short_enabled)
 
-        voltage = options.get("voltage", 1.0)
-        self.set_amplitude_voltage(voltage)
+            voltage = options.get("voltage", 1.0)
+            self.set_amplitude_voltage(voltage)
 
-        frequency = options.get("frequency", 1000.0)
-        self.set_amplitude_frequency(frequency)
+            frequency = options.get("frequency", 1000.0)
+            self.set_amplitude_frequency(frequency)
 
-        amplitude_alc = options.get("amplitude.alc", False)
-        self.set_amplitude_alc(amplitude_alc)
+            amplitude_alc = options.get("amplitude.alc", False)
+            self.set_amplitude_alc(amplitude_alc)
 
     def get_output_enabled(self) -> bool:
         return self._query(":BIAS:STAT?") == "1"
@@ -101,6 +114,7 @@ class E4980AAdapter:
     def set_aperture(self, integration_time: str, averaging_rate: int) -> None:
         assert integration_time in ["SHOR", "MED", "LONG"]
         assert 1 <= averaging_rate <= 256
+        self._timing["aperture"] = (integration_time, averaging_rate)
         self._write(f":APER {integration_time},{averaging_rate:d}")
 
     def set_correction_length(self, correction_length: int) -> None:
@@ -117,38 +131,63 @@ class E4980AAdapter:
         self._write(f":VOLT {voltage:E}")
 
     def set_amplitude_frequency(self, frequency: float) -> None:
+        self._timing["frequency"] = frequency
         self._write(f":FREQ {frequency:E}")
 
     def set_amplitude_alc(self, enabled: bool) -> None:
         self._write(f":AMPL:ALC {enabled:d}")
 
+    def _enable_service_request(self) -> None:
+        """Request service on operation complete (ESB summary bit)."""
+        if not self._service_request_enabled:
+            self._write("*ESE 1")
+            self._write("*SRE 32")
+            self._service_request_enabled = True
+
+    def _operation_complete(self) -> bool:
+        return bool(int(self._query("*ESR?")) & 0x1)
+
+    def transaction(self) -> Transaction:
+        """Return transaction queueing writes until commit."""
+        return Transaction(self)
+
     @handle_exception
     def _write(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.write(message)
+            return
         _ = self._resource.write(message)
         _ = self._resource.query("*OPC?")
 
     @handle_exception
-    def _write_nowait(self, message: str):
+    def _write_nowait(self, message: str) -> None:
+        if self._transaction is not None:
+            self._transaction.flush()
         _ = self._resource.write(message)
 
     @handle_exception
     def _query(self, message: str) -> str:
+        if self._transaction is not None:
+            self._transaction.flush()
         return self._resource.query(message).strip()
 
-    def _fetch(self, timeout: float = 10.0, interval: float = 0.250) -> str:
+    def _fetch(self, timeout: float = 10.0) -> str:
+        wait_for_srq = service_request_waiter(self._resource)
         # Request operation complete
         self._write("*CLS")
+        if wait_for_srq is not None:
+            self._enable_service_request()
         self._write_nowait("*OPC")
         # Initiate measurement
         self._write_nowait(":TRIG:IMM")
-        threshold = time.monotonic() + timeout
-        interval = min(timeout, interval)
-        while time.monotonic() < threshold:
-            # Read event status
-            if int(self._query("*ESR?")) & 0x1:
-                try:
-                    return self._query(":FETC?")
-                except Exception as exc:
-                    raise RuntimeError(f"Failed to fetch LCR reading: {exc}") from exc
-            time.sleep(interval)
-        raise RuntimeError(f"LCR reading timeout, exceeded {timeout:G} s")
+        if not self._completion.wait(
+            self._operation_complete,
+            timeout,
+            key=tuple(sorted(self._timing.items())),
+            wait_for_srq=wait_for_srq,
+        ):
+            raise RuntimeError(f"LCR reading timeout, exceeded {timeout:G} s")
+        try:
+            return self._query(":FETC?")
+        except Exception as exc:
+            raise RuntimeError(f"Failed to fetch LCR reading: {exc}") from exc
@@ -0,0 +1,86 @@
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from diode_measurement.core.driver import InstrumentError
+
+__all__ = ["SwitchingMatrixAdapter"]
+
+
+class SwitchingMatrixAdapter:
+    """Base adapter for switching matrices keeping a cache of closed channels.
+
+    Only the difference between the cached and the requested state is sent
+    to the instrument. The cache is synchronized using `closed_channels()`
+    if unknown, e.g. after creation or reset.
+    """
+
+    _driver: Any
+
+    def __init__(self) -> None:
+        self._closed: set[str] | None = None
+
+    def identify(self) -> str:
+        return self._driver.identify()
+
+    def reset(self) -> None:
+        self._closed = None
+        self._driver.reset()
+
+    def clear(self) -> None:
+        self._driver.clear()
+
+    def next_error(self) -> InstrumentError | None:
+        return self._driver.next_error()
+
+    def configure(self, options: Mapping[str, Any]) -> None:
+        self.set_closed_channels(options.get("channels", []))
+
+    def closed_channels(self) -> list[str]:
+        """Read closed channels from the instrument and update the cache."""
+        channels = list(self._driver.closed_channels)
+        self._closed = set(channels)
+        return channels
+
+    def _cached_closed_channels(self) -> set[str]:
+        if self._closed is None:
+            self.closed_channels()
+        return set(self._closed or ())
+
+    def set_closed_channels(self, channels: Iterable[str]) -> None:
+        """Close exactly the given channels, open all others."""
+        channels = list(dict.fromkeys(channels))
+        closed = self._cached_closed_channels()
+        to_open = sorted(closed.difference(channels))
+        to_close = [channel for channel in channels if channel not in closed]
+        # Invalidate cache until all commands succeeded
+        self._closed = None
+        if to_open:
+            self._driver.open_channels(to_open)
+        if to_close:
+            self._driver.close_channels(to_close)
+        self._closed = set(channels)
+
+    def open_all_channels(self) -> None:
+        if self._closed == set():
+            return
+        self._closed = None
+        self._driver.open_all_channels()
+        self._closed = set()
+
+    def close_channels(self, channels: Iterable[str]) -> None:
+        closed = self._cached_closed_channels()
+        to_close = [
+            channel for channel in dict.fromkeys(channels) if channel not in closed
+        ]
+        if to_close:
+            self._closed = None
+            self._driver.close_channels(to_close)
+            self._closed = closed.union(to_close)
+
+    def open_channels(self, channels: Iterable[str]) -> None:
+        closed = self._cached_closed_channels()
+        to_open = [channel for channel in dict.fromkeys(channels) if channel in closed]
+        if to_open:
+            self._closed = None
+            self._driver.open_channels(to_open)
+            self._closed = closed.difference(to_open)
@@ -1,6 +1,9 @@
-from PySide6 import QtWidgets
+from collections.abc import Mapping
+from typing import Any
 
-__all__ = ["ChangeVoltageDialog"]
+from PySide6 import QtCore, QtWidgets
+
+__all__ = ["ChangeVoltageDialog", "IOMetricsDialog"]
 
 
 class ChangeVoltageDialog(QtWidgets.QDialog):
@@ -72,3 +75,73 @@ class ChangeVoltageDialog(QtWidgets.QDialog):
     def set_waiting_time(self, seconds: float) -> None:
         """Set waiting time in seconds or fractions of seconds."""
         self.waiting_time_spin_box.setValue(seconds)
+
+
+class IOMetricsDialog(QtWidgets.QDialog):
+    """Show instrument I/O metrics by role and command prefix."""
+
+    refresh_requested = QtCore.Signal()
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self.setWindowTitle("I/O Metrics")
+        self.resize(720, 400)
+
+        self.tree_widget = QtWidgets.QTreeWidget(self)
+        self.tree_widget.setHeaderLabels(
+            [
+                "Role/Command",
+                "Count",
+                "Written",
+                "Read",
+                "p50",
+                "p95",
+                "Max",
+                "Total",
+                "Timeouts",
+                "Reconnects",
+            ]
+        )
+        self.tree_widget.setRootIsDecorated(True)
+        self.tree_widget.setAlternatingRowColors(True)
+
+        self.refresh_button = QtWidgets.QPushButton("&Refresh", self)
+        self.refresh_button.clicked.connect(self.refresh_requested.emit)
+
+        self.dialog_button_box = QtWidgets.QDialogButtonBox(self)
+        self.dialog_button_box.addButton(
+            QtWidgets.QDialogButtonBox.StandardButton.Close
+        )
+        self.dialog_button_box.addButton(
+            self.refresh_button, QtWidgets.QDialogButtonBox.ButtonRole.ActionRole
+        )
+        self.dialog_button_box.rejected.connect(self.reject)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.tree_widget)
+        layout.addWidget(self.dialog_button_box)
+
+    def set_metrics(self, metrics: Mapping[str, Mapping[str, Any]]) -> None:
+        """Set I/O metrics by role, latencies in seconds."""
+        self.tree_widget.clear()
+        for role, role_metrics in metrics.items():
+            role_item = QtWidgets.QTreeWidgetItem(self.tree_widget)
+            role_item.setText(0, role.upper())
+            role_item.setText(1, format(role_metrics.get("count", 0)))
+            role_item.setText(8, format(role_metrics.get("timeouts", 0)))
+            role_item.setText(9, format(role_metrics.get("reconnects", 0)))
+            for prefix, command in role_metrics.get("commands", {}).items():
+                item = QtWidgets.QTreeWidgetItem(role_item)
+                item.setText(0, prefix)
+                item.setText(1, format(command["count"]))
+                item.setText(2, f"{command['bytes_written']} B")
+                item.setText(3, f"{command['bytes_read']} B")
+                item.setText(4, f"{command['p50'] * 1e3:.2f} ms")
+                item.setText(5, f"{command['p95'] * 1e3:.2f} ms")
+                item.setText(6, f"{command['max'] * 1e3:.2f} ms")
+                item.setText(7, f"{command['total']:.3f} s")
+                item.setText(8, format(command["timeouts"]))
+            role_item.setExpanded(True)
+        for column in range(self.tree_widget.columnCount()):
+            self.tree_widget.resizeColumnToContents(column)
@@ -33,6 +33,7 @@ ABOUT_TEXT: str = f"""
 
 class MainWindow(QtWidgets.QMainWindow):
     prepare_change_voltage = QtCore.Signal()
+    show_io_metrics = QtCore.Signal()
     role_browse_resources = QtCore.Signal(str)
     role_test_connection = QtCore.Signal(str)
 
@@ -74,6 +75,10 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         self.change_voltage_action.triggered.connect(self.prepare_change_voltage.emit)
 
+        self.io_metrics_action = QtGui.QAction("&I/O Metrics...")
+        self.io_metrics_action.setStatusTip("Show instrument I/O metrics")
+        self.io_metrics_action.triggered.connect(self.show_io_metrics.emit)
+
         self.contents_action = QtGui.QAction("&Contents")
         self.contents_action.setStatusTip("Open the user manual")
         self.contents_action.setShortcut(QtGui.QKeySequence("F1"))
@@ -206,6 +211,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.logging_action = self.logging_dock_widget.toggleViewAction()
         self.logging_action.setStatusTip("Toggle logging dock window")
         self.view_menu.addAction(self.logging_action)
+        self.view_menu.addAction(self.io_metrics_action)
 
         # Status bar
 
@@ -2,7 +2,8 @@ from collections.abc import Iterable
 
 from PySide6 import QtWidgets
 
-from ..panel import FSMState, InstrumentPanel, MethodParameter
+from ..panel import FSMState, InstrumentPanel, MethodParameter, WidgetParameter
+from ..widgets import ChannelGroupsWidget
 
 __all__ = ["K708BPanel"]
 
@@ -47,21 +48,39 @@ class K708BPanel(InstrumentPanel):
         channels_group_box_layout = QtWidgets.QVBoxLayout(self.channels_group_box)
         channels_group_box_layout.addWidget(self.slots_tab_widgets)
 
+        self.channel_groups_widget = ChannelGroupsWidget(self)
+
         # Layout
 
         left_layout = QtWidgets.QVBoxLayout()
         left_layout.addWidget(self.channels_group_box)
         left_layout.addStretch()
 
+        right_layout = QtWidgets.QVBoxLayout()
+        right_layout.addWidget(self.channel_groups_widget)
+        right_layout.addStretch()
+
         layout = QtWidgets.QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addLayout(left_layout)
+        layout.addLayout(right_layout)
 
         # Parameters
 
         self.bind_parameter(
             "channels", MethodParameter(self.closed_channels, self.set_closed_channels)
         )
+        self.bind_parameter(
+            "channel_groups",
+            MethodParameter(
+                self.channel_groups_widget.channel_groups,
+                self.channel_groups_widget.set_channel_groups,
+            ),
+        )
+        self.bind_parameter(
+            "channel_group_delay",
+            WidgetParameter(self.channel_groups_widget.delay_spin_box),
+        )
 
         self.restore_defaults()
 
@@ -79,7 +98,10 @@ class K708BPanel(InstrumentPanel):
 
     def restore_defaults(self) -> None:
         self.set_closed_channels([])
+        self.channel_groups_widget.set_channel_groups([])
+        self.channel_groups_widget.delay_spin_box.setValue(0.0)
 
     def set_fsm_state(self, state: FSMState) -> None:
         enabled = state == FSMState.IDLE
+        self.channel_groups_widget.setEnabled(enabled)
         self.slots_tab_widgets.setEnabled(enabled)
@@ -1,6 +1,7 @@
 from PySide6 import QtCore, QtWidgets
 
-from ..core.utils import get_bool, get_float, get_str
+from ..core.context import SweepMode
+from ..core.utils import get_bool, get_float, get_int, get_str
 
 TIMESTAMP_FORMATS: list[str] = [
     ".3f",
@@ -24,11 +25,13 @@ class PreferencesDialog(QtWidgets.QDialog):
         self.setMinimumSize(320, 240)
 
         self.output_widget = OutputWidget(self)
+        self.acquisition_widget = AcquisitionWidget(self)
         self.misc_widget = MiscWidget(self)
         self.logging_widget = LoggingWidget(self)
 
         self.tab_widget = QtWidgets.QTabWidget(self)
         self.tab_widget.addTab(self.output_widget, "Output")
+        self.tab_widget.addTab(self.acquisition_widget, "Acquisition")
         self.tab_widget.addTab(self.misc_widget, "Misc")
         self.tab_widget.addTab(self.logging_widget, "Logging")
 
@@ -47,11 +50,13 @@ class PreferencesDialog(QtWidgets.QDialog):
 
     def read_settings(self) -> None:
         self.output_widget.read_settings()
+        self.acquisition_widget.read_settings()
         self.misc_widget.read_settings()
         self.logging_widget.read_settings()
 
     def write_settings(self) -> None:
         self.output_widget.write_settings()
+        self.acquisition_widget.write_settings()
         self.misc_widget.write_settings()
         self.logging_widget.write_settings()
 
@@ -121,6 +126,362 @@ class OutputWidget(QtWidgets.QWidget):
         settings.setValue("writer/valueFormat", self.value_format())
 
 
+class AcquisitionWidget(QtWidgets.QWidget):
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self.parallel_check_box = QtWidgets.QCheckBox(self)
+        self.parallel_check_box.setText("Parallel Readout")
+        self.parallel_check_box.setToolTip(
+            "Read all instruments of a measurement point at the same time."
+        )
+
+        self.parallel_initialization_check_box = QtWidgets.QCheckBox(self)
+        self.parallel_initialization_check_box.setText("Parallel Initialization")
+        self.parallel_initialization_check_box.setToolTip(
+            "Identify, reset, clear and configure all instruments at the same "
+            "time, errors are reported for all instruments together."
+        )
+
+        self.keep_sessions_check_box = QtWidgets.QCheckBox(self)
+        self.keep_sessions_check_box.setText("Keep Sessions Open")
+        self.keep_sessions_check_box.setToolTip(
+            "Keep instrument sessions open between measurements and connection "
+            "tests, sessions are reopened if resource settings change."
+        )
+
+        self.force_configure_check_box = QtWidgets.QCheckBox(self)
+        self.force_configure_check_box.setText("Force Configure")
+        self.force_configure_check_box.setToolTip(
+            "Always configure instruments, else configuration is skipped for "
+            "open sessions if instrument options did not change."
+        )
+
+        self.write_io_metrics_check_box = QtWidgets.QCheckBox(self)
+        self.write_io_metrics_check_box.setText("Write I/O Metrics")
+        self.write_io_metrics_check_box.setToolTip(
+            "Write instrument I/O metrics to a JSON file next to the output "
+            "file at the end of each measurement."
+        )
+
+        self.record_trace_check_box = QtWidgets.QCheckBox(self)
+        self.record_trace_check_box.setText("Record I/O Trace")
+        self.record_trace_check_box.setToolTip(
+            "Record all instrument I/O with timestamps to a binary trace file "
+            "next to the output file, to be replayed without instruments."
+        )
+
+        self.asyncio_io_check_box = QtWidgets.QCheckBox(self)
+        self.asyncio_io_check_box.setText("Asyncio Socket/Serial I/O")
+        self.asyncio_io_check_box.setToolTip(
+            "Use non-blocking asyncio transports for TCPIP socket and serial "
+            "resources of the @py library, handled in a single I/O thread."
+        )
+
+        self.background_writer_check_box = QtWidgets.QCheckBox(self)
+        self.background_writer_check_box.setText("Background File Writer")
+        self.background_writer_check_box.setToolTip(
+            "Write output files in a background thread, rows are flushed in "
+            "batches so that slow disks do not stall the acquisition."
+        )
+
+        self.writer_fsync_check_box = QtWidgets.QCheckBox(self)
+        self.writer_fsync_check_box.setText("Sync Output File on Table End")
+        self.writer_fsync_check_box.setToolTip(
+            "Sync the output file to disk at the end of every table "
+            "(background file writer only)."
+        )
+
+        self.timeout_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.timeout_spin_box.setRange(1.0, 3600.0)
+        self.timeout_spin_box.setSuffix(" s")
+        self.timeout_spin_box.setDecimals(1)
+        self.timeout_spin_box.setSingleStep(1.0)
+        self.timeout_spin_box.setToolTip(
+            "Maximum time an instrument may take for a parallel reading."
+        )
+
+        self.sweep_mode_combo_box = QtWidgets.QComboBox(self)
+        self.sweep_mode_combo_box.addItem("Host", SweepMode.HOST)
+        self.sweep_mode_combo_box.addItem("Buffered", SweepMode.BUFFERED)
+        self.sweep_mode_combo_box.addItem("Script", SweepMode.SCRIPT)
+        self.sweep_mode_combo_box.setToolTip(
+            "Host: set and read every point individually. "
+            "Buffered: run the ramp as list sweep on the source instrument "
+            "(K2410, K2470, K2657A), only if no other instrument reads per point. "
+            "Script: run the ramp as TSP script on the source instrument (K2657A), "
+            "readings are streamed back while the script runs."
+        )
+
+        self.sweep_chunk_size_spin_box = QtWidgets.QSpinBox(self)
+        self.sweep_chunk_size_spin_box.setRange(1, 100)
+        self.sweep_chunk_size_spin_box.setToolTip(
+            "Number of points of a buffered or script sweep run at once, "
+            "compliance changes apply between chunks."
+        )
+
+        self.adaptive_settle_check_box = QtWidgets.QCheckBox(self)
+        self.adaptive_settle_check_box.setText("Adaptive Settle")
+        self.adaptive_settle_check_box.setToolTip(
+            "Replace the fixed waiting time by polling the current until it "
+            "converged within the settle tolerance."
+        )
+
+        self.settle_tolerance_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.settle_tolerance_spin_box.setRange(0.001, 100.0)
+        self.settle_tolerance_spin_box.setSuffix(" %")
+        self.settle_tolerance_spin_box.setDecimals(3)
+        self.settle_tolerance_spin_box.setSingleStep(0.1)
+        self.settle_tolerance_spin_box.setToolTip(
+            "Maximum relative change between consecutive current readings."
+        )
+
+        self.settle_interval_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.settle_interval_spin_box.setRange(0.01, 60.0)
+        self.settle_interval_spin_box.setSuffix(" s")
+        self.settle_interval_spin_box.setDecimals(2)
+        self.settle_interval_spin_box.setSingleStep(0.1)
+        self.settle_interval_spin_box.setToolTip("Interval between current readings.")
+
+        self.settle_min_time_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.settle_min_time_spin_box.setRange(0.0, 3600.0)
+        self.settle_min_time_spin_box.setSuffix(" s")
+        self.settle_min_time_spin_box.setDecimals(2)
+        self.settle_min_time_spin_box.setSingleStep(0.1)
+        self.settle_min_time_spin_box.setToolTip("Minimum settle time per point.")
+
+        self.settle_max_time_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.settle_max_time_spin_box.setRange(0.0, 3600.0)
+        self.settle_max_time_spin_box.setSuffix(" s")
+        self.settle_max_time_spin_box.setDecimals(2)
+        self.settle_max_time_spin_box.setSingleStep(1.0)
+        self.settle_max_time_spin_box.setToolTip("Maximum settle time per point.")
+
+        self.adaptive_stepping_check_box = QtWidgets.QCheckBox(self)
+        self.adaptive_stepping_check_box.setText("Adaptive Stepping")
+        self.adaptive_stepping_check_box.setToolTip(
+            "Increase the ramp step while the curve is linear and return to the "
+            "configured step where the slope changes."
+        )
+
+        self.adaptive_max_step_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.adaptive_max_step_spin_box.setRange(0.001, 1000.0)
+        self.adaptive_max_step_spin_box.setSuffix(" V")
+        self.adaptive_max_step_spin_box.setDecimals(3)
+        self.adaptive_max_step_spin_box.setSingleStep(1.0)
+        self.adaptive_max_step_spin_box.setToolTip("Maximum adaptive ramp step.")
+
+        self.adaptive_tolerance_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.adaptive_tolerance_spin_box.setRange(0.1, 100.0)
+        self.adaptive_tolerance_spin_box.setSuffix(" %")
+        self.adaptive_tolerance_spin_box.setDecimals(1)
+        self.adaptive_tolerance_spin_box.setSingleStep(1.0)
+        self.adaptive_tolerance_spin_box.setToolTip(
+            "Maximum relative deviation from the linear extrapolation before "
+            "the step is refined."
+        )
+
+        self.streaming_it_check_box = QtWidgets.QCheckBox(self)
+        self.streaming_it_check_box.setText("Streaming It")
+        self.streaming_it_check_box.setToolTip(
+            "Sample the current continuously into the instrument reading buffer "
+            "and read it back in chunks (K2410, K2470, K6514, K6517B)."
+        )
+
+        self.streaming_interval_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.streaming_interval_spin_box.setRange(0.0, 60.0)
+        self.streaming_interval_spin_box.setSuffix(" s")
+        self.streaming_interval_spin_box.setDecimals(3)
+        self.streaming_interval_spin_box.setSingleStep(0.001)
+        self.streaming_interval_spin_box.setToolTip(
+            "Delay between buffered samples, zero samples as fast as possible."
+        )
+
+        self.streaming_chunk_size_spin_box = QtWidgets.QSpinBox(self)
+        self.streaming_chunk_size_spin_box.setRange(1, 10000)
+        self.streaming_chunk_size_spin_box.setToolTip(
+            "Number of samples read back at once, limited by the instrument "
+            "buffer size."
+        )
+
+        layout = QtWidgets.QFormLayout(self)
+        layout.addWidget(self.parallel_check_box)
+        layout.addWidget(self.parallel_initialization_check_box)
+        layout.addWidget(self.keep_sessions_check_box)
+        layout.addWidget(self.force_configure_check_box)
+        layout.addWidget(self.write_io_metrics_check_box)
+        layout.addWidget(self.record_trace_check_box)
+        layout.addWidget(self.asyncio_io_check_box)
+        layout.addWidget(self.background_writer_check_box)
+        layout.addWidget(self.writer_fsync_check_box)
+        layout.addRow("Readout timeout", self.timeout_spin_box)
+        layout.addRow("Sweep mode", self.sweep_mode_combo_box)
+        layout.addRow("Sweep chunk size", self.sweep_chunk_size_spin_box)
+        layout.addWidget(self.adaptive_settle_check_box)
+        layout.addRow("Settle tolerance", self.settle_tolerance_spin_box)
+        layout.addRow("Settle interval", self.settle_interval_spin_box)
+        layout.addRow("Settle min. time", self.settle_min_time_spin_box)
+        layout.addRow("Settle max. time", self.settle_max_time_spin_box)
+        layout.addWidget(self.adaptive_stepping_check_box)
+        layout.addRow("Max. step", self.adaptive_max_step_spin_box)
+        layout.addRow("Step tolerance", self.adaptive_tolerance_spin_box)
+        layout.addWidget(self.streaming_it_check_box)
+        layout.addRow("Sample interval", self.streaming_interval_spin_box)
+        layout.addRow("Chunk size", self.streaming_chunk_size_spin_box)
+
+        self.read_settings()
+
+    def read_settings(self) -> None:
+        settings = QtCore.QSettings()
+
+        parallel = get_bool(settings.value("acquisition/parallel"), False)
+        parallel_initialization = get_bool(
+            settings.value("acquisition/parallel_initialization"), False
+        )
+        timeout = get_float(settings.value("acquisition/timeout"), 60.0)
+        sweep_mode = get_str(settings.value("acquisition/sweep_mode"), SweepMode.HOST)
+
+        self.parallel_check_box.setChecked(parallel)
+        self.parallel_initialization_check_box.setChecked(parallel_initialization)
+        keep_sessions = get_bool(settings.value("acquisition/keep_sessions"), False)
+        self.keep_sessions_check_box.setChecked(keep_sessions)
+        force_configure = get_bool(settings.value("acquisition/force_configure"), False)
+        self.force_configure_check_box.setChecked(force_configure)
+        write_io_metrics = get_bool(
+            settings.value("acquisition/write_io_metrics"), False
+        )
+        self.write_io_metrics_check_box.setChecked(write_io_metrics)
+        record_trace = get_bool(settings.value("acquisition/record_trace"), False)
+        self.record_trace_check_box.setChecked(record_trace)
+        asyncio_io = get_bool(settings.value("acquisition/asyncio_io"), False)
+        self.asyncio_io_check_box.setChecked(asyncio_io)
+        background_writer = get_bool(
+            settings.value("acquisition/background_writer"), False
+        )
+        self.background_writer_check_box.setChecked(background_writer)
+        writer_fsync = get_bool(settings.value("acquisition/writer_fsync"), False)
+        self.writer_fsync_check_box.setChecked(writer_fsync)
+        self.timeout_spin_box.setValue(timeout)
+        index = self.sweep_mode_combo_box.findData(sweep_mode)
+        self.sweep_mode_combo_box.setCurrentIndex(max(index, 0))
+        sweep_chunk_size = get_int(settings.value("acquisition/sweep_chunk_size"), 10)
+        self.sweep_chunk_size_spin_box.setValue(sweep_chunk_size)
+
+        adaptive_settle = get_bool(settings.value("acquisition/adaptive_settle"), False)
+        settle_tolerance = get_float(
+            settings.value("acquisition/settle_tolerance"), 1.0
+        )
+        settle_interval = get_float(settings.value("acquisition/settle_interval"), 0.1)
+        settle_min_time = get_float(settings.value("acquisition/settle_min_time"), 0.0)
+        settle_max_time = get_float(settings.value("acquisition/settle_max_time"), 10.0)
+
+        self.adaptive_settle_check_box.setChecked(adaptive_settle)
+        self.settle_tolerance_spin_box.setValue(settle_tolerance)
+        self.settle_interval_spin_box.setValue(settle_interval)
+        self.settle_min_time_spin_box.setValue(settle_min_time)
+        self.settle_max_time_spin_box.setValue(settle_max_time)
+
+        adaptive_stepping = get_bool(
+            settings.value("acquisition/adaptive_stepping"), False
+        )
+        adaptive_max_step = get_float(
+            settings.value("acquisition/adaptive_max_step"), 10.0
+        )
+        adaptive_tolerance = get_float(
+            settings.value("acquisition/adaptive_tolerance"), 5.0
+        )
+
+        self.adaptive_stepping_check_box.setChecked(adaptive_stepping)
+        self.adaptive_max_step_spin_box.setValue(adaptive_max_step)
+        self.adaptive_tolerance_spin_box.setValue(adaptive_tolerance)
+
+        streaming_it = get_bool(settings.value("acquisition/streaming_it"), False)
+        streaming_interval = get_float(
+            settings.value("acquisition/streaming_interval"), 0.0
+        )
+        streaming_chunk_size = get_int(
+            settings.value("acquisition/streaming_chunk_size"), 100
+        )
+
+        self.streaming_it_check_box.setChecked(streaming_it)
+        self.streaming_interval_spin_box.setValue(streaming_interval)
+        self.streaming_chunk_size_spin_box.setValue(streaming_chunk_size)
+
+    def write_settings(self) -> None:
+        settings = QtCore.QSettings()
+
+        settings.setValue("acquisition/parallel", self.parallel_check_box.isChecked())
+        settings.setValue(
+            "acquisition/parallel_initialization",
+            self.parallel_initialization_check_box.isChecked(),
+        )
+        settings.setValue(
+            "acquisition/keep_sessions", self.keep_sessions_check_box.isChecked()
+        )
+        settings.setValue(
+            "acquisition/force_configure", self.force_configure_check_box.isChecked()
+        )
+        settings.setValue(
+            "acquisition/write_io_metrics",
+            self.write_io_metrics_check_box.isChecked(),
+        )
+        settings.setValue(
+            "acquisition/record_trace", self.record_trace_check_box.isChecked()
+        )
+        settings.setValue(
+            "acquisition/asyncio_io", self.asyncio_io_check_box.isChecked()
+        )
+        settings.setValue(
+            "acquisition/background_writer",
+            self.background_writer_check_box.isChecked(),
+        )
+        settings.setValue(
+            "acquisition/writer_fsync", self.writer_fsync_check_box.isChecked()
+        )
+        settings.setValue("acquisition/timeout", self.timeout_spin_box.value())
+        settings.setValue(
+            "acquisition/sweep_mode", str(self.sweep_mode_combo_box.currentData())
+        )
+        settings.setValue(
+            "acquisition/sweep_chunk_size", self.sweep_chunk_size_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/adaptive_settle", self.adaptive_settle_check_box.isChecked()
+        )
+        settings.setValue(
+            "acquisition/settle_tolerance", self.settle_tolerance_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/settle_interval", self.settle_interval_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/settle_min_time", self.settle_min_time_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/settle_max_time", self.settle_max_time_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/adaptive_stepping",
+            self.adaptive_stepping_check_box.isChecked(),
+        )
+        settings.setValue(
+            "acquisition/adaptive_max_step", self.adaptive_max_step_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/adaptive_tolerance", self.adaptive_tolerance_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/streaming_it", self.streaming_it_check_box.isChecked()
+        )
+        settings.setValue(
+            "acquisition/streaming_interval", self.streaming_interval_spin_box.value()
+        )
+        settings.setValue(
+            "acquisition/streaming_chunk_size",
+            self.streaming_chunk_size_spin_box.value(),
+        )
+
+
 class MiscWidget(QtWidgets.QWidget):
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
@@ -144,9 +505,28 @@ class MiscWidget(QtWidgets.QWidget):
             "Voltage threshold below which the source is considered discharged."
         )
 
+        self.ramp_rate_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.ramp_rate_spin_box.setRange(0.1, 1000.0)
+        self.ramp_rate_spin_box.setSuffix(" V/s")
+        self.ramp_rate_spin_box.setDecimals(1)
+        self.ramp_rate_spin_box.setSingleStep(1.0)
+        self.ramp_rate_spin_box.setToolTip(
+            "Voltage rate for ramps to begin, bias and zero. Uses the "
+            "instrument's native ramp if supported (K2470, K2657A)."
+        )
+
+        self.ramp_step_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.ramp_step_spin_box.setRange(0.1, 100.0)
+        self.ramp_step_spin_box.setSuffix(" V")
+        self.ramp_step_spin_box.setDecimals(1)
+        self.ramp_step_spin_box.setSingleStep(1.0)
+        self.ramp_step_spin_box.setToolTip("Maximum voltage step for ramps.")
+
         layout = QtWidgets.QFormLayout(self)
         layout.addRow("Discharge timeout", self.discharge_timeout_spin_box)
         layout.addRow("Discharge threshold", self.discharge_threshold_spin_box)
+        layout.addRow("Ramp rate", self.ramp_rate_spin_box)
+        layout.addRow("Ramp step", self.ramp_step_spin_box)
 
         self.read_settings()
 
@@ -159,6 +539,12 @@ class MiscWidget(QtWidgets.QWidget):
         self.discharge_timeout_spin_box.setValue(discharge_timeout)
         self.discharge_threshold_spin_box.setValue(discharge_threshold)
 
+        ramp_rate = get_float(settings.value("misc/ramp_rate"), 20.0)
+        ramp_step = get_float(settings.value("misc/ramp_step"), 5.0)
+
+        self.ramp_rate_spin_box.setValue(ramp_rate)
+        self.ramp_step_spin_box.setValue(ramp_step)
+
     def write_settings(self) -> None:
         settings = QtCore.QSettings()
 
@@ -168,6 +554,8 @@ class MiscWidget(QtWidgets.QWidget):
         settings.setValue(
             "misc/discharge_threshold", self.discharge_threshold_spin_box.value()
         )
+        settings.setValue("misc/ramp_rate", self.ramp_rate_spin_box.value())
+        settings.setValue("misc/ramp_step", self.ramp_step_spin_box.value())
 
 
 class LoggingWidget(QtWidgets.QWidget):
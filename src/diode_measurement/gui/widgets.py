@@ -1,9 +1,11 @@
 import traceback
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 
 from PySide6 import QtWidgets
 
-__all__ = ["show_exception"]
+from ..core.switch import format_channel_groups, parse_channel_groups
+
+__all__ = ["ChannelGroupsWidget", "show_exception"]
 
 
 def show_exception(
@@ -36,3 +38,37 @@ def show_exception(
     if on_finished is not None:
         message_box.finished.connect(on_finished)
     message_box.open()
+
+
+class ChannelGroupsWidget(QtWidgets.QGroupBox):
+    """Channel groups measured one after another at every voltage step."""
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__("Channel Groups", parent)
+
+        self.groups_text_edit = QtWidgets.QPlainTextEdit(self)
+        self.groups_text_edit.setPlaceholderText("1A01, 1B01\n1A02, 1B02")
+        self.groups_text_edit.setToolTip(
+            "One channel group per line, channels separated by comma. If groups "
+            "are set every voltage step is measured once per group."
+        )
+
+        self.delay_label = QtWidgets.QLabel("Delay")
+
+        self.delay_spin_box = QtWidgets.QDoubleSpinBox(self)
+        self.delay_spin_box.setStatusTip("Waiting time after switching a group")
+        self.delay_spin_box.setRange(0.0, 60.0)
+        self.delay_spin_box.setDecimals(3)
+        self.delay_spin_box.setSingleStep(0.1)
+        self.delay_spin_box.setSuffix(" s")
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.groups_text_edit)
+        layout.addWidget(self.delay_label)
+        layout.addWidget(self.delay_spin_box)
+
+    def channel_groups(self) -> list[list[str]]:
+        return parse_channel_groups(self.groups_text_edit.toPlainText())
+
+    def set_channel_groups(self, groups: Iterable[Iterable[str]]) -> None:
+        self.groups_text_edit.setPlainText(format_channel_groups(groups, "\n"))
@@ -1,11 +1,14 @@
 import contextlib
+import json
 import logging
 import os
 from collections.abc import Callable
 from dataclasses import dataclass
 
 from ..core.measurement import Measurement
-from ..writer import Writer
+from ..core.switch import channel_groups
+from ..core.trace import TraceRecorder
+from ..writer import FlushPolicy, Writer
 
 __all__ = ["MeasurementJob"]
 
@@ -29,6 +32,10 @@ class MeasurementJob:
             for role, role_config in self.measurement.state.roles.items()
             if role_config.enabled
         ]
+        writer.settle_time_enabled = self.measurement.state.adaptive_settle
+        writer.channel_group_enabled = bool(channel_groups(self.measurement.state))
+        if self.measurement.state.background_writer:
+            writer.start(FlushPolicy(fsync=self.measurement.state.writer_fsync))
         return writer
 
     def __call__(self) -> None:
@@ -51,5 +58,31 @@ class MeasurementJob:
 
                 fp = stack.enter_context(open(filename, "w", newline=""))
                 writer = self.create_writer(fp)
+                stack.callback(writer.close)
                 measurement.add_writer(writer)
+                if measurement.state.record_trace:
+                    logger.info("recording I/O trace: %s", trace_filename(filename))
+                    trace_fp = stack.enter_context(open(trace_filename(filename), "wb"))
+                    measurement.station.trace_recorder = TraceRecorder(trace_fp)
+                    stack.callback(measurement.station.detach_trace)
             measurement.run()
+        if filename and measurement.state.write_io_metrics:
+            self.write_io_metrics(io_metrics_filename(filename))
+
+    def write_io_metrics(self, filename: str) -> None:
+        logger.info("writing I/O metrics: %s", filename)
+        try:
+            with open(filename, "w") as fp:
+                json.dump(self.measurement.io_metrics, fp, indent=2)
+        except OSError as exc:
+            logger.error("failed to write I/O metrics: %s", exc)
+
+
+def io_metrics_filename(filename: str) -> str:
+    """Return I/O metrics filename for output filename."""
+    return f"{os.path.splitext(filename)[0]}.io.json"
+
+
+def trace_filename(filename: str) -> str:
+    """Return I/O trace filename for output filename."""
+    return f"{os.path.splitext(filename)[0]}.trace"
@@ -1,10 +1,13 @@
+import contextlib
 import logging
 import time
 from collections.abc import Callable
 from dataclasses import dataclass
 
+from ..core.pool import SessionPool
 from ..core.resource import Resource, ResourceConfig, list_resources
 from ..drivers import K4215Adapter, driver_factory
+from ..sim import SIM_LIBRARY, create_simulated_resource
 
 __all__ = [
     "TestConnectionJob",
@@ -20,9 +23,18 @@ class TestConnectionJob:
     model: str
     resource_config: ResourceConfig
     on_result_ready: Callable[[str], None]
+    session_pool: SessionPool | None = None
 
     def __call__(self) -> None:
-        with Resource(self.resource_config) as res:
+        with contextlib.ExitStack() as stack:
+            if self.resource_config.visa_library == SIM_LIBRARY:
+                resource = create_simulated_resource(self.resource_config, self.model)
+            else:
+                resource = Resource(self.resource_config)
+            if self.session_pool is not None:
+                res = stack.enter_context(self.session_pool.lease(resource))
+            else:
+                res = stack.enter_context(resource)
             instr = driver_factory(self.model)(res)
             identity = instr.identify()
             self.on_result_ready(identity)
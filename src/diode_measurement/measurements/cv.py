@@ -1,13 +1,17 @@
 import logging
 import math
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
+from typing import Any
 
 from comet.utils import inverse_square
 
 from ..core.events import Reading
 from ..core.measurement import RangeMeasurement, State
 from ..core.role import Role
+from ..core.switch import channel_groups, format_channel_groups
 from ..writer import Writer, safe_format
 
 __all__ = ["CVMeasurement"]
@@ -23,6 +27,8 @@ class CVReading(Reading):
     c_lcr: float
     c2_lcr: float
     r_lcr: float
+    settle_time: float = math.nan
+    channel_group: int | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -55,11 +61,19 @@ class CVMeasurement(RangeMeasurement):
         smu = self.station.instruments.get(Role.SMU)
         lcr = self.station.instruments.get(Role.LCR)
         dmm = self.station.instruments.get(Role.DMM)
-        c_lcr, r_lcr = lcr.measure_impedance() if lcr else (math.nan, math.nan)
+        tasks: dict[Role, Callable[[], Any]] = {}
+        if lcr:
+            tasks[Role.LCR] = lcr.measure_impedance
+        if smu:
+            tasks[Role.SMU] = partial(self.measure_iv, smu)
+        if dmm:
+            tasks[Role.DMM] = dmm.measure_temperature
+        results = self.read_instruments(tasks)
+        c_lcr, r_lcr = results.get(Role.LCR, (math.nan, math.nan))
         # Calcualte 1c^2 as c2_lcr
         c2_lcr = inverse_square(c_lcr) if math.isfinite(c_lcr) else math.nan
-        i_smu, v_smu = smu.measure_iv() if smu else (math.nan, math.nan)
-        t_dmm = dmm.measure_temperature() if dmm else math.nan
+        i_smu, v_smu = results.get(Role.SMU, (math.nan, math.nan))
+        t_dmm = results.get(Role.DMM, math.nan)
         tcu_temperature = self.tcu.temperature()
         tcu_humidity = self.tcu.humidity()
 
@@ -74,9 +88,14 @@ class CVMeasurement(RangeMeasurement):
             t_dmm=t_dmm,
             tcu_temperature=tcu_temperature,
             tcu_humidity=tcu_humidity,
+            settle_time=self.settle_time,
+            channel_group=self.channel_group,
         )
 
-    def acquire_reading(self, source_voltage: float) -> None:
+    def ramp_feedback_value(self, reading: Any) -> float:
+        return reading.c2_lcr
+
+    def acquire_reading(self, source_voltage: float) -> CVReading:
         reading: CVReading = self.acquire_cv_reading_data(source_voltage)
         self.submit_update(
             {
@@ -87,6 +106,7 @@ class CVMeasurement(RangeMeasurement):
             }
         )
         self.on_cv_reading(reading)
+        return reading
 
 
 def write_meta(writer: Writer, state: State) -> None:
@@ -110,6 +130,9 @@ def write_meta(writer: Writer, state: State) -> None:
         safe_format(state.current_compliance, writer.value_format),
     )
     write_meta_lcr(writer, state)
+    groups = channel_groups(state)
+    if groups:
+        writer.write_tag("channel_groups", format_channel_groups(groups))
     writer.flush()
 
 
@@ -147,6 +170,8 @@ def write_cv_reading(writer: Writer, reading: CVReading) -> None:
             ]
             + writer.dmm_header()
             + writer.tcu_header()
+            + writer.channel_group_header()
+            + writer.settle_header()
         )
         writer.write_table_header(header)
         writer.reset_timestamp_offset(timestamp_utc)
@@ -162,6 +187,8 @@ def write_cv_reading(writer: Writer, reading: CVReading) -> None:
         ]
         + writer.dmm_data(reading)
         + writer.tcu_data(reading)
+        + writer.channel_group_data(reading)
+        + writer.settle_data(reading)
     )
     writer.write_table_row(row)
     writer.flush()
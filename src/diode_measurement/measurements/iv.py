@@ -1,12 +1,17 @@
 import logging
 import math
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
+from typing import Any
 
 from comet.estimate import Estimate
 
+from ..core.driver import BufferedCurrentMeasurable
 from ..core.measurement import IVReading, RangeMeasurement, State
 from ..core.role import Role
+from ..core.switch import channel_groups, format_channel_groups
 from ..writer import Writer, safe_format
 
 __all__ = ["IVMeasurement"]
@@ -55,10 +60,20 @@ class IVMeasurement(RangeMeasurement):
         elm = self.station.instruments.get(Role.ELM)
         elm2 = self.station.instruments.get(Role.ELM2)
         dmm = self.station.instruments.get(Role.DMM)
-        i_smu, v_smu = smu.measure_iv() if smu else (math.nan, math.nan)
-        i_elm = elm.measure_i() if elm else math.nan
-        i_elm2 = elm2.measure_i() if elm2 else math.nan
-        t_dmm = dmm.measure_temperature() if dmm else math.nan
+        tasks: dict[Role, Callable[[], Any]] = {}
+        if smu:
+            tasks[Role.SMU] = partial(self.measure_iv, smu)
+        if elm:
+            tasks[Role.ELM] = elm.measure_i
+        if elm2:
+            tasks[Role.ELM2] = elm2.measure_i
+        if dmm:
+            tasks[Role.DMM] = dmm.measure_temperature
+        results = self.read_instruments(tasks)
+        i_smu, v_smu = results.get(Role.SMU, (math.nan, math.nan))
+        i_elm = results.get(Role.ELM, math.nan)
+        i_elm2 = results.get(Role.ELM2, math.nan)
+        t_dmm = results.get(Role.DMM, math.nan)
         tcu_temperature = self.tcu.temperature()
         tcu_humidity = self.tcu.humidity()
 
@@ -74,9 +89,11 @@ class IVMeasurement(RangeMeasurement):
             t_dmm=t_dmm,
             tcu_temperature=tcu_temperature,
             tcu_humidity=tcu_humidity,
+            settle_time=self.settle_time,
+            channel_group=self.channel_group,
         )
 
-    def acquire_reading(self, source_voltage: float) -> None:
+    def acquire_reading(self, source_voltage: float) -> IVReading:
         reading: IVReading = self.acquire_reading_data(source_voltage)
         logger.info(reading)
         self.submit_update(
@@ -89,8 +106,201 @@ class IVMeasurement(RangeMeasurement):
             }
         )
         self.on_iv_reading(reading)
+        return reading
+
+    def supports_buffered_sweep(self) -> bool:
+        per_point_roles = {Role.SMU, Role.ELM, Role.ELM2} & set(
+            self.station.instruments
+        )
+        return self.state.source_role == Role.SMU and per_point_roles == {Role.SMU}
+
+    def acquire_sweep_readings(
+        self,
+        voltages: list[float],
+        results: list[tuple[float, float, float]],
+        t_first: float,
+    ) -> None:
+        # Slow readings are taken once per chunk
+        dmm = self.station.instruments.get(Role.DMM)
+        t_dmm = dmm.measure_temperature() if dmm else math.nan
+        tcu_temperature = self.tcu.temperature()
+        tcu_humidity = self.tcu.humidity()
+
+        # Instrument timestamps are relative to the first reading
+        reading: IVReading | None = None
+        for voltage, (t, i_smu, v_smu) in zip(voltages, results, strict=True):
+            reading = IVReading(
+                timestamp=t_first + t,
+                voltage=voltage,
+                v_smu=v_smu,
+                v_smu2=math.nan,
+                i_smu2=math.nan,
+                i_smu=i_smu,
+                i_elm=math.nan,
+                i_elm2=math.nan,
+                t_dmm=t_dmm,
+                tcu_temperature=tcu_temperature,
+                tcu_humidity=tcu_humidity,
+                settle_time=math.nan,  # not measured by the instrument
+            )
+            logger.info(reading)
+            self.on_iv_reading(reading)
+
+        if reading is not None:
+            self.submit_update(
+                {
+                    "smu_voltage": reading.v_smu,
+                    "smu_current": reading.i_smu,
+                    "dmm_temperature": reading.t_dmm,
+                }
+            )
+
+    def streaming_instrument(self) -> tuple[Role, Any] | None:
+        """Return role and instrument used for streaming It readings, the
+        electrometer is preferred over the source meter.
+        """
+        if not self.state.streaming_it:
+            return None
+        for role in (Role.ELM, Role.SMU):
+            instrument = self.station.instruments.get(role)
+            if instrument is None:
+                continue
+            if isinstance(instrument, BufferedCurrentMeasurable):
+                return role, instrument
+            logger.warning(
+                "Instrument %s does not support buffered readings, using polled "
+                "It readings.",
+                role,
+            )
+            return None
+        return None
+
+    def acquire_streaming_readings(self, role: Role, instrument: Any) -> None:
+        """Continuously sample current into the instrument buffer and read new
+        samples incrementally, at most one chunk per poll. Slow readings are
+        taken once per poll.
+        """
+        try:
+            self.stream_readings(role, instrument)
+        finally:
+            instrument.stop_i_buffered()
+
+    def stream_readings(self, role: Role, instrument: Any) -> None:
+        chunk_size = max(
+            1, min(instrument.max_buffer_points, self.state.streaming_chunk_size)
+        )
+        interval = self.state.streaming_interval
+        poll_interval = min(max(interval, 0.050), 1.0)
+
+        estimate = Estimate(1)
+
+        self.update_progress(0, 0, 0)
+
+        voltage = self.get_source_voltage()
+
+        instrument.start_i_buffered(interval)
+        t_start = time.time()
+        t_poll = t_start
+        # Sampling gaps of all buffers and of the buffers since last start
+        gaps = 0
+        buffer_gaps = 0
+        self.submit_update({"streaming_gaps": gaps})
+
+        while not self.context.stop_requested:
+            self.context.process_inbox()
+            self.tcu.ensure_setpoint()
+
+            samples = instrument.read_i_buffered(chunk_size)
+            if instrument.i_buffered_gaps() > buffer_gaps:
+                gaps += instrument.i_buffered_gaps() - buffer_gaps
+                buffer_gaps = instrument.i_buffered_gaps()
+                logger.warning(
+                    "%s: sampling gap while re-arming the reading buffer",
+                    role.upper(),
+                )
+                self.submit_update({"streaming_gaps": gaps})
+            if not samples:
+                self.context.wait(poll_interval)
+                continue
+            t_begin, t_poll = t_poll, time.time()
+
+            smu = self.station.instruments.get(Role.SMU)
+            elm2 = self.station.instruments.get(Role.ELM2)
+            dmm = self.station.instruments.get(Role.DMM)
+            tasks: dict[Role, Callable[[], Any]] = {}
+            if smu and role != Role.SMU:
+                tasks[Role.SMU] = partial(self.measure_iv, smu)
+            if elm2:
+                tasks[Role.ELM2] = elm2.measure_i
+            if dmm:
+                tasks[Role.DMM] = dmm.measure_temperature
+            results = self.read_instruments(tasks)
+            i_smu, v_smu = results.get(Role.SMU, (math.nan, math.nan))
+            i_elm2 = results.get(Role.ELM2, math.nan)
+            t_dmm = results.get(Role.DMM, math.nan)
+            tcu_temperature = self.tcu.temperature()
+            tcu_humidity = self.tcu.humidity()
+
+            reading: IVReading | None = None
+            for t, current in samples:
+                reading = IVReading(
+                    timestamp=t_start + t,
+                    voltage=voltage,
+                    v_smu=v_smu,
+                    v_smu2=math.nan,
+                    i_smu2=math.nan,
+                    i_smu=current if role == Role.SMU else i_smu,
+                    i_elm=current if role == Role.ELM else math.nan,
+                    i_elm2=i_elm2,
+                    t_dmm=t_dmm,
+                    tcu_temperature=tcu_temperature,
+                    tcu_humidity=tcu_humidity,
+                    channel_group=self.channel_group,
+                )
+                self.on_it_reading(reading)
+
+            if reading is not None:
+                logger.info(reading)
+                self.submit_update(
+                    {
+                        "smu_voltage": reading.v_smu,
+                        "smu_current": reading.i_smu,
+                        "elm_current": reading.i_elm,
+                        "elm2_current": reading.i_elm2,
+                        "dmm_temperature": reading.t_dmm,
+                    }
+                )
+
+            self.check_current_compliance()
+
+            # Sampling is paused while applying changes, instruments do not
+            # accept settings while the trigger model is running.
+            runtime_state = self.context.runtime_state
+            if (
+                runtime_state.pending.voltage_change is not None
+                or self.current_compliance != runtime_state.current_compliance
+            ):
+                instrument.stop_i_buffered()
+                self.update_current_compliance()
+                self.apply_change_voltage()
+                voltage = self.get_source_voltage()
+                instrument.start_i_buffered(interval)
+                t_start = t_poll = time.time()
+                buffer_gaps = 0
+
+            rate = len(samples) / max(t_poll - t_begin, 1e-3)
+            self.update_estimate_message_continuous(
+                f"Streaming {rate:.1f} samples/s...", estimate
+            )
+
+            estimate.advance()
 
     def acquire_continuous_reading(self) -> None:
+        streaming = self.streaming_instrument()
+        if streaming is not None:
+            self.acquire_streaming_readings(*streaming)
+            return
+
         t = time.monotonic()
         interval = 1.0
 
@@ -160,6 +370,9 @@ def write_meta(writer: Writer, state: State) -> None:
         "current_compliance[A]",
         safe_format(state.current_compliance, writer.value_format),
     )
+    groups = channel_groups(state)
+    if groups:
+        writer.write_tag("channel_groups", format_channel_groups(groups))
     writer.flush()
 
 
@@ -178,6 +391,8 @@ def write_iv_reading(writer: Writer, reading: IVReading) -> None:
             ]
             + writer.dmm_header()
             + writer.tcu_header()
+            + writer.channel_group_header()
+            + writer.settle_header()
         )
         writer.write_table_header(header)
         writer.reset_timestamp_offset(timestamp_utc)
@@ -192,6 +407,8 @@ def write_iv_reading(writer: Writer, reading: IVReading) -> None:
         ]
         + writer.dmm_data(reading)
         + writer.tcu_data(reading)
+        + writer.channel_group_data(reading)
+        + writer.settle_data(reading)
     )
     writer.write_table_row(row)
     writer.flush()
@@ -212,6 +429,7 @@ def write_it_reading(writer: Writer, reading: IVReading) -> None:
             ]
             + writer.dmm_header()
             + writer.tcu_header()
+            + writer.channel_group_header()
         )
         writer.write_table_header(header)
         writer.reset_timestamp_offset(timestamp_utc)
@@ -226,6 +444,7 @@ def write_it_reading(writer: Writer, reading: IVReading) -> None:
         ]
         + writer.dmm_data(reading)
         + writer.tcu_data(reading)
+        + writer.channel_group_data(reading)
     )
     writer.write_table_row(row)
     writer.flush()
@@ -1,12 +1,16 @@
 import logging
 import math
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
+from typing import Any
 
 from comet.estimate import Estimate
 
 from ..core.measurement import IVReading, RangeMeasurement, State
 from ..core.role import Role
+from ..core.switch import channel_groups, format_channel_groups
 from ..writer import Writer, safe_format
 
 __all__ = ["IVBiasMeasurement"]
@@ -54,11 +58,23 @@ class IVBiasMeasurement(RangeMeasurement):
         elm = self.station.instruments.get(Role.ELM)
         elm2 = self.station.instruments.get(Role.ELM2)
         dmm = self.station.instruments.get(Role.DMM)
-        i_smu, v_smu = smu.measure_iv() if smu else (math.nan, math.nan)
-        i_smu2, v_smu2 = smu2.measure_iv() if smu2 else (math.nan, math.nan)
-        i_elm = elm.measure_i() if elm else math.nan
-        i_elm2 = elm2.measure_i() if elm2 else math.nan
-        t_dmm = dmm.measure_temperature() if dmm else math.nan
+        tasks: dict[Role, Callable[[], Any]] = {}
+        if smu:
+            tasks[Role.SMU] = partial(self.measure_iv, smu)
+        if smu2:
+            tasks[Role.SMU2] = partial(self.measure_iv, smu2)
+        if elm:
+            tasks[Role.ELM] = elm.measure_i
+        if elm2:
+            tasks[Role.ELM2] = elm2.measure_i
+        if dmm:
+            tasks[Role.DMM] = dmm.measure_temperature
+        results = self.read_instruments(tasks)
+        i_smu, v_smu = results.get(Role.SMU, (math.nan, math.nan))
+        i_smu2, v_smu2 = results.get(Role.SMU2, (math.nan, math.nan))
+        i_elm = results.get(Role.ELM, math.nan)
+        i_elm2 = results.get(Role.ELM2, math.nan)
+        t_dmm = results.get(Role.DMM, math.nan)
         tcu_temperature = self.tcu.temperature()
         tcu_humidity = self.tcu.humidity()
 
@@ -74,9 +90,11 @@ class IVBiasMeasurement(RangeMeasurement):
             t_dmm=t_dmm,
             tcu_temperature=tcu_temperature,
             tcu_humidity=tcu_humidity,
+            settle_time=self.settle_time,
+            channel_group=self.channel_group,
         )
 
-    def acquire_reading(self, source_voltage: float) -> None:
+    def acquire_reading(self, source_voltage: float) -> IVReading:
         reading: IVReading = self.acquire_reading_data(source_voltage)
         logger.info(reading)
         self.submit_update(
@@ -91,6 +109,7 @@ class IVBiasMeasurement(RangeMeasurement):
             }
         )
         self.on_iv_reading(reading)
+        return reading
 
     def acquire_continuous_reading(self) -> None:
         t: float = time.monotonic()
@@ -171,6 +190,9 @@ def write_meta(writer: Writer, state: State) -> None:
         "current_compliance[A]",
         safe_format(state.current_compliance, writer.value_format),
     )
+    groups = channel_groups(state)
+    if groups:
+        writer.write_tag("channel_groups", format_channel_groups(groups))
     writer.flush()
 
 
@@ -191,6 +213,8 @@ def write_iv_bias_reading(writer: Writer, reading: IVReading) -> None:
             ]
             + writer.dmm_header()
             + writer.tcu_header()
+            + writer.channel_group_header()
+            + writer.settle_header()
         )
         writer.write_table_header(header)
         writer.reset_timestamp_offset(timestamp_utc)
@@ -207,6 +231,8 @@ def write_iv_bias_reading(writer: Writer, reading: IVReading) -> None:
         ]
         + writer.dmm_data(reading)
         + writer.tcu_data(reading)
+        + writer.channel_group_data(reading)
+        + writer.settle_data(reading)
     )
     writer.write_table_row(row)
     writer.flush()
@@ -229,6 +255,7 @@ def write_it_bias_reading(writer: Writer, reading: IVReading) -> None:
             ]
             + writer.dmm_header()
             + writer.tcu_header()
+            + writer.channel_group_header()
         )
         writer.write_table_header(header)
         writer.reset_timestamp_offset(timestamp_utc)
@@ -245,6 +272,7 @@ def write_it_bias_reading(writer: Writer, reading: IVReading) -> None:
         ]
         + writer.dmm_data(reading)
         + writer.tcu_data(reading)
+        + writer.channel_group_data(reading)
     )
     writer.write_table_row(row)
     writer.flush()
@@ -76,6 +76,12 @@ class StateEvent:
         return asdict(controller.snapshot())
 
 
+@dataclass(frozen=True, slots=True)
+class IOMetricsEvent:
+    def __call__(self, controller: Controller) -> dict[str, Any]:
+        return controller.io_metrics()
+
+
 @dataclass(frozen=True, slots=True)
 class InstrumentGetEvent:
     instrument: str
@@ -159,6 +165,7 @@ class RPCHandler:
         self.dispatcher["stop"] = self.on_stop
         self.dispatcher["change_voltage"] = self.on_change_voltage
         self.dispatcher["state"] = self.on_state
+        self.dispatcher["io_metrics"] = self.on_io_metrics
         self.dispatcher["instrument.get"] = self.on_instrument_get
         self.dispatcher["instrument.update"] = self.on_instrument_update
         self.manager = jsonrpc.JSONRPCResponseManager()
@@ -233,6 +240,9 @@ class RPCHandler:
         result = self.event_handler.notify(StateEvent()).result(self.timeout)
         return json_dict(result)
 
+    def on_io_metrics(self) -> dict[str, Any]:
+        return self.event_handler.notify(IOMetricsEvent()).result(self.timeout)
+
     def on_instrument_get(self, instrument: str) -> dict[str, Any]:
         event = InstrumentGetEvent(instrument=instrument)
         return self.event_handler.notify(event).result(self.timeout)
@@ -0,0 +1,36 @@
+"""Simulated instruments connected to a sensor model.
+
+Instruments are simulated by resource names of format `sim:<name>`, the
+command set is selected by the instrument model of the role.
+"""
+
+from ..core.resource import ResourceConfig
+from .instruments import create_simulator, simulator_registry
+from .model import DiodeModel, SimulatedBench
+from .resource import SimulatedResource
+
+__all__ = [
+    "SIM_LIBRARY",
+    "DiodeModel",
+    "SimulatedBench",
+    "SimulatedResource",
+    "default_bench",
+    "simulator_registry",
+    "create_simulator",
+    "create_simulated_resource",
+]
+
+SIM_LIBRARY: str = "@sim"
+
+default_bench = SimulatedBench()
+
+
+def create_simulated_resource(
+    resource_config: ResourceConfig,
+    model: str,
+    bench: SimulatedBench | None = None,
+    time_scale: float = 1.0,
+) -> SimulatedResource:
+    """Return resource connected to a new simulated instrument of model."""
+    instrument = create_simulator(model, bench or default_bench)
+    return SimulatedResource(resource_config, instrument, time_scale=time_scale)
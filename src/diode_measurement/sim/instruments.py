@@ -0,0 +1,1177 @@
+import logging
+import math
+import re
+from collections import deque
+from collections.abc import Callable
+from typing import ClassVar
+
+from .model import SimulatedBench
+
+__all__ = [
+    "SimulatedTimeout",
+    "SimulatedInstrument",
+    "simulator_registry",
+    "create_simulator",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedTimeout(Exception):
+    """Raised when reading from a simulated instrument without pending
+    output, like a VISA timeout.
+    """
+
+
+def format_value(value: float) -> str:
+    return format(value, "+.6E")
+
+
+def parse_bool(value: str) -> bool:
+    return value.strip().upper() in {"1", "ON", "TRUE"}
+
+
+def parse_float(value: str, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def split_list(value: str) -> list[str]:
+    return [item.strip().strip('"') for item in value.split(",")]
+
+
+class SimulatedInstrument:
+    """Base class of simulated instruments.
+
+    Messages written are handled immediately, responses are queued and
+    returned by `read()`. Time consuming operations add to `busy`, the time
+    charged by the simulated resource for the current operation in addition
+    to the communication latency.
+    """
+
+    identity: str = "Simulated Instrument"
+    latency: float = 0.002  # s per message
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        self.bench: SimulatedBench = bench
+        self.busy: float = 0.0
+        self.errors: deque[tuple[int, str]] = deque()
+        self.output: deque[tuple[float, str]] = deque()
+        self.reset()
+
+    def reset(self) -> None:
+        self.errors.clear()
+
+    def write(self, message: str) -> None:
+        for response in self.handle(message):
+            self.output.append((0.0, response))
+
+    def read(self) -> str:
+        if not self.output:
+            raise SimulatedTimeout("no pending output")
+        delay, response = self.output.popleft()
+        self.busy += delay
+        return response
+
+    def query(self, message: str) -> str:
+        self.write(message)
+        return self.read()
+
+    def clear(self) -> None:
+        """Device clear, discard pending output."""
+        self.output.clear()
+
+    def take_busy(self) -> float:
+        busy, self.busy = self.busy, 0.0
+        return busy
+
+    def push_error(self, code: int, message: str) -> None:
+        logger.warning("%s: %d, %s", type(self).__name__, code, message)
+        self.errors.append((code, message))
+
+    def handle(self, message: str) -> list[str]:
+        """Handle message, return responses."""
+        raise NotImplementedError
+
+
+class SourceMixin:
+    """Voltage source connected to the simulated sensor."""
+
+    bench: SimulatedBench
+    default_compliance: float = 0.0
+
+    def reset_source(self) -> None:
+        self.output_enabled: bool = False
+        self.voltage_level: float = 0.0
+        self.current_compliance: float = self.default_compliance
+        self.update_source()
+
+    def update_source(self) -> None:
+        if self.output_enabled:
+            self.bench.set_source(id(self), self.voltage_level, self.current_compliance)
+        else:
+            self.bench.remove_source(id(self))
+
+    def set_output_enabled(self, enabled: bool) -> None:
+        self.output_enabled = enabled
+        self.update_source()
+
+    def set_voltage_level(self, level: float) -> None:
+        self.voltage_level = level
+        self.update_source()
+
+    def set_current_compliance(self, level: float) -> None:
+        self.current_compliance = abs(level)
+        self.update_source()
+
+    def source_voltage(self) -> float:
+        return self.voltage_level if self.output_enabled else 0.0
+
+    def read_current(self) -> tuple[float, bool]:
+        """Return measured current and compliance state."""
+        if not self.output_enabled:
+            current = self.bench.noise(self.bench.model.current_noise_floor)
+            return current, False
+        return self.bench.read_current()
+
+
+class TraceMixin:
+    """Trace buffer filled in the background while armed.
+
+    Readings of an armed trace are acquired on demand when the buffer is
+    queried, charging at most `trace_chunk_time` of sampling per query.
+    """
+
+    busy: float
+    trace_chunk_time: float = 0.25  # s
+
+    def reset_trace(self) -> None:
+        self.trace_pending: int = 0
+        self.trace_period: float = 0.0
+        self.trace_timestamp: float = 0.0
+
+    def arm_trace(self, count: int, period: float) -> None:
+        self.trace_pending = count
+        self.trace_period = period
+        self.trace_timestamp = 0.0
+
+    def abort(self) -> None:
+        self.trace_pending = 0
+
+    def update_trace(self) -> None:
+        elapsed = 0.0
+        while self.trace_pending > 0 and elapsed < self.trace_chunk_time:
+            self.acquire_trace(self.trace_timestamp)
+            self.trace_timestamp += self.trace_period
+            elapsed += self.trace_period
+            self.trace_pending -= 1
+
+    def acquire_trace(self, timestamp: float) -> None:
+        raise NotImplementedError
+
+
+class ScpiInstrument(SimulatedInstrument):
+    """SCPI instrument with common commands and an error queue.
+
+    Commands are routed by regular expressions matched against the header
+    (without leading colon). Unknown settings are stored and returned by the
+    matching query, unknown queries raise a timeout and push an error.
+    """
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        self.routes: list[tuple[re.Pattern, Callable[[str], str | None]]] = []
+        self.settings: dict[str, str] = {}
+        self.defaults: dict[str, str] = {}
+        self.esr: int = 0
+        self.opc_pending: bool = False
+        super().__init__(bench)
+        self.route(r"\*IDN\?", lambda args: self.identity)
+        self.route(r"\*RST", lambda args: self.reset())
+        self.route(r"\*CLS", lambda args: self.clear_status())
+        self.route(r"\*OPC\?", lambda args: "1")
+        self.route(r"\*OPC", lambda args: self.set_opc())
+        self.route(r"\*ESR\?", lambda args: self.read_esr())
+        self.route(r"\*(ESE|SRE)\??", lambda args: None if args else "0")
+        self.route(r"SYST(EM)?:ERR(OR)?(:NEXT)?\?", lambda args: self.next_error())
+        self.route(r"ABOR(T)?", lambda args: self.abort())
+
+    def route(self, pattern: str, handler: Callable[[str], str | None]) -> None:
+        self.routes.append((re.compile(pattern, re.IGNORECASE), handler))
+
+    def reset(self) -> None:
+        super().reset()
+        self.settings = dict(self.defaults)
+        self.esr = 0
+        self.opc_pending = False
+
+    def clear_status(self) -> None:
+        self.errors.clear()
+        self.esr = 0
+
+    def abort(self) -> None:
+        pass
+
+    def set_opc(self) -> None:
+        self.opc_pending = True
+
+    def operation_complete(self) -> None:
+        if self.opc_pending:
+            self.esr |= 0x1
+            self.opc_pending = False
+
+    def read_esr(self) -> str:
+        self.operation_complete()
+        esr, self.esr = self.esr, 0
+        return format(esr, "d")
+
+    def next_error(self) -> str:
+        if self.errors:
+            code, message = self.errors.popleft()
+            return f'{code:d},"{message}"'
+        return '0,"No error"'
+
+    def split_message(self, message: str) -> list[str]:
+        return [
+            command.strip()
+            for command in re.findall(r'(?:[^;"]|"[^"]*")+', message)
+            if command.strip()
+        ]
+
+    def handle(self, message: str) -> list[str]:
+        responses: list[str] = []
+        for command in self.split_message(message):
+            header, _, args = command.partition(" ")
+            header = header.lstrip(":")
+            for pattern, handler in self.routes:
+                if pattern.fullmatch(header):
+                    response = handler(args.strip())
+                    break
+            else:
+                response = self.handle_setting(header.upper(), args.strip())
+            if response is not None:
+                responses.append(response)
+        if responses:
+            return [";".join(responses)]
+        return []
+
+    def handle_setting(self, header: str, args: str) -> str | None:
+        if header.endswith("?"):
+            key = header[:-1]
+            if key in self.settings:
+                return self.settings[key]
+            self.push_error(-113, "Undefined header")
+            return None
+        self.settings[header] = args
+        return None
+
+    def setting(self, key: str, default: str = "") -> str:
+        return self.settings.get(key, default)
+
+
+class K2400Simulator(TraceMixin, SourceMixin, ScpiInstrument):
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 2410,0000000,C00 (simulated)"
+    default_compliance = 105e-6
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.defaults.update(
+            {
+                "FORM:ELEM": "VOLT,CURR",
+                "SOUR:DEL": "+1.000000E-03",
+                "SOUR:DEL:AUTO": "1",
+                "SOUR:VOLT:MODE": "FIX",
+                "SENS:CURR:NPLC": "1",
+                "TRIG:COUN": "1",
+                "TRIG:DEL": "0",
+            }
+        )
+        self.buffer: list[dict[str, float]] = []
+        self.route(r"OUTP(UT)?(:STAT(E)?)?\?", lambda args: f"{self.output_enabled:d}")
+        self.route(
+            r"OUTP(UT)?(:STAT(E)?)?",
+            lambda args: self.set_output_enabled(parse_bool(args)),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?(:LEV(EL)?)?(:IMM(EDIATE)?)?(:AMPL(ITUDE)?)?\?",
+            lambda args: format_value(self.voltage_level),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?(:LEV(EL)?)?(:IMM(EDIATE)?)?(:AMPL(ITUDE)?)?",
+            lambda args: self.set_voltage_level(parse_float(args)),
+        )
+        self.route(
+            r"SENS(E)?:CURR(ENT)?:PROT(ECTION)?(:LEV(EL)?)?",
+            lambda args: self.set_current_compliance(parse_float(args)),
+        )
+        self.route(
+            r"SENS(E)?:CURR(ENT)?:PROT(ECTION)?:TRIP(PED)?\?",
+            lambda args: f"{self.read_current()[1]:d}",
+        )
+        self.route(r"SOUR(CE)?:LIST:VOLT(AGE)?", self.set_source_list)
+        self.route(r"READ\?", lambda args: self.read_elements(self.measure()))
+        self.route(r"INIT(IATE)?", lambda args: self.initiate())
+        self.route(r"FETC(H)?\?", lambda args: self.fetch())
+        self.route(r"TRAC(E)?:CLE(AR)?", lambda args: self.clear_buffer())
+        self.route(r"TRAC(E)?:POIN(TS)?:ACT(UAL)?\?", lambda args: self.trace_points())
+        self.route(r"TRAC(E)?:DATA\?", lambda args: self.fetch())
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+        self.reset_trace()
+        self.buffer = []
+        self.source_list: list[float] = []
+
+    def clear_buffer(self) -> None:
+        self.buffer = []
+
+    def measure_time(self) -> float:
+        return parse_float(self.setting("SENS:CURR:NPLC"), 1.0) / 50.0
+
+    def measure(self, timestamp: float = 0.0) -> dict[str, float]:
+        self.busy += self.measure_time()
+        current, compliance = self.read_current()
+        return {
+            "VOLT": self.source_voltage(),
+            "CURR": current,
+            "STAT": 0x8 if compliance else 0x0,
+            "TIME": timestamp,
+        }
+
+    def read_elements(self, reading: dict[str, float]) -> str:
+        elements = split_list(self.setting("FORM:ELEM", "VOLT,CURR"))
+        values = []
+        for element in elements:
+            if element == "STAT":
+                values.append(format_value(reading.get("STAT", 0)))
+            else:
+                values.append(format_value(reading.get(element, math.nan)))
+        return ",".join(values)
+
+    def set_source_list(self, args: str) -> None:
+        self.source_list = [parse_float(value) for value in split_list(args)]
+
+    def initiate(self) -> None:
+        count = max(1, int(parse_float(self.setting("TRIG:COUN"), 1)))
+        list_mode = self.setting("SOUR:VOLT:MODE").upper().startswith("LIST")
+        source_delay = parse_float(self.setting("SOUR:DEL"))
+        trigger_delay = parse_float(self.setting("TRIG:DEL"))
+        self.buffer = []
+        if self.setting("TRAC:FEED:CONT", "NEV").upper().startswith("NEXT"):
+            self.arm_trace(count, trigger_delay + self.measure_time())
+            return
+        timestamp = 0.0
+        for index in range(count):
+            if list_mode and self.source_list:
+                level = self.source_list[min(index, len(self.source_list) - 1)]
+                self.set_voltage_level(level)
+                self.busy += source_delay
+                timestamp += source_delay
+            self.busy += trigger_delay
+            timestamp += trigger_delay + self.measure_time()
+            reading = self.measure(timestamp)
+            self.buffer.append(reading)
+            if list_mode and reading["STAT"] and self.compliance_abort():
+                break
+        self.operation_complete()
+
+    def acquire_trace(self, timestamp: float) -> None:
+        self.busy += self.trace_period - self.measure_time()
+        self.buffer.append(self.measure(timestamp + self.trace_period))
+
+    def trace_points(self) -> str:
+        self.update_trace()
+        return format(len(self.buffer), "d")
+
+    def compliance_abort(self) -> bool:
+        return self.setting("SOUR:SWE:CAB", "NEV").upper().startswith("EARL")
+
+    def fetch(self) -> str:
+        return ",".join(self.read_elements(reading) for reading in self.buffer)
+
+
+class K2470Simulator(TraceMixin, SourceMixin, ScpiInstrument):
+    identity = "KEITHLEY INSTRUMENTS,MODEL 2470,00000000,1.0.0 (simulated)"
+    default_compliance = 105e-6
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.defaults.update({"SENS:CURR:NPLC": "1", "OUTP:INT:TRIP": "1"})
+        self.route(r"OUTP(UT)?(:STAT(E)?)?\?", lambda args: f"{self.output_enabled:d}")
+        self.route(
+            r"OUTP(UT)?(:STAT(E)?)?",
+            lambda args: self.set_output_enabled(parse_bool(args)),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?(:LEV(EL)?)?\?",
+            lambda args: format_value(self.voltage_level),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?(:LEV(EL)?)?",
+            lambda args: self.set_voltage_level(parse_float(args)),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?:ILIM(IT)?(:LEV(EL)?)?",
+            lambda args: self.set_current_compliance(parse_float(args)),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?:ILIM(IT)?(:LEV(EL)?)?:TRIP(PED)?\?",
+            lambda args: f"{self.read_current()[1]:d}",
+        )
+        self.route(r"TRAC(E)?:CLE(AR)?", lambda args: self.clear_buffer())
+        self.route(r"SOUR(CE)?:LIST:VOLT(AGE)?", self.set_source_list)
+        self.route(r"SOUR(CE)?:SWE(EP)?:VOLT(AGE)?:LIST", self.load_list_sweep)
+        self.route(r"SOUR(CE)?:SWE(EP)?:VOLT(AGE)?:LIN(EAR)?", self.load_linear_sweep)
+        self.route(r"TRIG(GER)?:LOAD", self.load_simple_loop)
+        self.route(r"INIT(IATE)?", lambda args: self.initiate())
+        self.route(r"TRIG(GER)?:STAT(E)?\?", lambda args: "IDLE;IDLE;0")
+        self.route(r"READ\?", self.read_buffer_reading)
+        self.route(r"TRAC(E)?:DATA\?", self.trace_data)
+        self.route(r"TRAC(E)?:ACT(UAL)?\?", lambda args: self.trace_points())
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+        self.reset_trace()
+        self.buffer: list[dict[str, float]] = []
+        self.source_list: list[float] = []
+        self.trigger_model: tuple[str, list[float], float] | None = None
+        self.fail_abort: bool = False
+
+    def clear_buffer(self) -> None:
+        self.buffer = []
+
+    def measure_time(self) -> float:
+        return parse_float(self.setting("SENS:CURR:NPLC"), 1.0) / 50.0
+
+    def measure(self, timestamp: float = 0.0) -> dict[str, float]:
+        self.busy += self.measure_time()
+        current, compliance = self.read_current()
+        reading = {
+            "SOUR": self.source_voltage(),
+            "READ": current,
+            "REL": timestamp,
+            "LIMIT": float(compliance),
+        }
+        self.buffer.append(reading)
+        return reading
+
+    def read_buffer_reading(self, args: str) -> str:
+        elements = [item.upper() for item in split_list(args)[1:]] or ["READ"]
+        reading = self.measure()
+        return ",".join(format_value(reading.get(element, 0.0)) for element in elements)
+
+    def set_source_list(self, args: str) -> None:
+        self.source_list = [parse_float(value) for value in split_list(args)]
+
+    def load_list_sweep(self, args: str) -> None:
+        values = split_list(args)
+        delay = parse_float(values[1]) if len(values) > 1 else 0.0
+        self.fail_abort = len(values) > 3 and parse_bool(values[3])
+        self.trigger_model = "LIST", list(self.source_list), delay
+
+    def load_linear_sweep(self, args: str) -> None:
+        values = split_list(args)
+        begin, end = parse_float(values[0]), parse_float(values[1])
+        points = max(2, int(parse_float(values[2], 2)))
+        delay = parse_float(values[3])
+        levels = [
+            begin + (end - begin) * index / (points - 1) for index in range(points)
+        ]
+        self.trigger_model = "RAMP", levels, delay
+
+    def load_simple_loop(self, args: str) -> None:
+        values = split_list(args)
+        count = max(1, int(parse_float(values[1], 1))) if len(values) > 1 else 1
+        delay = parse_float(values[2]) if len(values) > 2 else 0.0
+        self.trigger_model = "LOOP", [math.nan] * count, delay
+
+    def initiate(self) -> None:
+        if self.trigger_model is None:
+            self.measure()
+            return
+        kind, levels, delay = self.trigger_model
+        if kind == "LOOP":
+            self.arm_trace(len(levels), delay + self.measure_time())
+            return
+        timestamp = 0.0
+        for level in levels:
+            if not math.isnan(level):
+                self.set_voltage_level(level)
+            self.busy += delay
+            if kind != "RAMP":
+                reading = self.measure(timestamp)
+                timestamp += delay + self.measure_time()
+                if kind == "LIST" and self.fail_abort and reading["LIMIT"]:
+                    break
+
+    def acquire_trace(self, timestamp: float) -> None:
+        self.busy += self.trace_period - self.measure_time()
+        self.measure(timestamp)
+
+    def trace_points(self) -> str:
+        self.update_trace()
+        return format(len(self.buffer), "d")
+
+    def trace_data(self, args: str) -> str:
+        values = split_list(args)
+        begin = max(1, int(parse_float(values[0], 1)))
+        end = int(parse_float(values[1], len(self.buffer)))
+        elements = [item.upper() for item in values[3:]] or ["READ"]
+        readings = self.buffer[begin - 1 : end]
+        return ",".join(
+            format_value(reading.get(element, 0.0))
+            for reading in readings
+            for element in elements
+        )
+
+
+class ElectrometerSimulator(TraceMixin, ScpiInstrument):
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 6514,0000000,A00 (simulated)"
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.defaults.update(
+            {
+                "FORM:ELEM": "READ,TIME,STAT",
+                "SENS:CURR:NPLC": "5",
+                "TRIG:COUN": "1",
+                "TRIG:DEL": "0",
+                "SYST:ZCH": "1",
+            }
+        )
+        self.route(r"INIT(IATE)?", lambda args: self.initiate())
+        self.route(r"FETC(H)?\?", lambda args: self.fetch())
+        self.route(r"READ\?", lambda args: self.read_buffer())
+        self.route(r"TRAC(E)?:CLE(AR)?", lambda args: self.clear_buffer())
+        self.route(r"TRAC(E)?:POIN(TS)?:ACT(UAL)?\?", lambda args: self.trace_points())
+        self.route(r"TRAC(E)?:DATA\?", lambda args: self.fetch())
+        self.route(r"TRAC(E)?:DATA:SEL(ECTED)?\?", self.fetch_selected)
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_trace()
+        self.buffer: list[dict[str, float]] = []
+
+    def clear_buffer(self) -> None:
+        self.buffer = []
+
+    def measure_time(self) -> float:
+        return parse_float(self.setting("SENS:CURR:NPLC"), 1.0) / 50.0
+
+    def measure_current(self) -> float:
+        if parse_bool(self.setting("SYST:ZCH", "0")):
+            return self.bench.noise(self.bench.model.current_noise_floor)
+        current, _ = self.bench.read_current()
+        return current
+
+    def initiate(self) -> None:
+        count = max(1, int(parse_float(self.setting("TRIG:COUN"), 1)))
+        delay = parse_float(self.setting("TRIG:DEL"))
+        self.buffer = []
+        if self.setting("TRAC:FEED:CONT", "NEV").upper().startswith("NEXT"):
+            self.arm_trace(count, delay + self.measure_time())
+            return
+        timestamp = 0.0
+        for _ in range(count):
+            self.busy += delay + self.measure_time()
+            self.buffer.append({"READ": self.measure_current(), "TIME": timestamp})
+            timestamp += delay + self.measure_time()
+        self.operation_complete()
+
+    def acquire_trace(self, timestamp: float) -> None:
+        self.busy += self.trace_period
+        reading = self.measure_current()
+        self.buffer.append({"READ": reading, "TIME": timestamp, "TST": timestamp})
+
+    def trace_points(self) -> str:
+        self.update_trace()
+        return format(len(self.buffer), "d")
+
+    def read_buffer(self) -> str:
+        self.initiate()
+        return self.fetch()
+
+    def fetch(self, begin: int = 0, count: int | None = None) -> str:
+        elements = split_list(self.setting("FORM:ELEM", "READ"))
+        end = len(self.buffer) if count is None else begin + count
+        return ",".join(
+            format_value(reading.get(element, 0.0))
+            for reading in self.buffer[begin:end]
+            for element in elements
+        )
+
+    def fetch_selected(self, args: str) -> str:
+        values = split_list(args)
+        begin = max(0, int(parse_float(values[0]))) if values else 0
+        count = int(parse_float(values[1], 1)) if len(values) > 1 else None
+        return self.fetch(begin, count)
+
+
+class K6517BSimulator(SourceMixin, ElectrometerSimulator):
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 6517B,0000000,A00 (simulated)"
+    default_compliance = 1e-3
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.route(r"OUTP(UT)?(:STAT(E)?)?\?", lambda args: f"{self.output_enabled:d}")
+        self.route(
+            r"OUTP(UT)?(:STAT(E)?)?",
+            lambda args: self.set_output_enabled(parse_bool(args)),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?(:LEV(EL)?)?(:IMM(EDIATE)?)?(:AMPL(ITUDE)?)?\?",
+            lambda args: format_value(self.voltage_level),
+        )
+        self.route(
+            r"SOUR(CE)?:VOLT(AGE)?(:LEV(EL)?)?(:IMM(EDIATE)?)?(:AMPL(ITUDE)?)?",
+            lambda args: self.set_voltage_level(parse_float(args)),
+        )
+        self.route(
+            r"SOUR(CE)?:CURR(ENT)?:LIM(IT)?(:STAT(E)?)?\?",
+            lambda args: f"{self.read_current()[1]:d}",
+        )
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+
+
+class K2700Simulator(ScpiInstrument):
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 2700,0000000,B00 (simulated)"
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.route(r"FETC(H)?\?", lambda args: format_value(self.measure()))
+        self.route(r"READ\?", lambda args: format_value(self.measure()))
+
+    def measure(self) -> float:
+        self.busy += 0.020
+        return self.bench.read_temperature()
+
+
+class LCRSimulator(SourceMixin, ScpiInstrument):
+    identity = "Keysight Technologies,E4980A,MY00000000,A.00.00 (simulated)"
+    aperture_times: ClassVar[dict[str, float]] = {
+        "SHOR": 0.010,
+        "MED": 0.090,
+        "LONG": 0.250,
+    }
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.defaults.update({"APER": "MED,1", "FREQ": "1000"})
+        self.route(r"BIAS:STAT(E)?\?", lambda args: f"{self.output_enabled:d}")
+        self.route(
+            r"BIAS:STAT(E)?", lambda args: self.set_output_enabled(parse_bool(args))
+        )
+        self.route(
+            r"BIAS:VOLT(AGE)?(:LEV(EL)?)?\?",
+            lambda args: format_value(self.voltage_level),
+        )
+        self.route(
+            r"BIAS:VOLT(AGE)?(:LEV(EL)?)?",
+            lambda args: self.set_voltage_level(parse_float(args)),
+        )
+        self.route(r"TRIG(GER)?(:IMM(EDIATE)?)?", lambda args: self.trigger())
+        self.route(r"FETC(H)?(:IMP(EDANCE)?)?\?", lambda args: self.fetch())
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+        self.reading: tuple[float, float] = (0.0, 0.0)
+
+    def measure_time(self) -> float:
+        integration_time, _, averaging_rate = self.setting("APER", "MED,1").partition(
+            ","
+        )
+        time = self.aperture_times.get(integration_time.strip().upper()[:4], 0.090)
+        return time * max(1, int(parse_float(averaging_rate, 1)))
+
+    def trigger(self) -> None:
+        self.busy += self.measure_time()
+        capacitance = self.bench.read_capacitance()
+        self.reading = capacitance, self.bench.model.parallel_resistance
+        self.operation_complete()
+
+    def fetch(self) -> str:
+        capacitance, resistance = self.reading
+        return f"{format_value(capacitance)},{format_value(resistance)},+0"
+
+
+class A4284ASimulator(LCRSimulator):
+    identity = "HEWLETT-PACKARD,4284A,0,01.00 (simulated)"
+
+
+class K4215Simulator(SourceMixin, ScpiInstrument):
+    identity = "KEITHLEY INSTRUMENTS,4200A-SCS,0000000,1.0 (simulated)"
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.route(r"BC", lambda args: None)
+        self.route(r"ERROR:LAST:GET", lambda args: self.last_error())
+        self.route(r"ERROR:LAST:CLEAR", lambda args: self.errors.clear())
+        self.route(
+            r"CVU:OUTPUT", lambda args: self.set_output_enabled(parse_bool(args))
+        )
+        self.route(r"CVU:DCV", lambda args: self.set_voltage_level(parse_float(args)))
+        self.route(r"CVU:MEASZ\?", lambda args: self.measure())
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+
+    def last_error(self) -> str:
+        if self.errors:
+            code, message = self.errors[-1]
+            return f"{message}. ({code:d})"
+        return "No error. (0)"
+
+    def measure(self) -> str:
+        self.busy += 0.100
+        capacitance = self.bench.read_capacitance()
+        resistance = self.bench.model.parallel_resistance
+        return f"{format_value(capacitance)},{format_value(resistance)}"
+
+
+class BrandBoxSimulator(ScpiInstrument):
+    identity = "HEPHY,BrandBox,0,1.0 (simulated)"
+
+    def __init__(self, bench: SimulatedBench) -> None:
+        super().__init__(bench)
+        self.route(r"CLOS(E)?:STAT(E)?\?", lambda args: ",".join(self.closed))
+        self.route(r"CLOS(E)?", lambda args: self.close_channels(split_list(args)))
+        self.route(r"OPEN:ALL", lambda args: self.closed.clear())
+        self.route(r"OPEN", lambda args: self.open_channels(split_list(args)))
+
+    def reset(self) -> None:
+        super().reset()
+        self.closed: list[str] = []
+
+    def close_channels(self, channels: list[str]) -> None:
+        self.closed.extend(
+            channel for channel in channels if channel not in self.closed
+        )
+
+    def open_channels(self, channels: list[str]) -> None:
+        self.closed = [channel for channel in self.closed if channel not in channels]
+
+
+class DDCSimulator(SourceMixin, SimulatedInstrument):
+    """Device dependent command instrument (K237, K595), one command
+    terminated by `X` per message.
+    """
+
+    status_length: int = 26
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+        self.format: tuple[int, int] = (5, 2)
+        self.function: int = 0
+
+    def handle(self, message: str) -> list[str]:
+        message = message.strip()
+        message = message.removesuffix("X")
+        if not message:
+            return [self.output_line()]
+        code, args = message[0].upper(), message[1:]
+        if code == "U":
+            return [self.status(int(parse_float(args, 0)))]
+        # Pad omitted parameters
+        self.command(code, [arg.strip() for arg in args.split(",")] + ["", ""])
+        return []
+
+    def status(self, index: int) -> str:
+        if index == 0:
+            return self.identity
+        if index == 1:
+            return "ERS" + "0" * self.status_length
+        return ""
+
+    def command(self, code: str, args: list[str]) -> None:
+        if code == "G":
+            self.format = int(parse_float(args[0], 5)), int(parse_float(args[1], 2))
+        elif code == "F":
+            self.function = int(parse_float(args[0], 0))
+
+    def output_line(self) -> str:
+        raise NotImplementedError
+
+
+class K237Simulator(DDCSimulator):
+    identity = "237A07"
+
+    def status(self, index: int) -> str:
+        if index == 3:
+            return f"MSTG15,0,0K0M000,0N{self.output_enabled:d}R1T4,0,0,0V1Y0"
+        return super().status(index)
+
+    def command(self, code: str, args: list[str]) -> None:
+        if code == "N":
+            self.set_output_enabled(parse_bool(args[0]))
+        elif code == "B":
+            if args[0]:
+                self.set_voltage_level(parse_float(args[0]))
+        elif code == "L":
+            self.set_current_compliance(parse_float(args[0]))
+        else:
+            super().command(code, args)
+
+    def output_line(self) -> str:
+        items, prefix = self.format
+        self.busy += 0.020
+        current, compliance = self.read_current()
+        state = "O" if compliance else "N"
+        source = format_value(self.source_voltage())
+        measure = format_value(current)
+        if prefix == 1:
+            source = f"{state}SDCV{source}"
+            measure = f"{state}MDCI{measure}"
+        if items == 1:
+            return source
+        if items == 4:
+            return measure
+        return f"{source},{measure}"
+
+
+class K595Simulator(DDCSimulator):
+    identity = "595A01"
+
+    def command(self, code: str, args: list[str]) -> None:
+        if code == "V":
+            self.set_voltage_level(parse_float(args[0]))
+            self.set_output_enabled(self.voltage_level != 0)
+        else:
+            super().command(code, args)
+
+    def output_line(self) -> str:
+        self.busy += 0.100
+        if self.function == 0:
+            value = self.bench.read_capacitance()
+        else:
+            value, _ = self.read_current()
+        return f"{format_value(value)},{format_value(self.voltage_level)}"
+
+
+class TspInstrument(SimulatedInstrument):
+    """Test script processor (TSP) instrument evaluating a small subset of
+    statements: assignments, function calls and prints.
+    """
+
+    statement = re.compile(
+        r"\s*(?:(?P<name>[\w.\[\]]+)\s*=\s*(?P<value>\{[^}]*\}|\"[^\"]*\"|\S+)"
+        r"|(?P<call>[\w.\[\]]+)\((?P<args>[^()]*)\))"
+    )
+
+    def reset(self) -> None:
+        super().reset()
+        self.variables: dict[str, object] = {}
+        self.script: list[str] | None = None
+
+    def handle(self, message: str) -> list[str]:
+        if self.script is not None:
+            if message.strip() == "endscript":
+                self.script = None
+            else:
+                self.script.append(message)
+            return []
+        if message.startswith("*IDN?"):
+            return [self.identity]
+        if message.startswith("*OPC?"):
+            return ["1"]
+        if message.startswith("loadscript"):
+            self.script = []
+            return []
+        if message.startswith("print(") and message.endswith(")"):
+            return [self.print_expression(message[6:-1].strip())]
+        return self.execute(message)
+
+    def execute(self, message: str) -> list[str]:
+        if m := re.fullmatch(
+            r"for _, value in ipairs\(\{(.*)\}\) do table\.insert\((\w+), value\) end",
+            message.strip(),
+        ):
+            values = self.variables.setdefault(m.group(2), [])
+            if isinstance(values, list):
+                values.extend(parse_float(value) for value in split_list(m.group(1)))
+            return []
+        pos = 0
+        while pos < len(message):
+            m = self.statement.match(message, pos)
+            if not m:
+                if message[pos:].strip():
+                    self.push_error(-285, f"Syntax error at {message[pos:]!r}")
+                break
+            if m.group("name"):
+                self.assign(m.group("name"), self.evaluate(m.group("value")))
+            else:
+                self.call(m.group("call"), m.group("args"))
+            pos = m.end()
+        return []
+
+    def evaluate(self, value: str) -> object:
+        if value.startswith("{"):
+            return [parse_float(item) for item in split_list(value[1:-1]) if item]
+        if value.startswith('"'):
+            return value[1:-1]
+        if value in {"true", "false"}:
+            return value == "true"
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    def assign(self, name: str, value: object) -> None:
+        self.variables[name] = value
+
+    def call(self, name: str, args: str) -> None:
+        if name == "reset":
+            self.reset()
+        elif name in {"status.reset", "errorqueue.clear"}:
+            self.errors.clear()
+
+    def print_value(self, value: object) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, float):
+            return format(value, ".6e")
+        return str(value)
+
+    def print_expression(self, expression: str) -> str:
+        if expression == "errorqueue.count":
+            return self.print_value(float(len(self.errors)))
+        if expression == "errorqueue.next()":
+            if self.errors:
+                code, message = self.errors.popleft()
+                return f"{code:d}\t{message}\t0\t0"
+            return "0\tQueue Is Empty\t0\t0"
+        value = self.variables.get(expression)
+        if value is None:
+            self.push_error(-285, f"Undefined expression {expression!r}")
+            return "nil"
+        return self.print_value(value)
+
+
+class K2657ASimulator(SourceMixin, TspInstrument):
+    identity = "Keithley Instruments Inc., Model 2657A, 0000000, 1.0.0 (simulated)"
+    default_compliance = 105e-6
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_source()
+        self.trigger_levels: list[float] = []
+
+    def measure_time(self) -> float:
+        return (
+            parse_float(str(self.variables.get("smua.measure.nplc", 1.0)), 1.0) / 50.0
+        )
+
+    def measure(self) -> tuple[float, float, bool]:
+        self.busy += self.measure_time()
+        current, compliance = self.read_current()
+        return current, self.source_voltage(), compliance
+
+    def assign(self, name: str, value: object) -> None:
+        if name == "smua.source.output":
+            self.set_output_enabled(value in {"smua.OUTPUT_ON", 1.0})
+        elif name == "smua.source.levelv" and isinstance(value, float):
+            self.set_voltage_level(value)
+        elif name == "smua.source.limiti" and isinstance(value, float):
+            self.set_current_compliance(value)
+        super().assign(name, value)
+
+    def call(self, name: str, args: str) -> None:
+        if name == "smua.trigger.source.linearv":
+            values = [parse_float(value) for value in split_list(args)]
+            begin, end, points = values[0], values[1], max(2, int(values[2]))
+            self.trigger_levels = [
+                begin + (end - begin) * index / (points - 1) for index in range(points)
+            ]
+        elif name == "smua.trigger.initiate":
+            self.initiate()
+        elif name == "dm_sweep.run":
+            self.run_sweep_script()
+        elif name == "dm_sweep_iv.run":
+            self.run_sweep_iv_script()
+        else:
+            super().call(name, args)
+
+    def initiate(self) -> None:
+        timer_delay = parse_float(
+            str(self.variables.get("trigger.timer[1].delay", 0.0))
+        )
+        for level in self.trigger_levels:
+            self.set_voltage_level(level)
+            self.busy += timer_delay
+
+    def print_expression(self, expression: str) -> str:
+        if expression == "smua.source.output":
+            return f"{self.output_enabled:d}"
+        if expression == "smua.source.levelv":
+            return self.print_value(self.voltage_level)
+        if expression == "smua.source.limiti":
+            return self.print_value(self.current_compliance)
+        if expression == "smua.source.compliance":
+            return self.print_value(self.read_current()[1])
+        if expression == "smua.measure.i()":
+            return self.print_value(self.measure()[0])
+        if expression == "smua.measure.v()":
+            return self.print_value(self.measure()[1])
+        if expression == "smua.measure.iv()":
+            current, voltage, _ = self.measure()
+            return f"{self.print_value(current)}\t{self.print_value(voltage)}"
+        if expression == "status.operation.sweeping.condition":
+            return self.print_value(0.0)
+        return super().print_expression(expression)
+
+    def handle(self, message: str) -> list[str]:
+        if (
+            message
+            == "local i, v = smua.measure.iv() print(i, v, smua.source.compliance)"
+        ):
+            current, voltage, compliance = self.measure()
+            return [
+                "\t".join(
+                    self.print_value(value) for value in (current, voltage, compliance)
+                )
+            ]
+        return super().handle(message)
+
+    def run_sweep_script(self) -> None:
+        """Emulate the sweep script of the K2657A adapter, rows are queued
+        with the time they take on the instrument.
+        """
+        variables = self.variables
+        voltages = variables.get("dm_voltages") or []
+        delay = parse_float(str(variables.get("dm_delay", 0.0)))
+        ramp_step = max(parse_float(str(variables.get("dm_ramp_step", 1.0))), 1e-3)
+        ramp_delay = parse_float(str(variables.get("dm_ramp_delay", 0.0)))
+        abort_compliance = variables.get("dm_abort_compliance") is True
+        ramp_down = variables.get("dm_ramp_down") is True
+
+        def ramp(target: float) -> None:
+            level = self.voltage_level
+            count = math.ceil(abs(target - level) / ramp_step)
+            for step in range(1, count + 1):
+                self.set_voltage_level(level + (target - level) * step / count)
+                self.output.append(
+                    (ramp_delay, f"R\t{self.print_value(self.voltage_level)}")
+                )
+
+        aborted = False
+        for index, voltage in enumerate(
+            voltages if isinstance(voltages, list) else [], 1
+        ):
+            self.set_voltage_level(voltage)
+            current, measured, compliance = self.measure()
+            elapsed = delay + self.take_busy()
+            fields = [
+                "P",
+                format(index, "d"),
+                self.print_value(voltage),
+                self.print_value(current),
+                self.print_value(measured),
+                self.print_value(compliance),
+            ]
+            self.output.append((elapsed, "\t".join(fields)))
+            if compliance and abort_compliance:
+                ramp(0.0)
+                self.output.append((0.0, f"C\t{index:d}"))
+                aborted = True
+                break
+        if ramp_down and not aborted:
+            ramp(0.0)
+        self.output.append((0.0, "E"))
+
+    def run_sweep_iv_script(self) -> None:
+        """Emulate the buffered sweep script of the K2657A adapter."""
+        variables = self.variables
+        levels = variables.get("dm_levels") or []
+        delay = parse_float(str(variables.get("dm_delay", 0.0)))
+        abort_compliance = variables.get("dm_abort_compliance") is True
+        timestamp = 0.0
+        for level in levels if isinstance(levels, list) else []:
+            self.set_voltage_level(level)
+            current, measured, compliance = self.measure()
+            elapsed = delay + self.take_busy()
+            timestamp += elapsed
+            fields = [
+                "P",
+                self.print_value(timestamp),
+                self.print_value(current),
+                self.print_value(measured),
+                self.print_value(compliance),
+            ]
+            self.output.append((elapsed, "\t".join(fields)))
+            if compliance and abort_compliance:
+                break
+        self.output.append((0.0, "E"))
+
+    def clear(self) -> None:
+        super().clear()
+        self.script = None
+
+
+class K707BSimulator(TspInstrument):
+    identity = "Keithley Instruments Inc., Model 707B, 0000000, 1.0.0 (simulated)"
+
+    def reset(self) -> None:
+        super().reset()
+        self.closed: list[str] = []
+
+    def call(self, name: str, args: str) -> None:
+        channels = [
+            channel.strip() for channel in args.strip('"').split(",") if channel
+        ]
+        if name == "channel.close":
+            self.closed.extend(
+                channel for channel in channels if channel not in self.closed
+            )
+        elif name == "channel.open":
+            if "allslots" in channels:
+                self.closed = []
+            else:
+                self.closed = [
+                    channel for channel in self.closed if channel not in channels
+                ]
+        else:
+            super().call(name, args)
+
+    def print_expression(self, expression: str) -> str:
+        if expression.startswith("channel.getclose("):
+            return ";".join(self.closed) or "nil"
+        return super().print_expression(expression)
+
+
+class K708BSimulator(K707BSimulator):
+    identity = "Keithley Instruments Inc., Model 708B, 0000000, 1.0.0 (simulated)"
+
+
+simulator_registry: dict[str, type[SimulatedInstrument]] = {
+    "K237": K237Simulator,
+    "K595": K595Simulator,
+    "K2410": K2400Simulator,
+    "K2470": K2470Simulator,
+    "K2657A": K2657ASimulator,
+    "K2700": K2700Simulator,
+    "K4215": K4215Simulator,
+    "K6514": ElectrometerSimulator,
+    "K6517B": K6517BSimulator,
+    "E4980A": LCRSimulator,
+    "A4284A": A4284ASimulator,
+    "BrandBox": BrandBoxSimulator,
+    "K707B": K707BSimulator,
+    "K708B": K708BSimulator,
+}
+
+
+def create_simulator(model: str, bench: SimulatedBench) -> SimulatedInstrument:
+    """Return simulated instrument for the given driver model."""
+    try:
+        simulator_cls = simulator_registry[model]
+    except KeyError as exc:
+        raise ValueError(f"No simulator for instrument model: {model}") from exc
+    return simulator_cls(bench)
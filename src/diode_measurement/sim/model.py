@@ -0,0 +1,127 @@
+import math
+import random
+import threading
+from dataclasses import dataclass
+
+__all__ = ["DiodeModel", "SimulatedBench"]
+
+BOLTZMANN_EV: float = 8.617333262e-5  # eV/K
+ZERO_CELSIUS: float = 273.15  # K
+
+
+@dataclass
+class DiodeModel:
+    """Reverse biased silicon sensor (pad diode).
+
+    The bulk leakage current grows with the depleted volume until full
+    depletion, scaled by temperature. Avalanche multiplication sets in when
+    approaching the breakdown voltage. The capacitance follows a linear
+    1/C² curve until full depletion and stays at the geometric capacitance
+    above.
+    """
+
+    depletion_voltage: float = 60.0  # V
+    breakdown_voltage: float = 800.0  # V
+    breakdown_exponent: float = 4.0
+    max_multiplication: float = 1e4
+    leakage_current: float = 50e-9  # A at full depletion and reference temperature
+    parallel_resistance: float = 100e9  # Ohm
+    geometric_capacitance: float = 30e-12  # F
+    reference_temperature: float = 20.0  # degC
+    bandgap: float = 1.21  # eV, effective
+    current_noise: float = 0.005  # relative
+    current_noise_floor: float = 10e-15  # A
+    capacitance_noise: float = 0.001  # relative
+
+    def temperature_factor(self, temperature: float) -> float:
+        """Return bulk current scale factor at temperature (degC)."""
+        t = temperature + ZERO_CELSIUS
+        t_ref = self.reference_temperature + ZERO_CELSIUS
+        return (t / t_ref) ** 2 * math.exp(
+            -self.bandgap / (2 * BOLTZMANN_EV) * (1 / t - 1 / t_ref)
+        )
+
+    def depletion(self, voltage: float) -> float:
+        """Return depleted fraction of the sensor thickness."""
+        if self.depletion_voltage <= 0:
+            return 1.0
+        return math.sqrt(min(abs(voltage) / self.depletion_voltage, 1.0))
+
+    def multiplication(self, voltage: float) -> float:
+        """Return avalanche multiplication factor."""
+        ratio = abs(voltage) / self.breakdown_voltage
+        if ratio >= 1.0:
+            return self.max_multiplication
+        return min(1 / (1 - ratio**self.breakdown_exponent), self.max_multiplication)
+
+    def current(self, voltage: float, temperature: float) -> float:
+        """Return noise free current in A for bias voltage in V."""
+        bulk = self.leakage_current * self.depletion(voltage)
+        bulk *= self.temperature_factor(temperature)
+        current = bulk * self.multiplication(voltage)
+        current += abs(voltage) / self.parallel_resistance
+        return math.copysign(current, voltage)
+
+    def capacitance(self, voltage: float) -> float:
+        """Return noise free capacitance in F for bias voltage in V."""
+        return self.geometric_capacitance / max(self.depletion(voltage), 1e-3)
+
+
+class SimulatedBench:
+    """Shared state of simulated instruments connected to one sensor.
+
+    Sources report their output voltage, the sensor bias is the sum of all
+    enabled source voltages. Readings include noise and current is limited
+    by the lowest compliance of enabled sources.
+    """
+
+    def __init__(
+        self, model: DiodeModel | None = None, seed: int | None = None
+    ) -> None:
+        self.model: DiodeModel = model or DiodeModel()
+        self.temperature: float = self.model.reference_temperature  # degC
+        self.humidity: float = 40.0  # %rH
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._sources: dict[int, tuple[float, float]] = {}
+
+    def set_source(self, key: int, voltage: float, compliance: float) -> None:
+        """Register enabled source output voltage and current compliance."""
+        with self._lock:
+            self._sources[key] = voltage, compliance
+
+    def remove_source(self, key: int) -> None:
+        with self._lock:
+            self._sources.pop(key, None)
+
+    def bias_voltage(self) -> float:
+        with self._lock:
+            return sum(voltage for voltage, _ in self._sources.values())
+
+    def compliance(self) -> float:
+        with self._lock:
+            limits = [abs(limit) for _, limit in self._sources.values() if limit > 0]
+        return min(limits, default=math.inf)
+
+    def noise(self, sigma: float) -> float:
+        with self._lock:
+            return self._random.gauss(0.0, sigma)
+
+    def read_current(self) -> tuple[float, bool]:
+        """Return sensor current in A with noise and compliance state."""
+        model = self.model
+        current = model.current(self.bias_voltage(), self.temperature)
+        current += self.noise(abs(current) * model.current_noise)
+        current += self.noise(model.current_noise_floor)
+        compliance = self.compliance()
+        if abs(current) >= compliance:
+            return math.copysign(compliance, current), True
+        return current, False
+
+    def read_capacitance(self) -> float:
+        """Return sensor capacitance in F with noise."""
+        capacitance = self.model.capacitance(self.bias_voltage())
+        return capacitance + self.noise(capacitance * self.model.capacitance_noise)
+
+    def read_temperature(self) -> float:
+        return self.temperature + self.noise(0.01)
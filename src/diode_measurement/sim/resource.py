@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from typing import Literal, Self
+
+from ..core.metrics import READ_PREFIX, command_prefix
+from ..core.resource import Resource, ResourceConfig, ResourceError
+from ..core.trace import TraceOp
+from .instruments import SimulatedInstrument, SimulatedTimeout
+
+__all__ = ["SimulatedResource"]
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedResource(Resource):
+    """Resource connected to a simulated instrument instead of VISA.
+
+    Operations take the latency of the simulated instrument plus the time
+    consumed by the operation, scaled by `time_scale` (set to zero to run
+    as fast as possible). Reading without pending output raises a timeout
+    `ResourceError`.
+    """
+
+    def __init__(
+        self,
+        resource_config: ResourceConfig,
+        instrument: SimulatedInstrument,
+        time_scale: float = 1.0,
+    ) -> None:
+        super().__init__(resource_config)
+        self.instrument: SimulatedInstrument = instrument
+        self.time_scale: float = time_scale
+        self._lock = threading.Lock()
+        self._is_open: bool = False
+
+    def __enter__(self) -> Self:
+        self.configure_fingerprint = None
+        self._is_open = True
+        return self
+
+    def __exit__(self, *args) -> Literal[False]:
+        self._is_open = False
+        self.configure_fingerprint = None
+        return False
+
+    def probe(self) -> bool:
+        return self._is_open
+
+    def _simulate(self, op: TraceOp, message: str) -> str:
+        if not self._is_open:
+            raise RuntimeError("no open resource")
+        prefix = READ_PREFIX if op == TraceOp.READ else command_prefix(message)
+        start = time.perf_counter()
+        instrument = self.instrument
+        with self._lock:
+            try:
+                if op == TraceOp.WRITE:
+                    instrument.write(message)
+                    response = ""
+                elif op == TraceOp.QUERY:
+                    response = instrument.query(message)
+                elif op == TraceOp.READ:
+                    response = instrument.read()
+                else:
+                    instrument.clear()
+                    response = ""
+            except SimulatedTimeout as exc:
+                self._sleep(self.resource_config.timeout)
+                self.metrics.record_timeout(prefix)
+                if self.trace is not None:
+                    elapsed = time.perf_counter() - start
+                    self.trace.record(
+                        op,
+                        self.resource_name,
+                        message,
+                        "",
+                        start,
+                        elapsed,
+                        timeout=True,
+                    )
+                raise ResourceError(f"{self.resource_name}: {exc} (timeout)") from exc
+            finally:
+                self._sleep(instrument.latency + instrument.take_busy())
+        if op == TraceOp.CLEAR:
+            if self.trace is not None:
+                elapsed = time.perf_counter() - start
+                self.trace.record(op, self.resource_name, "", "", start, elapsed)
+            return ""
+        bytes_written = self._message_size(message) if message else 0
+        bytes_read = self._message_size(response) if response else 0
+        self._record(op, prefix, message, response, bytes_written, bytes_read, start)
+        return response
+
+    def _sleep(self, seconds: float) -> None:
+        if self.time_scale > 0 and seconds > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def query(self, message: str) -> str:
+        logger.debug("simulated.write: `%s`", message)
+        result = self._simulate(TraceOp.QUERY, message)
+        logger.debug("simulated.read: `%s`", result)
+        return result
+
+    def write(self, message: str) -> int:
+        logger.debug("simulated.write: `%s`", message)
+        self._simulate(TraceOp.WRITE, message)
+        return self._message_size(message)
+
+    def read(self) -> str:
+        result = self._simulate(TraceOp.READ, "")
+        logger.debug("simulated.read: `%s`", result)
+        return result
+
+    def clear(self) -> None:
+        self._simulate(TraceOp.CLEAR, "")
+
+    @property
+    def supports_srq(self) -> bool:
+        return False
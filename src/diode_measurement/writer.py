@@ -1,12 +1,24 @@
 import csv
+import io
+import logging
 import math
+import os
+import queue
+import threading
+import time
 from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Any, TextIO
 
 from .core.events import Reading
 from .core.role import Role
 
-__all__ = ["Writer"]
+__all__ = ["FlushPolicy", "Writer"]
+
+logger = logging.getLogger(__name__)
+
+_TABLE_END = object()
+_STOP = object()
 
 
 def safe_format(value: Any, format_spec: str | None = None) -> str:
@@ -17,18 +29,38 @@ def safe_format(value: Any, format_spec: str | None = None) -> str:
         return format(math.nan)
 
 
+@dataclass(frozen=True, slots=True)
+class FlushPolicy:
+    """Flush policy of a background writer.
+
+    Rows are flushed after `rows` rows or `interval` seconds, whichever comes
+    first. With `fsync` enabled, the file is also synced to disk at the end
+    of every table and on close.
+    """
+
+    rows: int = 256
+    interval: float = 1.0
+    fsync: bool = False
+
+
 class Writer:
     delimiter: str = "\t"
 
     def __init__(self, fp: TextIO) -> None:
         self._fp: TextIO = fp
         self._writer = csv.writer(fp, delimiter=self.delimiter)
+        self._queue: queue.SimpleQueue[Any] | None = None
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self.flush_policy: FlushPolicy = FlushPolicy()
         self._timestamp_offset: float = 0.0
         self.current_table: str | None = None
         self.relative_timestamp: bool = False
         self.timestamp_format: str = ".6f"
         self.value_format: str = "+.3E"
         self.optional_roles: list[Role] = []
+        self.settle_time_enabled: bool = False
+        self.channel_group_enabled: bool = False
 
     def get_timestamp(self, timestamp: float) -> float:
         """Return absolute or relative timestamp based on configuration."""
@@ -85,17 +117,162 @@ class Writer:
             )
         return row
 
+    def settle_header(self) -> list[str]:
+        header = []
+        if self.settle_time_enabled:
+            header.extend(
+                [
+                    "settle_time[s]",
+                ]
+            )
+        return header
+
+    def settle_data(self, reading: Any) -> list[str]:
+        row = []
+        if self.settle_time_enabled:
+            row.extend(
+                [
+                    safe_format(reading.settle_time, self.value_format),
+                ]
+            )
+        return row
+
+    def channel_group_header(self) -> list[str]:
+        header = []
+        if self.channel_group_enabled:
+            header.extend(
+                [
+                    "channel_group",
+                ]
+            )
+        return header
+
+    def channel_group_data(self, reading: Any) -> list[str]:
+        row = []
+        if self.channel_group_enabled:
+            row.extend(
+                [
+                    safe_format(reading.channel_group, "d"),
+                ]
+            )
+        return row
+
+    @property
+    def is_background(self) -> bool:
+        return self._thread is not None
+
+    def start(self, policy: FlushPolicy | None = None) -> None:
+        """Start background writer thread.
+
+        Rows are then queued to the writer thread and flushed according to
+        the flush policy, so that slow disks do not stall acquisition.
+        """
+        if self._thread is not None:
+            raise RuntimeError("background writer already started")
+        if policy is not None:
+            self.flush_policy = policy
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="writer", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Drain and stop background writer thread, flush the file.
+
+        Errors raised by the writer thread are raised here and by every
+        later write or close, rows written after the error are discarded.
+        """
+        if self._thread is None or self._queue is None:
+            self.flush()
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+        self._check_error()
+
     def flush(self) -> None:
-        self._fp.flush()
+        """Flush the file, in background mode flushing is left to the flush
+        policy of the writer thread."""
+        self._check_error()
+        if self._thread is None:
+            self._fp.flush()
 
     def write_tag(self, key: str, value: Any) -> None:
         key = key.strip()
         value = format(value).strip()
-        self._writer.writerow([f"{key}: {value}"])
+        self._write_row([f"{key}: {value}"])
 
     def write_table_header(self, columns: Iterable[str]) -> None:
-        self._writer.writerow([])
-        self._writer.writerow(columns)
+        if self._queue is not None:
+            self._check_error()
+            self._queue.put(_TABLE_END)
+        self._write_row([])
+        self._write_row(columns)
 
     def write_table_row(self, columns: Iterable[str]) -> None:
-        self._writer.writerow(columns)
+        self._write_row(columns)
+
+    def _write_row(self, columns: Iterable[str]) -> None:
+        self._check_error()
+        if self._queue is None:
+            self._writer.writerow(columns)
+        else:
+            self._queue.put(list(columns))
+
+    def _check_error(self) -> None:
+        # Keep the error, the file is incomplete after a failed write
+        error = self._error
+        if error is not None:
+            raise RuntimeError(f"background writer failed: {error}") from error
+
+    def _sync(self, fsync: bool) -> None:
+        self._fp.flush()
+        if fsync:
+            try:
+                fileno = self._fp.fileno()
+            except (AttributeError, io.UnsupportedOperation):
+                return
+            os.fsync(fileno)
+
+    def _run(self) -> None:
+        policy = self.flush_policy
+        q = self._queue
+        if q is None:
+            return
+        pending: int = 0
+        deadline: float = 0.0
+        failed: bool = False
+        stopped: bool = False
+        while not stopped:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            try:
+                if item is _STOP:
+                    stopped = True
+                    if not failed and (pending or policy.fsync):
+                        self._sync(policy.fsync)
+                    continue
+                if failed:
+                    continue  # discard rows after error
+                if item is _TABLE_END:
+                    if pending or policy.fsync:
+                        self._sync(policy.fsync)
+                    pending = 0
+                elif item is not None:
+                    self._writer.writerow(item)
+                    if not pending:
+                        deadline = time.monotonic() + policy.interval
+                    pending += 1
+                    if pending >= policy.rows:
+                        self._sync(False)
+                        pending = 0
+                elif pending:
+                    self._sync(False)
+                    pending = 0
+            except Exception as exc:
+                logger.exception("background writer failed")
+                self._error = exc
+                failed = True
@@ -16,6 +16,9 @@ class MockResource:
         self.buffer.append(message)
         return self.buffer.pop(0)
 
+    def read(self) -> str:
+        return self.buffer.pop(0)
+
     def clear(self) -> None: ...
 
 
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import pytest
+
+from diode_measurement.core.aio import (
+    AsyncioResource,
+    AsyncResource,
+    EventLoopThread,
+    is_async_resource,
+)
+from diode_measurement.core.resource import ResourceConfig, ResourceError
+
+
+class EchoServer:
+    """Instrument answering queries with `<message>:<port>` after an optional
+    delay given by `DELAY <seconds>` messages.
+    """
+
+    def __init__(self) -> None:
+        self.delay: float = 0.0
+        self.messages: list[str] = []
+        self.port: int = 0
+
+    async def handle(self, reader, writer) -> None:
+        port = writer.get_extra_info("sockname")[1]
+        while data := await reader.readline():
+            message = data.decode().strip()
+            self.messages.append(message)
+            if message.startswith("DELAY "):
+                self.delay = float(message.split()[1])
+            elif message.endswith("?"):
+                await asyncio.sleep(self.delay)
+                writer.write(f"{message}:{port}\n".encode())
+                await writer.drain()
+        writer.close()
+
+
+@pytest.fixture
+def loop_thread():
+    thread = EventLoopThread()
+    yield thread
+    thread.stop()
+
+
+@pytest.fixture
+def server(loop_thread):
+    echo = EchoServer()
+    server = loop_thread.run(asyncio.start_server(echo.handle, "127.0.0.1", 0))
+    echo.port = server.sockets[0].getsockname()[1]
+    yield echo
+    server.close()
+
+
+def config(port, timeout=1.0):
+    return ResourceConfig(f"TCPIP0::127.0.0.1::{port}::SOCKET", "@py", timeout=timeout)
+
+
+def test_is_async_resource():
+    assert is_async_resource(ResourceConfig("TCPIP0::localhost::1080::SOCKET", "@py"))
+    assert is_async_resource(ResourceConfig("ASRL1::INSTR", "@py"))
+    assert not is_async_resource(ResourceConfig("TCPIP0::localhost::1080::SOCKET", ""))
+    assert not is_async_resource(ResourceConfig("GPIB0::16::INSTR", "@py"))
+
+
+def test_async_resource(loop_thread, server):
+    async def run():
+        async with AsyncResource(config(server.port)) as res:
+            assert res.is_open
+            assert await res.query("*IDN?") == f"*IDN?:{server.port}"
+            assert await res.write("*RST") == 5
+            await res.write("*OPC?")
+            assert await res.read() == f"*OPC?:{server.port}"
+            return res.metrics.snapshot()
+
+    metrics = loop_thread.run(run())
+    assert metrics["count"] == 4
+    assert server.messages == ["*IDN?", "*RST", "*OPC?"]
+
+
+def test_async_resource_timeout(loop_thread, server):
+    async def run():
+        async with AsyncResource(config(server.port, timeout=0.1)) as res:
+            await res.write("DELAY 0.3")
+            with pytest.raises(ResourceError, match="timeout"):
+                await res.query("*IDN?")
+            # Let the instrument complete the response
+            await asyncio.sleep(0.3)
+            await res.write("DELAY 0")
+            # Late response of the timed out query is discarded
+            assert await res.query("A?") == f"A?:{server.port}"
+            return res.metrics.snapshot()
+
+    metrics = loop_thread.run(run())
+    assert metrics["timeouts"] == 1
+
+
+def test_asyncio_resource(loop_thread, server):
+    res = AsyncioResource(config(server.port), loop_thread)
+    with pytest.raises(RuntimeError):
+        res.query("*IDN?")
+    with res:
+        assert res.probe()
+        assert res.query("*IDN?") == f"*IDN?:{server.port}"
+        results = []
+
+        def worker():
+            results.append(res.query("T?"))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [f"T?:{server.port}"] * 4
+    assert not res.probe()
+    assert res.metrics.snapshot()["count"] == 5
+
+
+def test_asyncio_resource_connection_refused(loop_thread):
+    res = AsyncioResource(config(1), loop_thread)
+    with pytest.raises(ResourceError):
+        res.__enter__()
@@ -0,0 +1,97 @@
+import pytest
+
+from diode_measurement.core.completion import CompletionWaiter, service_request_waiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, dt):
+        self.sleeps.append(dt)
+        self.t += dt
+
+
+@pytest.fixture
+def waiter():
+    waiter = CompletionWaiter(min_interval=0.002, max_interval=0.016)
+    waiter._clock = FakeClock()
+    waiter._sleep = waiter._clock.sleep
+    return waiter
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        CompletionWaiter(min_interval=0)
+    with pytest.raises(ValueError):
+        CompletionWaiter(min_interval=0.1, max_interval=0.01)
+    with pytest.raises(ValueError):
+        CompletionWaiter(smoothing=0)
+
+
+def test_backoff(waiter):
+    clock = waiter._clock
+    assert waiter.wait(lambda: clock.t >= 0.05, timeout=1.0, key="a")
+    assert clock.sleeps == pytest.approx([0.002, 0.004, 0.008, 0.016, 0.016, 0.016])
+    assert waiter.expected("a") == pytest.approx(0.062)
+
+
+def test_learn(waiter):
+    clock = waiter._clock
+    waiter._expected["a"] = 0.05
+    assert waiter.wait(lambda: clock.t >= 0.05, timeout=1.0, key="a")
+    assert clock.sleeps == pytest.approx([0.045, 0.002, 0.004])
+    assert waiter.expected("a") == pytest.approx(0.0505)
+    assert waiter.expected("b") is None
+    waiter.reset()
+    assert waiter.expected("a") is None
+
+
+def test_timeout(waiter):
+    clock = waiter._clock
+    assert not waiter.wait(lambda: False, timeout=0.1)
+    assert clock.t == pytest.approx(0.1)
+    assert waiter.expected() is None
+
+
+def test_service_request(waiter):
+    clock = waiter._clock
+    requests = []
+
+    def wait_for_srq(timeout):
+        requests.append(timeout)
+        clock.t += 0.02
+        return True
+
+    assert waiter.wait(lambda: True, timeout=1.0, wait_for_srq=wait_for_srq)
+    assert requests == [1.0]
+    assert clock.sleeps == []
+    assert waiter.expected() == pytest.approx(0.02)
+
+    assert not waiter.wait(lambda: False, timeout=1.0, wait_for_srq=lambda t: False)
+
+
+def test_service_request_timeout(waiter):
+    clock = waiter._clock
+    checks = []
+
+    def wait_for_srq(timeout):
+        clock.t += timeout
+        return False
+
+    def is_complete():
+        checks.append(clock.t)
+        return True
+
+    # Missed service request, operation is complete after all
+    assert waiter.wait(is_complete, timeout=1.0, wait_for_srq=wait_for_srq)
+    assert checks == [1.0]
+    assert clock.sleeps == []
+
+
+def test_service_request_waiter(res):
+    assert service_request_waiter(res) is None
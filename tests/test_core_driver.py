@@ -1,7 +1,103 @@
+from typing import Any
+
+import pytest
+
+from diode_measurement.core.driver import BufferCursor, DriverError, Transaction
 from diode_measurement.core.resource import Resource, ResourceConfig
 
 
+class Adapter:
+    def __init__(self, resource):
+        self._resource = resource
+        self._transaction = None
+        self.error: Any = None
+
+    def next_error(self):
+        return self.error
+
+    def transaction(self):
+        return Transaction(self, max_length=16)
+
+    def write(self, message):
+        if self._transaction is not None:
+            self._transaction.write(message)
+            return
+        self._resource.write(message)
+        self._resource.query("*OPC?")
+
+    def query(self, message):
+        if self._transaction is not None:
+            self._transaction.flush()
+        return self._resource.query(message)
+
+
 def test_base_driver():
     config = ResourceConfig("ASRL4::INSTR")
     resource = Resource(config)
     assert resource.resource_name == "ASRL4::INSTR"
+
+
+def test_transaction(res):
+    d = Adapter(res)
+
+    res.buffer = ["1"]
+    with d.transaction():
+        d.write(":A 1")
+        d.write(":B 2")
+        d.write(":C 3")
+        d.write(":D 4")
+    assert d._transaction is None
+    assert res.buffer == [":A 1;:B 2;:C 3", ":D 4", "*OPC?"]
+
+    res.buffer = ["42", "1"]
+    with d.transaction():
+        d.write(":A 1")
+        assert d.query(":B?") == "42"
+        d.write(":C 3")
+    assert res.buffer == [":A 1", ":B?", ":C 3", "*OPC?"]
+
+    res.buffer = ["1"]
+    with d.transaction():
+        with d.transaction():
+            d.write(":A 1")
+        assert res.buffer == ["1"]
+    assert res.buffer == [":A 1", "*OPC?"]
+
+
+def test_transaction_error(res):
+    d = Adapter(res)
+
+    res.buffer = ["1"]
+    d.error = type("Error", (), {"code": 42, "message": "shrubbery"})()
+    with pytest.raises(DriverError), d.transaction():
+        d.write(":A 1")
+
+    res.buffer = []
+    with pytest.raises(ValueError), d.transaction():
+        d.write(":A 1")
+        raise ValueError()
+    assert res.buffer == []
+    assert d._transaction is None
+
+
+def test_buffer_cursor():
+    cursor = BufferCursor(4)
+    cursor.arm()
+    assert cursor.offset == 0.0
+    assert cursor.advance(0, 10) == (0, 0)
+    assert cursor.advance(3, 2) == (0, 2)
+    assert cursor.advance(3, 2) == (2, 3)
+    assert not cursor.full
+    assert cursor.advance(6, 10) == (3, 4)
+    assert cursor.full
+    assert cursor.timestamp(42.0) == 0.0
+    assert cursor.timestamp(42.5) == 0.5
+    assert cursor.gaps == 0
+    cursor.arm()
+    assert cursor.index == 0
+    assert cursor.offset >= 0.0
+    assert cursor.timestamp(7.0) == cursor.offset
+    assert cursor.gaps == 1
+    cursor.restart()
+    assert cursor.timestamp(0.0) == cursor.offset
+    assert cursor.index == 0
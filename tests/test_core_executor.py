@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from diode_measurement.core.executor import RoleExecutor, RoleExecutorError
+from diode_measurement.core.role import Role
+
+
+def test_sequential():
+    calls = []
+
+    def task(name):
+        def wrapper():
+            calls.append(name)
+            return name
+
+        return wrapper
+
+    executor = RoleExecutor()
+    results = executor.run({Role.SMU: task("smu"), Role.ELM: task("elm")})
+    assert results == {Role.SMU: "smu", Role.ELM: "elm"}
+    assert calls == ["smu", "elm"]
+
+
+def test_sequential_error():
+    def fail():
+        raise ValueError("shrubbery")
+
+    executor = RoleExecutor()
+    with pytest.raises(ValueError):
+        executor.run({Role.SMU: fail})
+
+
+def test_parallel():
+    barrier = threading.Barrier(2, timeout=1.0)
+
+    def task(value):
+        def wrapper():
+            barrier.wait()  # both tasks must run at the same time
+            return value
+
+        return wrapper
+
+    with RoleExecutor(parallel=True, timeout=2.0) as executor:
+        results = executor.run({Role.SMU: task(1), Role.ELM: task(2)})
+    assert results == {Role.SMU: 1, Role.ELM: 2}
+
+
+def test_parallel_errors():
+    def fail():
+        raise ValueError("shrubbery")
+
+    finished = threading.Event()
+
+    def slow():
+        threading.Event().wait(0.3)
+        finished.set()
+
+    with RoleExecutor(parallel=True, timeout=0.1, join_timeout=1.0) as executor:
+        with pytest.raises(RoleExecutorError) as exc_info:
+            executor.run(
+                {
+                    Role.SMU: fail,
+                    Role.ELM: slow,
+                    Role.DMM: lambda: 42,
+                }
+            )
+        # Timed out task must have returned before the error is raised
+        assert finished.is_set()
+    errors = exc_info.value.errors
+    assert set(errors) == {Role.SMU, Role.ELM}
+    assert isinstance(errors[Role.SMU], ValueError)
+    assert isinstance(errors[Role.ELM], TimeoutError)
+
+
+def test_parallel_hung_task():
+    release = threading.Event()
+
+    def hung():
+        release.wait(5.0)
+
+    executor = RoleExecutor(parallel=True, timeout=0.05, join_timeout=0.05)
+    try:
+        start = time.monotonic()
+        with pytest.raises(RoleExecutorError) as exc_info:
+            executor.run({Role.SMU: hung, Role.ELM: lambda: 42})
+        # Join is bounded, the hung worker is abandoned
+        assert time.monotonic() - start < 1.0
+        assert isinstance(exc_info.value.errors[Role.SMU], TimeoutError)
+        results = executor.run({Role.SMU: lambda: 1, Role.ELM: lambda: 2})
+        assert results == {Role.SMU: 1, Role.ELM: 2}
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,187 @@
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import timedelta
+from queue import Queue
+from threading import Event
+from typing import Any
+
+import pytest
+
+from diode_measurement.core.context import State
+from diode_measurement.core.measurement import RangeMeasurement
+from diode_measurement.core.station import Station
+
+
+class Source:
+    def __init__(self) -> None:
+        self.voltage_level: float = 0.0
+
+    def get_voltage_level(self) -> float:
+        return self.voltage_level
+
+    def set_voltage_level(self, level: float) -> None:
+        self.voltage_level = level
+
+
+class RampingSource(Source):
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__()
+        self.fail: bool = fail
+        self.aborted: bool = False
+
+    def start_voltage_ramp(
+        self, begin: float, end: float, rate: float, step: float
+    ) -> None:
+        self.voltage_level = (begin + end) / 2
+
+    def voltage_ramp_running(self) -> bool:
+        if self.fail:
+            raise RuntimeError("ramp failed")
+        return False
+
+    def abort_voltage_ramp(self) -> None:
+        self.aborted = True
+
+
+@pytest.fixture
+def host_ramps() -> list[tuple[float, float]]:
+    return []
+
+
+@pytest.fixture
+def measurement(monkeypatch, host_ramps):
+    measurement = RangeMeasurement.create(State(), Station(), Queue(), Queue(), Event())
+
+    def ramp_voltage_host(begin, end, rate, step, set_voltage, message, interruptible):
+        host_ramps.append((begin, end))
+        set_voltage(end)
+
+    monkeypatch.setattr(measurement, "ramp_voltage_host", ramp_voltage_host)
+    measurement.compliance_status = {}
+    return measurement
+
+
+def test_ramp_voltage_unsupported(measurement, host_ramps):
+    source = Source()
+    levels: list[float] = []
+    measurement.ramp_voltage(source, 0.0, 100.0, levels.append, "Ramp")
+    assert host_ramps == [(0.0, 100.0)]
+    assert levels == [100.0]
+
+
+def test_ramp_voltage_native(measurement, host_ramps):
+    source = RampingSource()
+    levels: list[float] = []
+    measurement.ramp_voltage(source, 0.0, 100.0, levels.append, "Ramp")
+    assert host_ramps == []
+    assert levels == [100.0]
+
+
+def test_ramp_voltage_native_failed(measurement, host_ramps):
+    source = RampingSource(fail=True)
+    levels: list[float] = []
+    measurement.ramp_voltage(
+        source, 100.0, 0.0, levels.append, "Ramp", interruptible=False
+    )
+    assert source.aborted
+    assert host_ramps == [(50.0, 0.0)]
+    assert levels == [50.0, 0.0]
+
+
+def test_ramp_voltage_native_failed_interruptible(measurement, host_ramps):
+    source = RampingSource(fail=True)
+    with pytest.raises(RuntimeError):
+        measurement.ramp_voltage(source, 0.0, 100.0, lambda level: None, "Ramp")
+    assert host_ramps == []
+
+
+class ScriptSource(Source):
+    def __init__(self, rows: list[list[tuple[str, list[float]]]]) -> None:
+        super().__init__()
+        self.rows = rows
+        self.calls: list[tuple[str, Any]] = []
+
+    def set_current_compliance_level(self, level: float) -> None:
+        self.calls.append(("compliance", level))
+
+    def next_error(self) -> None:
+        return None
+
+    def start_script_sweep(
+        self,
+        voltages: Sequence[float],
+        delay: float,
+        ramp_step: float,
+        ramp_delay: float,
+        abort_on_compliance: bool,
+        ramp_down: bool,
+    ) -> None:
+        self.calls.append(("start", (list(voltages), ramp_down)))
+        self.pending = self.rows.pop(0)
+
+    def read_script_sweep(self) -> tuple[str, list[float]]:
+        if not self.pending:
+            raise RuntimeError("read timeout")
+        kind, values = self.pending.pop(0)
+        if kind == "P":
+            self.voltage_level = values[1]
+        elif kind == "R":
+            self.voltage_level = values[0]
+        return kind, values
+
+    def abort_script_sweep(self) -> None:
+        self.calls.append(("abort", self.voltage_level))
+
+
+class Estimate:
+    elapsed = remaining = average = timedelta()
+    total = passed = 0
+
+    def advance(self) -> None:
+        self.passed += 1
+
+
+class Ramp(list):
+    def __init__(self, begin: float, end: float, step: float) -> None:
+        super().__init__(
+            begin + step * i for i in range(round((end - begin) / step) + 1)
+        )
+        self.begin = begin
+        self.end = end
+
+
+def test_script_sweep_chunks(measurement, host_ramps):
+    readings: list[float] = []
+    measurement.acquire_sweep_readings = lambda voltages, results, t: readings.extend(
+        voltages
+    )
+    measurement.state = replace(measurement.state, sweep_chunk_size=2)
+    measurement.current_compliance = 1e-6
+    measurement.context.runtime_state.current_compliance = 2e-6
+    source = ScriptSource(
+        [
+            [("P", [1, 0.0, 0.0, 0.0, 0]), ("P", [2, 1.0, 0.0, 1.0, 0]), ("E", [])],
+            [("P", [1, 2.0, 0.0, 2.0, 0]), ("E", [])],
+        ]
+    )
+    measurement.source_instrument = source
+    measurement.measure_script_sweep(Ramp(0.0, 2.0, 1.0), Estimate())
+    assert source.calls == [
+        ("compliance", 2e-6),
+        ("start", ([0.0, 1.0], False)),
+        ("start", ([2.0], True)),
+    ]
+    assert readings == [0.0, 1.0, 2.0]
+    assert host_ramps == []
+
+
+def test_script_sweep_abort(measurement, host_ramps):
+    measurement.acquire_sweep_readings = lambda voltages, results, t: None
+    measurement.current_compliance = 1e-6
+    measurement.context.runtime_state.current_compliance = 1e-6
+    source = ScriptSource([[("P", [1, 0.0, 0.0, 0.0, 0]), ("R", [0.5])]])
+    measurement.source_instrument = source
+    with pytest.raises(RuntimeError):
+        measurement.measure_script_sweep(Ramp(0.0, 1.0, 1.0), Estimate())
+    assert source.calls == [("start", ([0.0, 1.0], True)), ("abort", 0.5)]
+    assert host_ramps == [(0.5, 0.0)]
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from diode_measurement.core.metrics import IOMetrics, LatencyHistogram, command_prefix
+
+
+def test_command_prefix():
+    assert command_prefix("*IDN?") == "*IDN?"
+    assert command_prefix(":MEAS:CURR? (@1)") == ":MEAS:CURR?"
+    assert command_prefix("smua.source.levelv = 1.0") == "smua.source.levelv"
+    assert command_prefix("print(smua.measure.i())") == "smua.measure.i"
+    assert command_prefix("print(smua.source.levelv)") == "smua.source.levelv"
+    assert command_prefix("printbuffer(1, 2, smua.nvbuffer1)") == "printbuffer"
+    assert command_prefix("  :SOUR:VOLT 1,2") == ":SOUR:VOLT"
+    assert command_prefix("") == "<empty>"
+    assert command_prefix("x" * 64, max_length=8) == "x" * 8
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0
+    for value in range(1, 101):
+        histogram.add(value * 1e-3)
+    assert histogram.count == 100
+    assert histogram.total == pytest.approx(5.05)
+    assert histogram.max == pytest.approx(0.1)
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.1)
+    assert histogram.percentile(95) == pytest.approx(0.095, rel=0.1)
+    assert histogram.percentile(100) == pytest.approx(0.1)
+    histogram.add(0.0)
+    assert histogram.buckets[0] == 1
+
+
+def test_io_metrics():
+    metrics = IOMetrics()
+    metrics.record(":READ?", 6, 28, 0.050)
+    metrics.record(":READ?", 6, 28, 0.040)
+    metrics.record("*OPC?", 5, 2, 0.001)
+    metrics.record_timeout(":READ?")
+    metrics.record_reconnect()
+    snapshot = metrics.snapshot()
+    assert snapshot["count"] == 3
+    assert snapshot["timeouts"] == 1
+    assert snapshot["reconnects"] == 1
+    assert list(snapshot["commands"]) == ["*OPC?", ":READ?"]
+    command = snapshot["commands"][":READ?"]
+    assert command["count"] == 2
+    assert command["bytes_written"] == 12
+    assert command["bytes_read"] == 56
+    assert command["timeouts"] == 1
+    assert command["total"] == pytest.approx(0.090)
+    assert command["max"] == pytest.approx(0.050)
+    metrics.reset()
+    assert metrics.snapshot() == {
+        "count": 0,
+        "timeouts": 0,
+        "reconnects": 0,
+        "commands": {},
+    }
+
+
+def test_io_metrics_threads():
+    metrics = IOMetrics()
+
+    def target():
+        for _ in range(1000):
+            metrics.record("*OPC?", 5, 2, 0.001)
+
+    threads = [threading.Thread(target=target) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()["commands"]["*OPC?"]["count"] == 4000
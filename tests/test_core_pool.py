@@ -0,0 +1,136 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import cast
+
+import pytest
+
+from diode_measurement.core.pool import SessionPool, is_session_error
+from diode_measurement.core.resource import Resource, ResourceConfig, ResourceError
+
+
+class FakeResource(Resource):
+    def __init__(self, resource_config: ResourceConfig) -> None:
+        super().__init__(resource_config)
+        self.is_open: bool = False
+        self.healthy: bool = True
+        self.open_count: int = 0
+
+    def __enter__(self):
+        self.is_open = True
+        self.open_count += 1
+        return self
+
+    def __exit__(self, *args):
+        self.is_open = False
+        return False
+
+    def probe(self):
+        return self.is_open and self.healthy
+
+
+@contextmanager
+def lease(pool: SessionPool, resource: FakeResource) -> Iterator[FakeResource]:
+    with pool.lease(resource) as leased:
+        yield cast(FakeResource, leased)
+
+
+def test_session_pool_reuse():
+    pool = SessionPool()
+    config = ResourceConfig("GPIB0::16::INSTR")
+
+    with lease(pool, FakeResource(config)) as first:
+        assert first.is_open
+    assert first.is_open
+    assert len(pool) == 1
+
+    with lease(pool, FakeResource(config)) as second:
+        assert second is first
+    assert first.open_count == 1
+
+    pool.close()
+    assert not first.is_open
+    assert len(pool) == 0
+
+
+def test_session_pool_unhealthy():
+    pool = SessionPool()
+    config = ResourceConfig("GPIB0::16::INSTR")
+
+    with lease(pool, FakeResource(config)) as first:
+        first.healthy = False
+
+    with lease(pool, FakeResource(config)) as second:
+        assert second is not first
+        assert second.is_open
+    assert not first.is_open
+
+
+def test_session_pool_changed_settings():
+    pool = SessionPool()
+
+    with lease(pool, FakeResource(ResourceConfig("ASRL1::INSTR"))) as first:
+        ...
+    with lease(pool, FakeResource(ResourceConfig("ASRL2::INSTR"))) as other:
+        ...
+    config = ResourceConfig("ASRL1::INSTR", timeout=8.0)
+    with lease(pool, FakeResource(config)) as second:
+        assert second is not first
+    assert not first.is_open
+    assert other.is_open
+    assert len(pool) == 2
+
+    pool.evict("ASRL2::INSTR")
+    assert not other.is_open
+    assert len(pool) == 1
+
+
+def test_session_pool_discard_on_error():
+    pool = SessionPool()
+    config = ResourceConfig("GPIB0::16::INSTR")
+
+    with pytest.raises(ResourceError), lease(pool, FakeResource(config)) as first:
+        raise ResourceError("timeout")
+    assert not first.is_open
+    assert len(pool) == 0
+
+
+def test_session_pool_discard_failed():
+    pool = SessionPool()
+    config = ResourceConfig("GPIB0::16::INSTR")
+
+    # Errors handled inside the lease mark the session as failed
+    with lease(pool, FakeResource(config)) as first:
+        first.failed = True
+    assert not first.is_open
+    assert not first.failed
+    assert len(pool) == 0
+
+    with pytest.raises(RuntimeError), lease(pool, FakeResource(config)) as second:
+        raise RuntimeError("failed") from ResourceError("timeout")
+    assert not second.is_open
+
+    with pytest.raises(RuntimeError), lease(pool, FakeResource(config)) as third:
+        raise RuntimeError("compliance")
+    assert third.is_open
+    assert len(pool) == 1
+
+
+def test_is_session_error():
+    assert is_session_error(ResourceError())
+    assert is_session_error(ConnectionResetError())
+    assert not is_session_error(RuntimeError())
+    try:
+        try:
+            raise ResourceError("timeout")
+        except ResourceError:
+            raise RuntimeError("failed")
+    except RuntimeError as exc:
+        assert is_session_error(exc)
+
+
+def test_session_pool_in_use():
+    pool = SessionPool()
+    config = ResourceConfig("GPIB0::16::INSTR")
+
+    with lease(pool, FakeResource(config)), pytest.raises(ResourceError):
+        pool.acquire(FakeResource(config))
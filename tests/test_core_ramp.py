@@ -0,0 +1,80 @@
+import math
+
+import pytest
+
+from diode_measurement.core.ramp import AdaptiveRange
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        AdaptiveRange(0, 10, 0, 1)
+    with pytest.raises(ValueError):
+        AdaptiveRange(0, 10, 1, 1, tolerance=-1)
+
+
+def test_len():
+    assert len(AdaptiveRange(0, 10, 1, 5)) == 11
+    assert len(AdaptiveRange(0, 10, 3, 5)) == 5
+    assert len(AdaptiveRange(0, -10, 1, 5)) == 11
+    assert len(AdaptiveRange(5, 5, 1, 5)) == 1
+
+
+def test_without_feedback():
+    assert list(AdaptiveRange(0, 5, 1, 4)) == [0, 1, 2, 3, 4, 5]
+    assert list(AdaptiveRange(0, -2.5, 1, 4)) == [0, -1, -2, -2.5]
+    assert list(AdaptiveRange(5, 5, 1, 4)) == [5]
+
+
+def test_linear_coarsening():
+    r = AdaptiveRange(0, 40, 1, 8)
+    voltages = []
+    for voltage in r:
+        voltages.append(voltage)
+        r.feed(1e-9 * voltage)
+    assert voltages == [0, 1, 2, 4, 8, 16, 24, 32, 40]
+    assert r.step == 8
+
+
+def test_refine_on_knee():
+    def measure(voltage):
+        if voltage < 20:
+            return 1e-9 * voltage
+        return 1e-9 * voltage * math.exp(voltage - 20)  # breakdown
+
+    r = AdaptiveRange(0, 30, 1, 8)
+    voltages = []
+    counts = []
+    for voltage in r:
+        voltages.append(voltage)
+        counts.append(r.last_step_count)
+        r.feed(measure(voltage))
+    # Step returns to the minimum step after the knee, never backwards
+    assert voltages == [0, 1, 2, 4, 8, 16, 24, 25, 26, 27, 28, 29, 30]
+    assert counts == [1, 1, 1, 2, 4, 8, 8, *[1] * 6]
+    assert sum(counts) == len(r)
+
+    # Knee at the end, the ramp finishes at the end point
+    r = AdaptiveRange(0, -24, 1, 8)
+    voltages = []
+    for voltage in r:
+        voltages.append(voltage)
+        r.feed(measure(abs(voltage)))
+    assert voltages == [0, -1, -2, -4, -8, -16, -24]
+
+    # Ramp is strictly monotonic and samples every point once
+    r = AdaptiveRange(0, 30, 1, 8)
+    voltages = []
+    for voltage in r:
+        voltages.append(voltage)
+        r.feed(measure(voltage) if voltage < 10 else 1e-9 * voltage**3)
+    assert voltages == sorted(set(voltages))
+    assert voltages[-1] == 30
+
+
+def test_ignore_nan():
+    r = AdaptiveRange(0, 4, 1, 4)
+    voltages = []
+    for voltage in r:
+        voltages.append(voltage)
+        r.feed(float("nan"))
+    assert voltages == [0, 1, 2, 3, 4]
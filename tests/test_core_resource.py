@@ -1,4 +1,21 @@
-from diode_measurement.core.resource import Resource, ResourceConfig, parse_resource
+import random
+import time
+from typing import cast
+
+import pytest
+import pyvisa
+from pyvisa.constants import StatusCode
+from pyvisa.resources import MessageBasedResource
+
+from diode_measurement.core.resource import (
+    AutoReconnectResource,
+    ReconnectError,
+    Resource,
+    ResourceConfig,
+    ResourceError,
+    ResourceManagerRegistry,
+    parse_resource,
+)
 
 
 def test_parse_resource():
@@ -16,6 +33,7 @@ def test_parse_resource():
         "TCPIP::192.168.0.1::1080::SOCKET",
         "@py",
     )
+    assert parse_resource("sim:smu") == ("SIM::smu::INSTR", "@sim")
 
 
 def test_resource_config():
@@ -31,3 +49,155 @@ def test_resource():
     res = Resource(cfg)
     assert res._resource_config == cfg
     assert res.resource_name == "TCPIP::localhost:8080::SOCKET"
+
+
+class FakeResourceManager:
+    def __init__(self, visa_library):
+        self.visa_library = visa_library
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_resource_manager_registry():
+    registry = ResourceManagerRegistry()
+    registry._factory = cast(type[pyvisa.ResourceManager], FakeResourceManager)
+
+    rm = cast(FakeResourceManager, registry.acquire("@py"))
+    assert registry.acquire("@py") is rm
+    assert registry.refcount("@py") == 2
+    other = cast(FakeResourceManager, registry.acquire(""))
+    assert other is not rm
+
+    registry.release("@py")
+    registry.release("")
+    registry.close_idle()
+    assert not rm.closed
+    assert other.closed
+
+    with registry.manager("@py") as managed:
+        assert managed is rm
+    assert registry.refcount("@py") == 1
+
+    registry.release("@py")
+    registry.close_idle()
+    assert rm.closed
+    assert registry.acquire("@py") is not rm
+
+    with pytest.raises(RuntimeError):
+        registry.release("@ivi")
+
+
+class FakeMessageResource:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def query(self, message):
+        return self.responses.pop(0)
+
+    def write(self, message):
+        return len(message) + 1
+
+    def read(self):
+        raise pyvisa.VisaIOError(StatusCode.error_timeout)
+
+
+def fake_message_resource(responses) -> MessageBasedResource:
+    return cast(MessageBasedResource, FakeMessageResource(responses))
+
+
+def test_resource_metrics():
+    res = Resource(ResourceConfig("GPIB0::16::INSTR", termination="\n"))
+    res._resource = fake_message_resource(["Keithley"])
+    assert res.query("*IDN?") == "Keithley"
+    assert res.write(":SOUR:VOLT 1.0") == 15
+    with pytest.raises(ResourceError):
+        res.read()
+    snapshot = res.metrics.snapshot()
+    assert snapshot["count"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["commands"]["*IDN?"]["bytes_written"] == 6
+    assert snapshot["commands"]["*IDN?"]["bytes_read"] == 9
+    assert snapshot["commands"][":SOUR:VOLT"]["bytes_written"] == 15
+    assert snapshot["commands"]["<read>"]["count"] == 0
+    assert snapshot["commands"]["<read>"]["timeouts"] == 1
+
+
+class FlakyResource(AutoReconnectResource):
+    """Resource failing the first query of a session."""
+
+    def __enter__(self):
+        self.sessions = getattr(self, "sessions", 0) + 1
+        self._resource = fake_message_resource(["Keithley"])
+        return self
+
+    def __exit__(self, *args):
+        self._resource = None
+        return False
+
+    def query(self, message):
+        def target():
+            if self.sessions < 2:
+                raise ResourceError("connection reset")
+            return super(AutoReconnectResource, self).query(message)
+
+        return self._reconnect_retry(target)
+
+
+def test_auto_reconnect_backoff(monkeypatch):
+    res = AutoReconnectResource(ResourceConfig("TCPIP0::localhost::1080::SOCKET"))
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    assert [res.retry_backoff(attempt) for attempt in range(1, 7)] == [
+        0.5,
+        1.0,
+        2.0,
+        4.0,
+        8.0,
+        8.0,
+    ]
+    monkeypatch.setattr(random, "random", lambda: 1.0)
+    assert res.retry_backoff(2) == 0.5
+
+
+def test_auto_reconnect_restore(monkeypatch):
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    res = FlakyResource(ResourceConfig("TCPIP0::localhost::1080::SOCKET"))
+    res.retry_jitter = 0.0
+    restored = []
+    res.on_reconnect = lambda: restored.append(res.write(":SOUR:VOLT:LEV -10"))
+    with res:
+        assert res.query("*IDN?") == "Keithley"
+    assert res.sessions == 2
+    assert delays == [0.5]
+    assert restored == [19]
+    assert res.metrics.snapshot()["reconnects"] == 1
+
+
+def test_auto_reconnect_restore_failed(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda delay: None)
+    res = FlakyResource(ResourceConfig("TCPIP0::localhost::1080::SOCKET"))
+    res.retry_attempts = 2
+
+    def restore():
+        raise RuntimeError("configure failed")
+
+    res.on_reconnect = restore
+    with res, pytest.raises(ResourceError, match="failed to restore"):
+        res.query("*IDN?")
+    assert res.sessions == 3
+
+
+def test_auto_reconnect_restore_not_retried(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda delay: None)
+    res = FlakyResource(ResourceConfig("TCPIP0::localhost::1080::SOCKET"))
+
+    def restore():
+        raise ReconnectError("sweep running")
+
+    res.on_reconnect = restore
+    with res, pytest.raises(ReconnectError, match="sweep running"):
+        res.query("*IDN?")
+    assert res.sessions == 2
+    assert res.failed
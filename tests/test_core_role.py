@@ -0,0 +1,12 @@
+from diode_measurement.core.role import configure_fingerprint
+
+
+def test_configure_fingerprint():
+    options = {"nplc": 1.0, "filter": {"enable": True, "count": 10}}
+    fingerprint = configure_fingerprint("K2410", "Keithley 2410", options)
+    assert fingerprint == configure_fingerprint(
+        "K2410", "Keithley 2410", {"filter": {"count": 10, "enable": True}, "nplc": 1.0}
+    )
+    assert fingerprint != configure_fingerprint("K2410", "Keithley 2410", {})
+    assert fingerprint != configure_fingerprint("K2410", "Keithley 2400", options)
+    assert fingerprint != configure_fingerprint("K2470", "Keithley 2410", options)
@@ -0,0 +1,69 @@
+import math
+import time
+
+import pytest
+
+from diode_measurement.core.settle import SettleDetector
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, dt):
+        self.t += dt
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    monkeypatch.setattr(time, "sleep", clock.advance)
+    return clock
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SettleDetector(tolerance=-1, interval=0.1)
+    with pytest.raises(ValueError):
+        SettleDetector(tolerance=0.01, interval=0)
+    with pytest.raises(ValueError):
+        SettleDetector(tolerance=0.01, interval=0.1, min_time=-1)
+    with pytest.raises(ValueError):
+        SettleDetector(tolerance=0.01, interval=0.1, min_time=2, max_time=1)
+
+
+def test_is_settled():
+    d = SettleDetector(tolerance=0.01, interval=0.1)
+    assert d.is_settled(1.0, 1.005)
+    assert d.is_settled(0.0, 0.0)
+    assert not d.is_settled(1.0, 1.1)
+    assert not d.is_settled(math.nan, 1.0)
+
+
+def test_wait_settled(clock):
+    readings = iter([1.0, 0.5, 0.3, 0.299])
+    d = SettleDetector(tolerance=0.01, interval=0.1, max_time=10.0)
+    assert d.wait(lambda: next(readings)) == pytest.approx(0.3)
+
+
+def test_wait_min_time(clock):
+    d = SettleDetector(tolerance=0.01, interval=0.1, min_time=0.5, max_time=10.0)
+    assert d.wait(lambda: 1.0) == pytest.approx(0.5)
+
+
+def test_wait_max_time(clock):
+    values = iter(range(1, 1000))
+    d = SettleDetector(tolerance=0.01, interval=0.1, max_time=1.0)
+    assert d.wait(lambda: float(next(values))) == pytest.approx(1.0)
+
+
+def test_wait_abort(clock):
+    d = SettleDetector(tolerance=0.0, interval=0.1, max_time=10.0)
+    values = iter(range(1, 1000))
+    assert d.wait(lambda: float(next(values)), abort=lambda: clock.t >= 0.2) == (
+        pytest.approx(0.2)
+    )
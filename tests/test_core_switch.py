@@ -0,0 +1,56 @@
+from diode_measurement.core.context import State
+from diode_measurement.core.role import Role, RoleConfig
+from diode_measurement.core.switch import (
+    channel_group_delay,
+    channel_groups,
+    format_channel_groups,
+    parse_channel_groups,
+    static_channels,
+)
+
+
+def switch_state(enabled: bool, options: dict) -> State:
+    role_config = RoleConfig(
+        enabled=enabled,
+        model="K707B",
+        resource_name="",
+        visa_library="",
+        termination="",
+        timeout=4.0,
+        reset_instrument=False,
+        options=options,
+    )
+    return State(roles={Role.SWITCH: role_config})
+
+
+def test_parse_channel_groups():
+    assert parse_channel_groups("") == []
+    assert parse_channel_groups("1A01") == [["1A01"]]
+    assert parse_channel_groups("1A01, 1B01; 1A02") == [["1A01", "1B01"], ["1A02"]]
+    assert parse_channel_groups("1A01 1B01\n\n 1A02,\n") == [
+        ["1A01", "1B01"],
+        ["1A02"],
+    ]
+
+
+def test_format_channel_groups():
+    groups = [["1A01", "1B01"], ["1A02"]]
+    assert format_channel_groups(groups) == "1A01, 1B01; 1A02"
+    assert format_channel_groups(groups, "\n") == "1A01, 1B01\n1A02"
+    assert parse_channel_groups(format_channel_groups(groups)) == groups
+
+
+def test_channel_groups():
+    assert channel_groups(State()) == []
+    options = {"channel_groups": [["1A01"], [], ["1A02"]], "channel_group_delay": 0.5}
+    assert channel_groups(switch_state(True, options)) == [["1A01"], ["1A02"]]
+    assert channel_groups(switch_state(False, options)) == []
+    assert channel_group_delay(switch_state(True, options)) == 0.5
+    assert channel_group_delay(State()) == 0.0
+
+
+def test_static_channels():
+    assert static_channels(State()) == []
+    options = {"channels": ["1A01", "1B01"], "channel_groups": [["1A01", "1C01"]]}
+    assert static_channels(switch_state(True, options)) == ["1A01", "1B01"]
+    assert static_channels(switch_state(False, options)) == []
@@ -2,7 +2,7 @@ import time
 
 import pytest
 
-from diode_measurement.core.timers import IntervalTimer
+from diode_measurement.core.timers import DeadlineScheduler, IntervalTimer
 
 
 class FakeClock:
@@ -61,3 +61,65 @@ def test_zero_interval(clock):
     t = IntervalTimer(0)
     assert t
     assert t.remaining() == 0
+
+
+def test_deadline_negative_period():
+    with pytest.raises(ValueError):
+        DeadlineScheduler(-1)
+
+
+def test_deadline_no_drift(clock):
+    s = DeadlineScheduler(2)
+    assert s.remaining() == 0
+
+    for tick in range(1, 5):
+        clock.advance(0.5)  # acquisition time
+        assert s.advance() == 0
+        assert s.remaining() == 1.5
+        clock.advance(s.remaining())
+        assert clock.t == tick * 2
+
+    assert s.overruns == 0
+    assert s.skipped == 0
+
+
+def test_deadline_overrun(clock):
+    s = DeadlineScheduler(1)
+
+    clock.advance(2.5)
+    assert s.advance() == 2
+    assert s.deadline == 3
+    assert s.remaining() == 0.5
+    assert s.overruns == 1
+    assert s.skipped == 2
+
+
+def test_deadline_reset(clock):
+    s = DeadlineScheduler(1)
+
+    clock.advance(0.25)
+    s.advance()
+    s.reset(4)
+    assert s.period == 4
+    assert s.deadline == 0.25
+    s.advance()
+    assert s.remaining() == 4
+
+
+def test_deadline_aligned(clock, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1000.75 + clock.t)
+    s = DeadlineScheduler(1)
+
+    s.reset(aligned=True)
+    assert s.deadline == -0.75
+    assert s.advance() == 0
+    assert s.remaining() == 0.25
+
+
+def test_deadline_zero_period(clock):
+    s = DeadlineScheduler(0)
+
+    clock.advance(10)
+    assert s.advance() == 0
+    assert s.remaining() == 0
+    assert s.overruns == 0
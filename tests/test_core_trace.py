@@ -0,0 +1,115 @@
+import io
+
+import pytest
+
+from diode_measurement.core.resource import (
+    ReplayResource,
+    ResourceConfig,
+    ResourceError,
+)
+from diode_measurement.core.trace import (
+    ReplayTrace,
+    TraceError,
+    TraceOp,
+    TraceRecord,
+    TraceRecorder,
+    read_trace,
+)
+
+
+def record(op, message="", response="", resource_name="GPIB0::16::INSTR", **kwargs):
+    return TraceRecord(
+        op=op,
+        resource_name=resource_name,
+        message=message,
+        response=response,
+        timestamp=0.0,
+        elapsed=0.0,
+        **kwargs,
+    )
+
+
+def test_trace_recorder():
+    fp = io.BytesIO()
+    recorder = TraceRecorder(fp)
+    recorder.record(TraceOp.QUERY, "GPIB0::16::INSTR", "*IDN?", "Keithley", 0.0, 0.01)
+    recorder.record(TraceOp.WRITE, "GPIB0::17::INSTR", "*RST", "", 0.0, 0.002)
+    recorder.record(TraceOp.READ, "GPIB0::16::INSTR", "", "", 0.0, 4.0, timeout=True)
+    recorder.record(TraceOp.CLEAR, "GPIB0::16::INSTR", "", "", 0.0, 0.001)
+    fp.seek(0)
+    records = list(read_trace(fp))
+    assert [r.op for r in records] == [
+        TraceOp.QUERY,
+        TraceOp.WRITE,
+        TraceOp.READ,
+        TraceOp.CLEAR,
+    ]
+    assert records[0].resource_name == "GPIB0::16::INSTR"
+    assert records[0].message == "*IDN?"
+    assert records[0].response == "Keithley"
+    assert records[0].elapsed == pytest.approx(0.01)
+    assert records[1].resource_name == "GPIB0::17::INSTR"
+    assert not records[1].timeout
+    assert records[2].timeout
+
+
+def test_read_trace_invalid():
+    with pytest.raises(TraceError):
+        list(read_trace(io.BytesIO(b"invalid!")))
+    fp = io.BytesIO()
+    TraceRecorder(fp).record(TraceOp.WRITE, "COM1", "*RST", "", 0.0, 0.0)
+    with pytest.raises(TraceError):
+        list(read_trace(io.BytesIO(fp.getvalue()[:-2])))
+
+
+def test_replay_resource():
+    replay = ReplayTrace(
+        [
+            record(TraceOp.QUERY, "*IDN?", "Keithley"),
+            record(TraceOp.WRITE, "*RST"),
+            record(TraceOp.CLEAR),
+            record(TraceOp.READ, response="42"),
+            record(TraceOp.READ, timeout=True),
+            record(TraceOp.WRITE, "*CLS", resource_name="COM1"),
+        ]
+    )
+    assert replay.resource_names() == ["GPIB0::16::INSTR", "COM1"]
+    with ReplayResource(ResourceConfig("GPIB0::16::INSTR"), replay) as res:
+        assert res.probe()
+        assert res.query("*IDN?") == "Keithley"
+        assert res.write("*RST") == 5
+        res.clear()
+        assert res.read() == "42"
+        with pytest.raises(ResourceError):
+            res.read()
+        with pytest.raises(ResourceError):
+            res.read()
+        metrics = res.metrics.snapshot()
+        assert metrics["count"] == 3
+        assert metrics["timeouts"] == 1
+    assert not res.probe()
+    assert replay.remaining("GPIB0::16::INSTR") == 0
+    assert replay.remaining("COM1") == 1
+
+
+def test_replay_resource_mismatch():
+    replay = ReplayTrace([record(TraceOp.QUERY, "*IDN?", "Keithley")])
+    with ReplayResource(ResourceConfig("GPIB0::16::INSTR"), replay) as res:
+        with pytest.raises(ResourceError):
+            res.query("*OPC?")
+        with pytest.raises(ResourceError):
+            res.write("*IDN?")
+        assert res.query("*IDN?") == "Keithley"
+
+
+def test_replay_resource_records_trace():
+    replay = ReplayTrace([record(TraceOp.QUERY, "*IDN?", "Keithley")])
+    fp = io.BytesIO()
+    with ReplayResource(ResourceConfig("GPIB0::16::INSTR"), replay) as res:
+        res.trace = TraceRecorder(fp)
+        res.query("*IDN?")
+    fp.seek(0)
+    (traced,) = read_trace(fp)
+    assert traced.op == TraceOp.QUERY
+    assert traced.message == "*IDN?"
+    assert traced.response == "Keithley"
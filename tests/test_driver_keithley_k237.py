@@ -69,9 +69,17 @@ def test_k237_adapter(res):
     assert d.measure_i() == 0.00421
     assert res.buffer == ["G4,2,0X", "X"]
 
-    res.buffer = ["+4.210000E-03", "+4.200000E+01"]
+    res.buffer = ["+4.200000E+01,+4.210000E-03"]
     assert d.measure_iv() == (0.00421, 42.0)
-    assert res.buffer == ["G4,2,0X", "X", "G1,2,0X", "X"]
+    assert res.buffer == ["G5,2,0X", "X"]
+
+    res.buffer = ["NSDCV+4.200000E+01,NMDCI+4.210000E-03"]
+    assert d.measure_iv_compliance() == (0.00421, 42.0, False)
+    assert res.buffer == ["G5,1,0X", "X"]
+
+    res.buffer = ["OSDCV+4.200000E+01,NMDCI+1.000000E-03"]
+    assert d.measure_iv_compliance() == (0.001, 42.0, True)
+    assert res.buffer == ["G5,1,0X", "X"]
 
     assert d._voltage_range(0.1) == 1
     assert d._voltage_range(2.0) == 2
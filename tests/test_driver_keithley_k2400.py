@@ -95,3 +95,154 @@ def test_k2400_adapter(res):
     res.buffer = ["1"]
     assert d.set_sense_current_nplc(4.2) is None
     assert res.buffer == [":SENS:CURR:NPLC 4.200000E+00", "*OPC?"]
+
+
+def test_k2400_adapter_sweep_iv(res):
+    d = K2400Adapter(res)
+
+    res.buffer = [
+        "1",
+        "+0.000000E+00",
+        "1",
+        "1",
+        "1",
+        "1",
+        "1",
+        "1",
+        "1",
+        (
+            "+1.000000E+00,+1.000000E-09,+1.500000E+00,"
+            "+2.000000E+00,+2.000000E-09,+2.000000E+00"
+        ),
+        "1",
+        "1",
+        "1",
+        "1",
+        "1",
+    ]
+    assert d.sweep_iv([1.0, 2.0], 0.5) == [(0.0, 1e-09, 1.0), (0.5, 2e-09, 2.0)]
+    assert res.buffer == [
+        ":FORM:ELEM VOLT,CURR,TIME",
+        "*OPC?",
+        ":SOUR:DEL?",
+        ":SOUR:DEL:AUTO?",
+        ":SOUR:LIST:VOLT 1.000E+00,2.000E+00",
+        "*OPC?",
+        ":SOUR:DEL 5.000E-01",
+        "*OPC?",
+        ":TRIG:COUN 2",
+        "*OPC?",
+        ":SOUR:VOLT:MODE LIST",
+        "*OPC?",
+        "*CLS",
+        "*OPC?",
+        "*OPC",
+        ":INIT",
+        "*ESR?",
+        ":FETC?",
+        ":SOUR:VOLT:LEV 2.000E+00",
+        "*OPC?",
+        ":SOUR:VOLT:MODE FIX",
+        "*OPC?",
+        ":TRIG:COUN 1",
+        "*OPC?",
+        ":SOUR:DEL +0.000000E+00",
+        "*OPC?",
+        ":SOUR:DEL:AUTO 1",
+        "*OPC?",
+    ]
+
+
+def test_k2400_adapter_sweep_iv_abort_on_compliance(res):
+    d = K2400Adapter(res)
+
+    res.buffer = [
+        "1",
+        "+0.000000E+00",
+        "1",
+        *["1"] * 7,
+        "+1.000000E+00,+1.000000E-09,+1.500000E+00",
+        *["1"] * 6,
+    ]
+    assert d.sweep_iv([1.0, 2.0], 0.5, True) == [(0.0, 1e-09, 1.0)]
+    assert ":SOUR:SWE:CAB EARL" in res.buffer
+    assert res.buffer[res.buffer.index(":FETC?") + 1] == ":SOUR:VOLT:LEV 1.000E+00"
+    assert res.buffer[-2:] == [":SOUR:SWE:CAB NEV", "*OPC?"]
+
+
+def test_k2400_adapter_read_i_buffered(res):
+    d = K2400Adapter(res)
+    d.max_buffer_points = 2
+
+    arm = [
+        ":TRAC:FEED:CONT NEV",
+        "*OPC?",
+        ":TRAC:CLE",
+        "*OPC?",
+        ":TRAC:POIN 2",
+        "*OPC?",
+        ":TRAC:TST:FORM ABS",
+        "*OPC?",
+        ":TRAC:FEED SENS",
+        "*OPC?",
+        ":TRAC:FEED:CONT NEXT",
+        "*OPC?",
+        ":TRIG:COUN 2",
+        "*OPC?",
+        ":INIT",
+    ]
+
+    res.buffer = ["1", "+1.000000E-01", *["1"] * 8]
+    d.start_i_buffered(0.01)
+    assert res.buffer == [
+        ":FORM:ELEM CURR,TIME",
+        "*OPC?",
+        ":TRIG:DEL?",
+        ":TRIG:DEL 1.000E-02",
+        "*OPC?",
+        *arm,
+    ]
+
+    res.buffer = ["0"]
+    assert d.read_i_buffered(10) == []
+    assert res.buffer == [":TRAC:POIN:ACT?"]
+
+    # Buffer is cleared after every fetch
+    fetch = ":TRAC:DATA?;:TRAC:CLE;:TRAC:FEED:CONT NEXT"
+    res.buffer = ["1", "+1.000000E-09,+4.200000E+01"]
+    assert d.read_i_buffered(10) == [(0.0, 1e-09)]
+    assert res.buffer == [":TRAC:POIN:ACT?", fetch]
+
+    # Timestamps restart after clear, re-arm after trigger count
+    res.buffer = ["1", "+2.000000E-09,+0.000000E+00", *["1"] * 7]
+    assert d.read_i_buffered(10) == [(pytest.approx(0.0, abs=0.1), 2e-09)]
+    assert res.buffer == [":TRAC:POIN:ACT?", fetch, *arm]
+    assert d.i_buffered_gaps() == 1
+
+    res.buffer = ["1"] * 3
+    d.stop_i_buffered()
+    assert res.buffer == [
+        ":ABOR",
+        ":TRAC:FEED:CONT NEV",
+        "*OPC?",
+        ":TRIG:COUN 1",
+        "*OPC?",
+        ":TRIG:DEL +1.000000E-01",
+        "*OPC?",
+    ]
+
+
+def test_k2400_adapter_measure_iv_compliance(res):
+    d = K2400Adapter(res)
+
+    res.buffer = ["1", "+4.200000E+01,+1.000000E-09,+1.280800E+04"]
+    assert d.measure_iv_compliance() == (1e-09, 42.0, True)
+    assert res.buffer == [":FORM:ELEM VOLT,CURR,STAT", "*OPC?", ":READ?"]
+
+    res.buffer = ["+4.200000E+01,+1.000000E-09,+1.280000E+04"]
+    assert d.measure_iv_compliance() == (1e-09, 42.0, False)
+    assert res.buffer == [":READ?"]
+
+    res.buffer = ["+4.200000E+01,+1.000000E-09,+1.280000E+04"]
+    assert d.measure_iv() == (1e-09, 42.0)
+    assert res.buffer == [":READ?"]
@@ -114,3 +114,181 @@ def test_k2470_adapter(res):
     res.buffer = ["1"]
     assert d.is_interlock() is True
     assert res.buffer == [":OUTP:INT:TRIP?"]
+
+
+def test_k2470_adapter_sweep_iv(res):
+    d = K2470Adapter(res)
+
+    res.buffer = [
+        "1",
+        "1",
+        "1",
+        "IDLE;IDLE;1",
+        (
+            "+1.000000E+00,+1.000000E-09,+0.000000E+00,"
+            "+2.000000E+00,+2.000000E-09,+5.000000E-01"
+        ),
+        "1",
+    ]
+    assert d.sweep_iv([1.0, 2.0], 0.5) == [(0.0, 1e-09, 1.0), (0.5, 2e-09, 2.0)]
+    assert res.buffer == [
+        ':TRAC:CLE "defbuffer1"',
+        "*OPC?",
+        ":SOUR:LIST:VOLT 1.000E+00,2.000E+00",
+        "*OPC?",
+        ':SOUR:SWE:VOLT:LIST 1, 5.000E-01, 1, OFF, "defbuffer1"',
+        "*OPC?",
+        ":INIT",
+        ":TRIG:STAT?",
+        ':TRAC:DATA? 1, 2, "defbuffer1", SOUR, READ, REL',
+        ":SOUR:VOLT:LEV 2.000E+00",
+        "*OPC?",
+    ]
+
+    assert d.sweep_iv([], 0.5) == []
+
+
+def test_k2470_adapter_sweep_iv_abort_on_compliance(res):
+    d = K2470Adapter(res)
+
+    res.buffer = [
+        "1",
+        "1",
+        "1",
+        "FAILED;IDLE;1",
+        "1",
+        "+1.000000E+00,+1.000000E-09,+0.000000E+00",
+        "1",
+    ]
+    assert d.sweep_iv([1.0, 2.0], 0.5, True) == [(0.0, 1e-09, 1.0)]
+    assert res.buffer == [
+        ':TRAC:CLE "defbuffer1"',
+        "*OPC?",
+        ":SOUR:LIST:VOLT 1.000E+00,2.000E+00",
+        "*OPC?",
+        ':SOUR:SWE:VOLT:LIST 1, 5.000E-01, 1, ON, "defbuffer1"',
+        "*OPC?",
+        ":INIT",
+        ":TRIG:STAT?",
+        ':TRAC:ACT? "defbuffer1"',
+        ':TRAC:DATA? 1, 1, "defbuffer1", SOUR, READ, REL',
+        ":SOUR:VOLT:LEV 1.000E+00",
+        "*OPC?",
+    ]
+
+    # Restore level on failure
+    res.buffer = ["1", "1", "1", "ABORTED;IDLE;1", "1"]
+    with pytest.raises(RuntimeError):
+        d.sweep_iv([1.0, 2.0], 0.5)
+    assert res.buffer[-2:] == [":SOUR:VOLT:LEV 1.000E+00", "*OPC?"]
+
+
+def test_k2470_adapter_voltage_ramp(res):
+    d = K2470Adapter(res)
+
+    res.buffer = ["1", "1"]
+    assert d.start_voltage_ramp(0.0, 100.0, 20.0, 5.0) is None
+    assert res.buffer == [
+        ':TRAC:CLE "defbuffer1"',
+        "*OPC?",
+        ':SOUR:SWE:VOLT:LIN 0.000E+00, 1.000E+02, 21, 2.500E-01, 1, FIXED, OFF, OFF, "defbuffer1"',
+        "*OPC?",
+        ":INIT",
+    ]
+
+    res.buffer = ["RUNNING;RUNNING;2"]
+    assert d.voltage_ramp_running() is True
+    assert res.buffer == [":TRIG:STAT?"]
+
+    res.buffer = ["IDLE;IDLE;7"]
+    assert d.voltage_ramp_running() is False
+    assert res.buffer == [":TRIG:STAT?"]
+
+    res.buffer = ["ABORTED;IDLE;7"]
+    with pytest.raises(RuntimeError):
+        d.voltage_ramp_running()
+
+    res.buffer = ["1", "+4.200000E+01,+1.000000E-09", "1"]
+    assert d.abort_voltage_ramp() is None
+    assert res.buffer == [
+        ":ABOR",
+        "*OPC?",
+        ':READ? "defbuffer1", SOUR, READ',
+        ":SOUR:VOLT:LEV 4.200E+01",
+        "*OPC?",
+    ]
+
+
+def test_k2470_adapter_read_i_buffered(res):
+    d = K2470Adapter(res)
+    d.max_buffer_points = 2
+
+    arm = [
+        ':TRAC:CLE "defbuffer1"',
+        "*OPC?",
+        ':TRAC:POIN 2, "defbuffer1"',
+        "*OPC?",
+        ':TRIG:LOAD "SimpleLoop", 2, 1.000E-02, "defbuffer1"',
+        "*OPC?",
+        ":INIT",
+    ]
+
+    res.buffer = ["1"] * 3
+    d.start_i_buffered(0.01)
+    assert res.buffer == arm
+
+    res.buffer = ["0"]
+    assert d.read_i_buffered(10) == []
+    assert res.buffer == [':TRAC:ACT? "defbuffer1"']
+
+    res.buffer = ["1", "+0.000000E+00,+1.000000E-09"]
+    assert d.read_i_buffered(10) == [(0.0, 1e-09)]
+    assert res.buffer == [
+        ':TRAC:ACT? "defbuffer1"',
+        ':TRAC:DATA? 1, 1, "defbuffer1", REL, READ',
+    ]
+
+    # Read new readings only, re-arm full buffer
+    res.buffer = ["2", "+1.000000E-02,+2.000000E-09", *["1"] * 3]
+    assert d.read_i_buffered(10) == [(0.01, 2e-09)]
+    assert res.buffer == [
+        ':TRAC:ACT? "defbuffer1"',
+        ':TRAC:DATA? 2, 2, "defbuffer1", REL, READ',
+        *arm,
+    ]
+    assert d.i_buffered_gaps() == 1
+
+    res.buffer = []
+    d.stop_i_buffered()
+    assert res.buffer == [":ABOR"]
+
+
+def test_k2470_adapter_measure_iv_compliance(res):
+    d = K2470Adapter(res)
+
+    res.buffer = ["+4.200000E+01,+1.000000E-09;1"]
+    assert d.measure_iv_compliance() == (1e-09, 42.0, True)
+    assert res.buffer == [':READ? "defbuffer1", SOUR, READ;:SOUR:VOLT:ILIM:LEV:TRIP?']
+
+    res.buffer = ["+4.200000E+01,+1.000000E-09;0"]
+    assert d.measure_iv_compliance() == (1e-09, 42.0, False)
+
+
+def test_k2470_adapter_configure(res):
+    d = K2470Adapter(res)
+
+    res.buffer = ["1", '0,"No error"']
+    assert d.configure({}) is None
+    assert res.buffer == [
+        (
+            ':ROUT:TERM FRON;:SOUR:FUNC VOLT;:SENS:FUNC "CURR";'
+            ":SENS:CURR:RANG 1.000000E-08;:SENS:CURR:RANG:AUTO:LLIM 1.000000E-08;"
+            ":SENS:CURR:RANG:AUTO 1;:SENS:CURR:AVER:TCON MOV;:SENS:CURR:AVER:COUN 10"
+        ),
+        (
+            ":SENS:CURR:AVER:STAT 0;:SENS:CURR:NPLC 1.000000E+00;:SYST:BRE:PROT AUTO;"
+            ":SOUR:VOLT:DEL:AUTO 1;:SENS:CURR:AZER 1"
+        ),
+        "*OPC?",
+        ":SYST:ERR?",
+    ]
@@ -1,3 +1,5 @@
+import pytest
+
 from diode_measurement.drivers.keithley.k2657a import K2657AAdapter
 
 
@@ -56,9 +58,9 @@ def test_k2657a_adapter(res):
     assert d.measure_v() == 42.1
     assert res.buffer == ["print(smua.measure.v())"]
 
-    res.buffer = ["+4.210000E-03", "+4.210000E+01"]
+    res.buffer = ["+4.210000E-03\t+4.210000E+01"]
     assert d.measure_iv() == (0.00421, 42.1)
-    assert res.buffer == ["print(smua.measure.i())", "print(smua.measure.v())"]
+    assert res.buffer == ["print(smua.measure.iv())"]
 
     res.buffer = ["1"]
     assert d.set_beeper_enable(True) is None
@@ -83,3 +85,160 @@ def test_k2657a_adapter(res):
     res.buffer = ["1"]
     assert d.set_measure_nplc(4.2) is None
     assert res.buffer == ["smua.measure.nplc = 4.200000E+00", "*OPC?"]
+
+
+def test_k2657a_adapter_measure_iv_compliance(res):
+    d = K2657AAdapter(res)
+
+    res.buffer = ["1.000000e-09\t4.200000e+01\tfalse"]
+    assert d.measure_iv_compliance() == (1e-09, 42.0, False)
+    assert res.buffer == [
+        "local i, v = smua.measure.iv() print(i, v, smua.source.compliance)"
+    ]
+
+    res.buffer = ["1.000000e-03\t4.200000e+01\ttrue"]
+    assert d.measure_iv_compliance() == (1e-03, 42.0, True)
+
+
+def test_k2657a_adapter_sweep_iv_abort_on_compliance(res):
+    d = K2657AAdapter(res)
+
+    res.buffer = [
+        *["1"] * 4,
+        "P\t5.000000e-01\t1.000000e-09\t1.000000e+00\tfalse",
+        "P\t1.000000e+00\t2.000000e-09\t2.000000e+00\ttrue",
+        "E",
+    ]
+    assert d.sweep_iv([1.0, 2.0, 3.0], 0.5, True) == [
+        (0.0, 1e-09, 1.0),
+        (0.5, 2e-09, 2.0),
+    ]
+    assert "dm_abort_compliance = true" in res.buffer
+    # Source level is kept by the script
+    assert not any(line.startswith("smua.source.levelv") for line in res.buffer)
+
+
+def test_k2657a_adapter_sweep_iv(res):
+    d = K2657AAdapter(res)
+
+    res.buffer = [
+        *["1"] * 4,
+        "P\t5.000000e-01\t1.000000e-09\t1.000000e+00\tfalse",
+        "W",
+        "P\t1.000000e+00\t2.000000e-09\t2.000000e+00\tfalse",
+        "E",
+    ]
+    assert d.sweep_iv([1.0, 2.0], 0.5) == [(0.0, 1e-09, 1.0), (0.5, 2e-09, 2.0)]
+    assert res.buffer[0] == "loadscript dm_sweep_iv"
+    assert res.buffer[-10:] == [
+        "endscript",
+        "dm_levels = {}",
+        "*OPC?",
+        (
+            "for _, value in ipairs({1.000E+00, 2.000E+00}) do "
+            "table.insert(dm_levels, value) end"
+        ),
+        "*OPC?",
+        "dm_delay = 5.000000E-01",
+        "*OPC?",
+        "dm_abort_compliance = false",
+        "*OPC?",
+        "dm_sweep_iv.run()",
+    ]
+
+    # Unexpected output aborts the script and keeps the last swept point
+    res.buffer = [
+        *["1"] * 4,
+        "P\t5.000000e-01\t1.000000e-09\t1.000000e+00\tfalse",
+        "X",
+        "1",
+    ]
+    with pytest.raises(ValueError):
+        d.sweep_iv([1.0, 2.0], 0.5)
+    assert res.buffer[-2:] == ["smua.source.levelv = 1.000000E+00", "*OPC?"]
+
+
+def test_k2657a_adapter_voltage_ramp(res):
+    d = K2657AAdapter(res)
+
+    res.buffer = ["1"] * 11
+    assert d.start_voltage_ramp(0.0, 100.0, 20.0, 5.0) is None
+    assert res.buffer == [
+        "smua.trigger.source.linearv(0.000000E+00, 1.000000E+02, 21)",
+        "*OPC?",
+        "smua.trigger.source.action = smua.ENABLE",
+        "*OPC?",
+        "smua.trigger.measure.action = smua.DISABLE",
+        "*OPC?",
+        "smua.trigger.endpulse.action = smua.SOURCE_HOLD",
+        "*OPC?",
+        "smua.trigger.endsweep.action = smua.SOURCE_HOLD",
+        "*OPC?",
+        "smua.trigger.count = 21",
+        "*OPC?",
+        "trigger.timer[1].delay = 2.500000E-01",
+        "*OPC?",
+        "trigger.timer[1].count = 20",
+        "*OPC?",
+        "trigger.timer[1].passthrough = true",
+        "*OPC?",
+        "trigger.timer[1].stimulus = smua.trigger.ARMED_EVENT_ID",
+        "*OPC?",
+        "smua.trigger.source.stimulus = trigger.timer[1].EVENT_ID",
+        "*OPC?",
+        "smua.trigger.initiate()",
+    ]
+
+    res.buffer = ["1.00000e+00"]
+    assert d.voltage_ramp_running() is True
+    assert res.buffer == ["print(status.operation.sweeping.condition)"]
+
+    res.buffer = ["0.00000e+00", "1", "1", "1", "1"]
+    assert d.voltage_ramp_running() is False
+    assert res.buffer == [
+        "print(status.operation.sweeping.condition)",
+        "smua.trigger.source.stimulus = 0",
+        "*OPC?",
+        "smua.trigger.source.action = smua.DISABLE",
+        "*OPC?",
+        "smua.trigger.endpulse.action = smua.SOURCE_IDLE",
+        "*OPC?",
+        "smua.trigger.endsweep.action = smua.SOURCE_IDLE",
+        "*OPC?",
+    ]
+
+
+def test_k2657a_adapter_script_sweep(res):
+    d = K2657AAdapter(res)
+
+    res.buffer = ["1"] * 7
+    assert d.start_script_sweep([0.0, 1.0], 0.5, 1.0, 0.1, True, False) is None
+    assert res.buffer[0] == "loadscript dm_sweep"
+    assert res.buffer[-16:] == [
+        "endscript",
+        "dm_voltages = {}",
+        "*OPC?",
+        (
+            "for _, value in ipairs({0.000E+00, 1.000E+00}) do "
+            "table.insert(dm_voltages, value) end"
+        ),
+        "*OPC?",
+        "dm_delay = 5.000000E-01",
+        "*OPC?",
+        "dm_ramp_step = 1.000000E+00",
+        "*OPC?",
+        "dm_ramp_delay = 1.000000E-01",
+        "*OPC?",
+        "dm_abort_compliance = true",
+        "*OPC?",
+        "dm_ramp_down = false",
+        "*OPC?",
+        "dm_sweep.run()",
+    ]
+
+    res.buffer = ["P\t1\t1.000000e+00\t-2.500000e-09\t1.000000e+00\tfalse\n"]
+    assert d.read_script_sweep() == ("P", [1.0, 1.0, -2.5e-09, 1.0, 0.0])
+    assert res.buffer == []
+
+    res.buffer = ["E\n"]
+    assert d.read_script_sweep() == ("E", [])
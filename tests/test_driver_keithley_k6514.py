@@ -1,3 +1,5 @@
+import pytest
+
 from diode_measurement.drivers.keithley.k6514 import K6514Adapter
 
 
@@ -55,3 +57,67 @@ def test_k6514_adapter(res):
     res.buffer = ["1"]
     assert d.set_zero_check_enabled(True) is None
     assert res.buffer == [":SYST:ZCH 1", "*OPC?"]
+
+
+def test_k6514_adapter_read_i_buffered(res):
+    d = K6514Adapter(res)
+    d.max_buffer_points = 2
+
+    arm = [
+        ":TRAC:FEED:CONT NEV",
+        "*OPC?",
+        ":TRAC:CLE",
+        "*OPC?",
+        ":TRAC:POIN 2",
+        "*OPC?",
+        ":TRAC:TST:FORM ABS",
+        "*OPC?",
+        ":TRAC:FEED SENS",
+        "*OPC?",
+        ":TRAC:FEED:CONT NEXT",
+        "*OPC?",
+        ":TRIG:COUN 2",
+        "*OPC?",
+        ":INIT",
+    ]
+
+    res.buffer = ["1", "+1.000000E-01", *["1"] * 8]
+    d.start_i_buffered(0.01)
+    assert res.buffer == [
+        ":FORM:ELEM READ,TIME",
+        "*OPC?",
+        ":TRIG:DEL?",
+        ":TRIG:DEL 1.000E-02",
+        "*OPC?",
+        *arm,
+    ]
+
+    res.buffer = ["0"]
+    assert d.read_i_buffered(10) == []
+    assert res.buffer == [":TRAC:POIN:ACT?"]
+
+    # Buffer is cleared after every fetch
+    fetch = ":TRAC:DATA?;:TRAC:CLE;:TRAC:FEED:CONT NEXT"
+    res.buffer = ["1", "+1.000000E-12,+4.200000E+01"]
+    assert d.read_i_buffered(10) == [(0.0, 1e-12)]
+    assert res.buffer == [":TRAC:POIN:ACT?", fetch]
+
+    # Timestamps restart after clear, re-arm after trigger count
+    res.buffer = ["1", "+2.000000E-12,+0.000000E+00", *["1"] * 7]
+    assert d.read_i_buffered(10) == [(pytest.approx(0.0, abs=0.1), 2e-12)]
+    assert res.buffer == [":TRAC:POIN:ACT?", fetch, *arm]
+    assert d.i_buffered_gaps() == 1
+
+    res.buffer = ["1"] * 4
+    d.stop_i_buffered()
+    assert res.buffer == [
+        ":ABOR",
+        ":TRAC:FEED:CONT NEV",
+        "*OPC?",
+        ":TRIG:COUN 1",
+        "*OPC?",
+        ":TRIG:DEL +1.000000E-01",
+        "*OPC?",
+        ":FORM:ELEM READ",
+        "*OPC?",
+    ]
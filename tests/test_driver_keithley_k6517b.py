@@ -1,3 +1,5 @@
+import pytest
+
 from diode_measurement.drivers.keithley.k6517b import K6517BAdapter
 
 
@@ -79,3 +81,78 @@ def test_k6517b_adapter(res):
     res.buffer = ["0"]
     assert d.compliance_tripped() is False
     assert res.buffer == [":SOUR:CURR:LIM?"]
+
+
+def test_k6517b_adapter_read_i_buffered(res):
+    d = K6517BAdapter(res)
+    d.max_buffer_points = 2
+
+    arm = [
+        ":TRAC:FEED:CONT NEV",
+        "*OPC?",
+        ":TRAC:CLE",
+        "*OPC?",
+        ":TRAC:POIN 2",
+        "*OPC?",
+        ":TRAC:TST:FORM ABS",
+        "*OPC?",
+        ":TRAC:FEED SENS",
+        "*OPC?",
+        ":TRAC:FEED:CONT NEXT",
+        "*OPC?",
+        ":TRIG:COUN 2",
+        "*OPC?",
+        ":INIT",
+    ]
+
+    res.buffer = ["1", "+1.000000E-01", *["1"] * 8]
+    d.start_i_buffered(0.01)
+    assert res.buffer == [
+        ":FORM:ELEM READ,TST",
+        "*OPC?",
+        ":TRIG:DEL?",
+        ":TRIG:DEL 1.000E-02",
+        "*OPC?",
+        *arm,
+    ]
+
+    res.buffer = ["0"]
+    assert d.read_i_buffered(10) == []
+    assert res.buffer == [":TRAC:POIN:ACT?"]
+
+    res.buffer = ["1", "+1.000000E-12,+4.200000E+01"]
+    assert d.read_i_buffered(10) == [(0.0, 1e-12)]
+    assert res.buffer == [":TRAC:POIN:ACT?", ":TRAC:DATA:SEL? 0,1"]
+
+    # Read new readings only, re-arm full buffer
+    res.buffer = [
+        "2",
+        "+2.000000E-12,+4.201000E+01",
+        *["1"] * 7,
+    ]
+    assert d.read_i_buffered(10) == [(pytest.approx(0.01), 2e-12)]
+    assert res.buffer == [":TRAC:POIN:ACT?", ":TRAC:DATA:SEL? 1,1", *arm]
+    assert d.i_buffered_gaps() == 1
+
+    res.buffer = ["1"] * 4
+    d.stop_i_buffered()
+    assert res.buffer == [
+        ":ABOR",
+        ":TRAC:FEED:CONT NEV",
+        "*OPC?",
+        ":TRIG:COUN 1",
+        "*OPC?",
+        ":TRIG:DEL +1.000000E-01",
+        "*OPC?",
+        ":FORM:ELEM READ",
+        "*OPC?",
+    ]
+
+
+def test_k6517b_adapter_measure_i(res):
+    d = K6517BAdapter(res)
+
+    res.buffer = ["1", "0", "1", "+4.200000E-12"]
+    assert d.measure_i() == 4.2e-12
+    assert res.buffer == ["*CLS", "*OPC?", "*OPC", ":INIT", "*ESR?", "*ESR?", ":FETC?"]
+    assert d._completion.expected(()) is not None
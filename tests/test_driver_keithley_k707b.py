@@ -15,3 +15,65 @@ def test_k707b_adapter(res):
     res.buffer = ["1"]
     assert d.clear() is None
     assert res.buffer == ["*CLS", "*OPC?"]
+
+
+class FakeSwitchDriver:
+    def __init__(self, closed):
+        self.closed = set(closed)
+        self.calls = []
+
+    @property
+    def closed_channels(self):
+        self.calls.append(("closed_channels",))
+        return sorted(self.closed)
+
+    def open_all_channels(self):
+        self.calls.append(("open_all_channels",))
+        self.closed.clear()
+
+    def open_channels(self, channels):
+        self.calls.append(("open_channels", channels))
+        self.closed.difference_update(channels)
+
+    def close_channels(self, channels):
+        self.calls.append(("close_channels", channels))
+        self.closed.update(channels)
+
+
+def test_k707b_adapter_channel_cache(res):
+    d = K707BAdapter(res)
+    d._driver = FakeSwitchDriver(["1A01", "1A02"])
+
+    d.configure({"channels": ["1A02", "1A03"]})
+    assert d._driver.calls == [
+        ("closed_channels",),
+        ("open_channels", ["1A01"]),
+        ("close_channels", ["1A03"]),
+    ]
+
+    # No commands if state is unchanged
+    d._driver.calls.clear()
+    d.configure({"channels": ["1A03", "1A02"]})
+    d.close_channels(["1A02"])
+    d.open_channels(["1A01"])
+    assert d._driver.calls == []
+
+    d.open_channels(["1A02", "1A04"])
+    d.close_channels(["1A01", "1A03"])
+    assert d._driver.calls == [
+        ("open_channels", ["1A02"]),
+        ("close_channels", ["1A01"]),
+    ]
+    assert d._driver.closed == {"1A01", "1A03"}
+
+    d._driver.calls.clear()
+    d.open_all_channels()
+    d.open_all_channels()
+    assert d._driver.calls == [("open_all_channels",)]
+
+    # Resync after reset
+    d._driver = FakeSwitchDriver(["1A05"])
+    d._driver.reset = lambda: None
+    d.reset()
+    d.close_channels(["1A05"])
+    assert d._driver.calls == [("closed_channels",)]
@@ -99,3 +99,21 @@ def test_e4980a_adapter(res):
     res.buffer = ["1"]
     assert d.set_amplitude_alc(True) is None
     assert res.buffer == [":AMPL:ALC 1", "*OPC?"]
+
+
+def test_e4980a_adapter_service_request(res):
+    d = E4980AAdapter(res)
+
+    res.buffer = ["1", "1"]
+    d._enable_service_request()
+    assert res.buffer == ["*ESE 1", "*OPC?", "*SRE 32", "*OPC?"]
+
+    res.buffer = []
+    d._enable_service_request()
+    assert res.buffer == []
+
+    res.buffer = ["1"]
+    d.clear()
+    res.buffer = ["1", "1"]
+    d._enable_service_request()
+    assert res.buffer == ["*ESE 1", "*OPC?", "*SRE 32", "*OPC?"]
@@ -0,0 +1,149 @@
+import itertools
+import math
+
+import pytest
+
+from diode_measurement.core.resource import ResourceConfig, ResourceError
+from diode_measurement.sim import (
+    DiodeModel,
+    SimulatedBench,
+    create_simulated_resource,
+    create_simulator,
+)
+from diode_measurement.sim.instruments import SimulatedTimeout
+
+
+@pytest.fixture
+def bench():
+    model = DiodeModel(current_noise=0, current_noise_floor=0, capacitance_noise=0)
+    return SimulatedBench(model, seed=0)
+
+
+def create_resource(model, bench):
+    config = ResourceConfig("SIM::0::INSTR", "@sim")
+    return create_simulated_resource(config, model, bench, time_scale=0)
+
+
+def test_diode_model():
+    model = DiodeModel()
+    currents = [abs(model.current(-v, 20.0)) for v in range(0, 700, 50)]
+    assert all(a < b for a, b in itertools.pairwise(currents))
+    assert model.current(0.0, 20.0) == 0.0
+    assert abs(model.current(-790.0, 20.0)) > 10 * abs(model.current(-400.0, 20.0))
+    # Current roughly doubles every 7 degC
+    ratio = model.current(-100.0, 27.0) / model.current(-100.0, 20.0)
+    assert 1.8 < ratio < 2.3
+
+
+def test_diode_model_capacitance():
+    model = DiodeModel(depletion_voltage=60.0, geometric_capacitance=30e-12)
+    inverse_square = [1 / model.capacitance(v) ** 2 for v in (10.0, 20.0, 40.0)]
+    assert inverse_square[1] == pytest.approx(2 * inverse_square[0])
+    assert inverse_square[2] == pytest.approx(4 * inverse_square[0])
+    assert model.capacitance(60.0) == pytest.approx(30e-12)
+    assert model.capacitance(200.0) == pytest.approx(30e-12)
+
+
+def test_simulated_bench(bench):
+    assert bench.bias_voltage() == 0.0
+    bench.set_source(1, -100.0, 1e-3)
+    bench.set_source(2, -10.0, 1e-6)
+    assert bench.bias_voltage() == -110.0
+    assert bench.compliance() == 1e-6
+    current, compliance = bench.read_current()
+    assert current == pytest.approx(bench.model.current(-110.0, 20.0))
+    assert not compliance
+    bench.set_source(2, -10.0, 1e-9)
+    assert bench.read_current() == (-1e-9, True)
+    bench.remove_source(1)
+    bench.remove_source(2)
+    assert bench.compliance() == math.inf
+
+
+def test_create_simulator(bench):
+    with pytest.raises(ValueError):
+        create_simulator("ITC", bench)
+
+
+def test_k2410_simulator(bench):
+    sim = create_simulator("K2410", bench)
+    assert sim.query("*IDN?").startswith("KEITHLEY")
+    sim.write(":SOUR:VOLT:LEV -100;:SENS:CURR:PROT:LEV 1e-3")
+    sim.write(":OUTP:STAT ON")
+    assert sim.query(":OUTP:STAT?") == "1"
+    assert bench.bias_voltage() == -100.0
+    sim.write(':FORM:ELEM "VOLT,CURR,STAT"')
+    voltage, current, status = map(float, sim.query(":READ?").split(","))
+    assert voltage == -100.0
+    assert current == pytest.approx(bench.model.current(-100.0, 20.0), rel=1e-6)
+    assert status == 0
+    assert sim.query(":SENS:CURR:PROT:TRIP?") == "0"
+    assert sim.query(":SYST:ERR?") == '0,"No error"'
+    with pytest.raises(SimulatedTimeout):
+        sim.query(":UNKNOWN?")
+    assert sim.query(":SYST:ERR?") == '-113,"Undefined header"'
+    sim.write(":OUTP:STAT OFF")
+    assert bench.bias_voltage() == 0.0
+
+
+def test_k2657a_simulator(bench):
+    sim = create_simulator("K2657A", bench)
+    sim.write("smua.source.limiti = 1.0E-06 smua.source.levelv = -200.0")
+    sim.write("smua.source.output = smua.OUTPUT_ON")
+    assert sim.query("print(smua.source.output)") == "1"
+    current, voltage = map(float, sim.query("print(smua.measure.iv())").split("\t"))
+    assert voltage == -200.0
+    assert current < 0
+    assert sim.query("print(errorqueue.count)") == "0.000000e+00"
+    sim.write("smua.source.output = smua.OUTPUT_OFF")
+    assert bench.bias_voltage() == 0.0
+
+
+def test_k237_simulator(bench):
+    sim = create_simulator("K237", bench)
+    assert sim.query("U0X") == "237A07"
+    sim.write("L1.000E-06,0X")
+    sim.write("B-50.000E+00,,X")
+    sim.write("N1X")
+    assert sim.query("U3X")[18:20] == "N1"
+    sim.write("G5,2,0X")
+    voltage, current = map(float, sim.query("X").split(","))
+    assert voltage == -50.0
+    assert current < 0
+    sim.write("N0X")
+    assert sim.query("U3X")[18:20] == "N0"
+
+
+def test_e4980a_simulator(bench):
+    sim = create_simulator("E4980A", bench)
+    sim.write(":BIAS:VOLT:LEV -30;:BIAS:STAT ON")
+    sim.write(":TRIG:IMM")
+    cp, _, status = sim.query(":FETC?").split(",")
+    assert float(cp) == pytest.approx(bench.model.capacitance(-30.0), rel=1e-6)
+    assert status == "+0"
+
+
+def test_k707b_simulator(bench):
+    sim = create_simulator("K707B", bench)
+    assert sim.query('print(channel.getclose("allslots"))') == "nil"
+    sim.write('channel.close("1A01,1B02")')
+    assert sim.query('print(channel.getclose("allslots"))') == "1A01;1B02"
+    sim.write('channel.open("allslots")')
+    assert sim.query('print(channel.getclose("allslots"))') == "nil"
+
+
+def test_simulated_resource(bench):
+    res = create_resource("K2470", bench)
+    with pytest.raises(RuntimeError):
+        res.query("*IDN?")
+    with res:
+        assert res.probe()
+        assert res.query("*IDN?").startswith("KEITHLEY")
+        res.write(":SOUR:VOLT:LEV -10")
+        assert float(res.query(":SOUR:VOLT:LEV?")) == -10.0
+        with pytest.raises(ResourceError):
+            res.read()
+    assert not res.probe()
+    snapshot = res.metrics.snapshot()
+    assert snapshot["count"] == 3
+    assert snapshot["timeouts"] == 1
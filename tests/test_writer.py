@@ -0,0 +1,104 @@
+import io
+import threading
+
+import pytest
+
+from diode_measurement.writer import FlushPolicy, Writer
+
+
+class SlowFile(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.flushed: list[str] = []
+        self.release = threading.Event()
+
+    def flush(self) -> None:
+        self.release.wait(timeout=5.0)
+        self.flushed.append(self.getvalue())
+        super().flush()
+
+
+class BrokenFile(io.StringIO):
+    def write(self, s: str) -> int:
+        raise OSError("disk full")
+
+
+def write_table(writer: Writer, rows: int) -> None:
+    writer.write_tag("sample", "unnamed")
+    writer.write_table_header(["timestamp[s]", "voltage[V]"])
+    for index in range(rows):
+        writer.write_table_row([format(index), "+1.000E+00"])
+        writer.flush()
+
+
+def test_writer():
+    fp = io.StringIO()
+    writer = Writer(fp)
+    write_table(writer, 2)
+    writer.close()
+    assert not writer.is_background
+    assert fp.getvalue().splitlines() == [
+        "sample: unnamed",
+        "",
+        "timestamp[s]\tvoltage[V]",
+        "0\t+1.000E+00",
+        "1\t+1.000E+00",
+    ]
+
+
+def test_writer_background():
+    fp = SlowFile()
+    writer = Writer(fp)
+    writer.start(FlushPolicy(rows=4, interval=60.0))
+    assert writer.is_background
+    with pytest.raises(RuntimeError):
+        writer.start()
+    # Slow flushes must not block writing rows
+    write_table(writer, 10)
+    fp.release.set()
+    writer.close()
+    assert not writer.is_background
+    sync = io.StringIO()
+    write_table(Writer(sync), 10)
+    assert fp.getvalue() == sync.getvalue()
+    # Flushed at table begin and every 4 rows
+    assert len(fp.flushed) == 4
+
+
+def test_writer_background_interval():
+    fp = SlowFile()
+    fp.release.set()
+    writer = Writer(fp)
+    writer.start(FlushPolicy(rows=1000, interval=0.01))
+    writer.write_tag("sample", "unnamed")
+    for _ in range(100):
+        if fp.flushed:
+            break
+        threading.Event().wait(0.01)
+    assert fp.flushed == ["sample: unnamed\r\n"]
+    writer.close()
+
+
+def test_writer_background_table_end():
+    fp = SlowFile()
+    fp.release.set()
+    writer = Writer(fp)
+    writer.start(FlushPolicy(rows=1000, interval=60.0, fsync=True))
+    write_table(writer, 2)
+    write_table(writer, 2)
+    writer.close()
+    # Flushed at table begin and end and on close, StringIO does not sync
+    assert len(fp.flushed) == 3
+    assert fp.flushed[1].endswith("1\t+1.000E+00\r\nsample: unnamed\r\n")
+
+
+def test_writer_background_error():
+    writer = Writer(BrokenFile())
+    writer.start()
+    writer.write_tag("sample", "unnamed")
+    with pytest.raises(RuntimeError, match="disk full"):
+        writer.close()
+    with pytest.raises(RuntimeError, match="disk full"):
+        writer.write_table_row(["1"])
+    with pytest.raises(RuntimeError, match="disk full"):
+        writer.close()